@@ -0,0 +1,98 @@
+"""
+End-to-end benchmark of a full sync (scripts.main.main) against FakeGitHub.
+
+Reports wall time, request count, requests per second and peak Python
+memory for each follower count, so regressions in the hot paths show up
+before they reach the scheduled job.
+
+Usage:
+    python -m benchmarks.bench_e2e --followers 1000,10000 --latency-ms 1
+    python -m benchmarks.bench_e2e --followers 10000 --error-rate 0.01 -- --workers 8
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from benchmarks.fake_github import FakeGitHub, FakeGitHubState
+from scripts import main as bot
+
+
+def run_scenario(state, bot_args=(), trace_memory=True):
+    """
+    Run one full sync against a fake API serving state.
+
+    Returns:
+        dict with wall_time, requests, requests_per_second, peak_memory_mb
+        (None without trace_memory), requests_by_endpoint and the bot output
+    """
+    with FakeGitHub(state) as server:
+        env = {"GH_TOKEN": "bench", "GITHUB_API_URL": server.url}
+        # The fake API has no secondary limits, so writes are not throttled
+        # unless the caller asks for it
+        argv = ["main.py", "--writes-per-minute", "0", *bot_args]
+        out = io.StringIO()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        with patch.dict(os.environ, env), patch.object(sys, "argv", argv), contextlib.redirect_stdout(out):
+            bot.main()
+        wall_time = time.perf_counter() - start
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+
+    return {
+        "wall_time": wall_time,
+        "requests": state.request_count,
+        "requests_per_second": state.request_count / wall_time if wall_time else 0.0,
+        "peak_memory_mb": peak,
+        "requests_by_endpoint": dict(state.requests),
+        "output": out.getvalue(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="Arguments after -- are passed to scripts.main.",
+    )
+    parser.add_argument("--followers", default="1000,10000,100000", help="Comma-separated follower counts")
+    parser.add_argument("--following-ratio", type=float, default=1.0, help="Following count per follower")
+    parser.add_argument("--mutual-ratio", type=float, default=0.5, help="Share of following that follows back")
+    parser.add_argument("--per-page", type=int, default=100, help="Largest page size the fake API honours")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency added to every response")
+    parser.add_argument("--rate-limit", type=int, default=1_000_000, help="Advertised X-RateLimit-Limit")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument(
+        "--error-status", type=int, default=429,
+        help="Status of injected errors (403/429 are retried; a 5xx is not and aborts the run)",
+    )
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip peak memory tracing (faster)")
+    args, bot_args = parser.parse_known_args()
+    if bot_args[:1] == ["--"]:
+        bot_args = bot_args[1:]
+
+    print(f"{'followers':>10} {'following':>10} {'wall s':>9} {'requests':>9} {'req/s':>9} {'peak MB':>8}")
+    for followers in (int(n) for n in args.followers.split(",")):
+        following = int(followers * args.following_ratio)
+        state = FakeGitHubState(
+            followers=followers, following=following, mutual=int(following * args.mutual_ratio),
+            max_per_page=args.per_page, latency=args.latency_ms / 1000, rate_limit=args.rate_limit,
+            error_rate=args.error_rate, error_status=args.error_status,
+        )
+        result = run_scenario(state, bot_args, trace_memory=not args.no_tracemalloc)
+        peak = f"{result['peak_memory_mb']:8.1f}" if result["peak_memory_mb"] is not None else f"{'-':>8}"
+        print(
+            f"{followers:10} {following:10} {result['wall_time']:9.2f} {result['requests']:9} "
+            f"{result['requests_per_second']:9.0f} {peak}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Memory and time of the follower/following set computation at scale.
+
+Builds both lists from a stream of GitHub-shaped list items and computes
+to_follow, to_unfollow and mutual three ways:
+
+  dicts    every full user dict kept, then set differences of the logins
+  sets     only the logins kept, then set differences
+  compact  UserList (logins + array of ids) and a linear merge_diff
+  sqlite   both lists streamed into a StateStore, differences by indexed joins
+
+Times include building the list items. Peak memory is measured with
+tracemalloc in a second, untimed run (for sqlite this covers Python
+objects only, not SQLite's own page cache).
+
+Usage:
+    python -m benchmarks.bench_memory [--entries 1000000] [--skip-dicts]
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fake_github import FakeGitHubState
+from scripts.store import StateStore
+from scripts.userlist import UserList, merge_diff
+
+
+def iter_items(state, logins):
+    for login in logins:
+        item = state.list_item(login)
+        # Decoded JSON holds its own copy of every string
+        item["login"] = login[:1] + login[1:]
+        yield item
+
+
+def with_dicts(state):
+    followers = list(iter_items(state, state.followers))
+    following = list(iter_items(state, state.following))
+    follower_logins = {u["login"] for u in followers}
+    following_logins = {u["login"] for u in following}
+    return (
+        follower_logins - following_logins, following_logins - follower_logins, follower_logins & following_logins,
+    )
+
+
+def with_sets(state):
+    followers = list(dict.fromkeys(u["login"] for u in iter_items(state, state.followers)))
+    following = list(dict.fromkeys(u["login"] for u in iter_items(state, state.following)))
+    follower_logins, following_logins = set(followers), set(following)
+    return (
+        follower_logins - following_logins, following_logins - follower_logins, follower_logins & following_logins,
+    )
+
+
+def with_compact(state):
+    followers = UserList.from_items(iter_items(state, state.followers))
+    following = UserList.from_items(iter_items(state, state.following))
+    return merge_diff(followers, following)
+
+
+def with_sqlite(state):
+    with tempfile.TemporaryDirectory() as tmp:
+        with StateStore(os.path.join(tmp, "state.db")) as db:
+            db.replace_list("followers", iter_items(state, state.followers))
+            db.replace_list("following", iter_items(state, state.following))
+            return db.diff()
+
+
+def measure(func, state):
+    """Return (seconds, peak MB, result sizes); time and memory come from separate runs."""
+    gc.collect()
+    start = time.perf_counter()
+    result = func(state)
+    elapsed = time.perf_counter() - start
+    sizes = [len(part) for part in result]
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    func(state)
+    peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+    return elapsed, peak, sizes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=1_000_000, help="Followers and following each")
+    parser.add_argument("--skip-dicts", action="store_true", help="Skip the full-dict variant (needs several GB)")
+    args = parser.parse_args()
+
+    state = FakeGitHubState(followers=args.entries, following=args.entries)
+    state.following  # materialise the list outside the measurement
+
+    variants = [("sets", with_sets), ("compact", with_compact), ("sqlite", with_sqlite)]
+    if not args.skip_dicts:
+        variants.insert(0, ("dicts", with_dicts))
+
+    print(f"{args.entries:,} followers and {args.entries:,} following")
+    print(f"{'variant':<10} {'time':>9} {'peak MB':>9}  to_follow / to_unfollow / mutual")
+    for name, func in variants:
+        elapsed, peak, sizes = measure(func, state)
+        print(f"{name:<10} {elapsed:>8.2f}s {peak:>9.1f}  {' / '.join(f'{n:,}' for n in sizes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Per-request latency: one-off requests.get calls vs the pooled GitHubClient.
+
+Usage:
+    python -m benchmarks.bench_session [--requests N]
+"""
+import argparse
+import time
+
+import requests
+
+from benchmarks.fake_github import FakeGitHub
+from scripts.client import GitHubClient, get_headers
+
+
+def bench_bare(base_url, n):
+    start = time.perf_counter()
+    for i in range(n):
+        resp = requests.get(f"{base_url}/users/user{i}", headers=get_headers("bench"))
+        resp.raise_for_status()
+    return time.perf_counter() - start
+
+
+def bench_pooled(base_url, n):
+    start = time.perf_counter()
+    with GitHubClient("bench", api_url=base_url) as client:
+        for i in range(n):
+            resp = client.get(client.url(f"/users/user{i}"))
+            resp.raise_for_status()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per variant")
+    args = parser.parse_args()
+
+    with FakeGitHub() as server:
+        bare = bench_bare(server.url, args.requests)
+        pooled = bench_pooled(server.url, args.requests)
+
+    n = args.requests
+    print(f"requests per variant: {n}")
+    print(f"bare requests.get : {bare / n * 1e6:8.1f} µs/request")
+    print(f"pooled client     : {pooled / n * 1e6:8.1f} µs/request")
+    print(f"speedup           : {bare / pooled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Spam scoring throughput and regex worst cases.
+
+Measures calculate_spam_score called per user against the score_users batch
+API and the NumPy columnar path (skipped without NumPy) on synthetic
+profiles, and the suspicious-content patterns against long
+adversarial bios. Scan times that grow faster than the input length point
+to catastrophic backtracking in _SUSPICIOUS_PATTERNS.
+
+Usage:
+    python -m benchmarks.bench_spam [--profiles N]
+"""
+import argparse
+import random
+import string
+import time
+from datetime import datetime, timedelta, timezone
+
+from scripts import columnar
+from scripts.spam import _has_suspicious_content, calculate_spam_score, score_users
+
+
+BIOS = [
+    None,
+    "",
+    "I write open source code",
+    "Backend engineer. Python, Go and Rust. Opinions are my own.",
+    "crypto nft airdrop click here",
+    "🚀🚀🚀🚀 follow me",
+    "Check this out: https://bit.ly/abc123",
+]
+
+
+def make_profiles(n, seed=0):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    profiles = []
+    for i in range(n):
+        name = rng.choice([None, "Test User", "".join(rng.choices(string.ascii_letters + string.digits, k=14))])
+        created = now - timedelta(days=rng.randint(0, 4000))
+        profiles.append({
+            "login": f"user{i}",
+            "name": name,
+            "bio": rng.choice(BIOS),
+            "public_repos": rng.choice([0, 0, 1, 5, 30]),
+            "followers": rng.choice([0, 1, 2, 10, 500]),
+            "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        })
+    return profiles
+
+
+def adversarial_bios(length):
+    """Inputs that force every pattern to scan (and backtrack over) the whole text."""
+    return {
+        "long word + underscore": "a" * length + "_",
+        "long digits + letter": "1" * length + "a",
+        "alternating words": "ab " * (length // 3),
+        "near-miss keyword": "follo " * (length // 6),
+        "emoji run of 3": "🎉🎉🎉 " * (length // 4),
+        "url without path": "https://bit.ly " * (length // 15),
+    }
+
+
+def timed(func, *args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, default=100_000, help="Number of synthetic profiles")
+    args = parser.parse_args()
+
+    profiles = make_profiles(args.profiles)
+    now = datetime.now(timezone.utc)
+
+    per_user, expected = timed(lambda: [calculate_spam_score(p, now) for p in profiles])
+    batch, results = timed(score_users, profiles, now)
+    assert results == expected, "score_users diverged from calculate_spam_score"
+
+    print(f"profiles: {len(profiles)}")
+    print(f"calculate_spam_score loop : {len(profiles) / per_user:12,.0f} profiles/s")
+    print(f"score_users batch         : {len(profiles) / batch:12,.0f} profiles/s")
+    if columnar.available():
+        vectorized, scored = timed(columnar.score_batch, profiles, now)
+        assert list(zip(scored.scores.tolist(), scored.reasons)) == expected, "columnar path diverged"
+        features, _ = timed(columnar.extract_features, profiles, now)
+        print(f"columnar score_batch      : {len(profiles) / vectorized:12,.0f} profiles/s")
+        print(f"  of which feature columns: {features / vectorized:12.0%}")
+    else:
+        print("columnar score_batch      :     skipped (pip install numpy)")
+    print()
+    print(f"{'adversarial bio':24} {'length':>8} {'scan':>12}")
+    # GitHub caps bios at 160 characters; the longer inputs expose superlinear scans
+    for length in (160, 1_000, 10_000, 100_000):
+        for label, text in adversarial_bios(length).items():
+            elapsed, _ = timed(_has_suspicious_content, text, repeat=10)
+            print(f"{label:24} {length:8} {elapsed / 10 * 1e3:10.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
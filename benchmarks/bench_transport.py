@@ -0,0 +1,118 @@
+"""
+Cold start and throughput of each HTTP transport.
+
+Cold start is the wall time of a fresh interpreter that imports the client
+and sends one request, which is what a scheduled job pays before doing any
+work. Throughput is measured with one thread, with a thread pool (as the
+bot's worker threads use the client), and for the async transport with
+asyncio.gather on its own event loop.
+
+Usage:
+    python -m benchmarks.bench_transport [--requests N] [--threads N] [--cold-runs N]
+"""
+import argparse
+import asyncio
+import importlib.util
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_github import FakeGitHub
+from scripts.client import GitHubClient, get_headers
+from scripts.transport import AsyncTransport
+
+BACKENDS = ("requests", "stdlib", "async")
+
+_COLD_START = """
+import sys, time
+start = time.perf_counter()
+from scripts.client import GitHubClient
+with GitHubClient("bench", api_url=sys.argv[1], transport=sys.argv[2]) as client:
+    client.get(client.url("/users/user0")).raise_for_status()
+print(time.perf_counter() - start)
+"""
+
+
+def bench_cold_start(base_url, backend, runs):
+    """Return the median (process wall time, in-process import + first request time) over runs."""
+    walls, inner = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c", _COLD_START, base_url, backend], capture_output=True, text=True, check=True
+        ).stdout
+        walls.append(time.perf_counter() - start)
+        inner.append(float(out))
+    return statistics.median(walls), statistics.median(inner)
+
+
+def bench_sequential(base_url, backend, n):
+    with GitHubClient("bench", api_url=base_url, transport=backend) as client:
+        client.get(client.url("/users/user0")).raise_for_status()
+        start = time.perf_counter()
+        for i in range(n):
+            client.get(client.url(f"/users/user{i}")).raise_for_status()
+        return time.perf_counter() - start
+
+
+def bench_threaded(base_url, backend, n, threads):
+    with GitHubClient("bench", api_url=base_url, pool_size=threads, transport=backend) as client:
+        client.get(client.url("/users/user0")).raise_for_status()
+
+        def fetch(i):
+            client.get(client.url(f"/users/user{i}")).raise_for_status()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(fetch, range(n)))
+        return time.perf_counter() - start
+
+
+def bench_gather(base_url, n, concurrency):
+    """Requests issued as coroutines straight on the async transport (no client, no threads)."""
+    async def run():
+        transport = AsyncTransport(get_headers("bench"), concurrency)
+        try:
+            (await transport.arequest("GET", f"{base_url}/users/user0")).raise_for_status()
+            start = time.perf_counter()
+            responses = await asyncio.gather(
+                *(transport.arequest("GET", f"{base_url}/users/user{i}") for i in range(n))
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            await transport.aclose()
+        for resp in responses:
+            resp.raise_for_status()
+        return elapsed
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per throughput run")
+    parser.add_argument("--threads", type=int, default=8, help="Worker threads (and async concurrency)")
+    parser.add_argument("--cold-runs", type=int, default=5, help="Fresh interpreters per cold-start measurement")
+    args = parser.parse_args()
+    backends = [b for b in BACKENDS if b != "requests" or importlib.util.find_spec("requests")]
+
+    n = args.requests
+    print(f"requests per run: {n}, threads: {args.threads}")
+    print(f"{'backend':<10}{'cold start':>12}{'import+1st':>12}{'sequential':>14}{'threaded':>14}")
+    with FakeGitHub() as server:
+        for backend in backends:
+            wall, inner = bench_cold_start(server.url, backend, args.cold_runs)
+            sequential = bench_sequential(server.url, backend, n)
+            threaded = bench_threaded(server.url, backend, n, args.threads)
+            print(
+                f"{backend:<10}{wall * 1e3:>10.0f}ms{inner * 1e3:>10.0f}ms"
+                f"{n / sequential:>10.0f}req/s{n / threaded:>10.0f}req/s"
+            )
+        gathered = bench_gather(server.url, n, args.threads)
+    print(f"async with asyncio.gather ({args.threads} connections): {n / gathered:.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+In-process stand-in for the parts of the GitHub API the bot uses.
+
+Serves GET /user, the follower/following lists (with per_page/page and Link
+headers), GET /users/{login}, POST /graphql user lookups and
+PUT/DELETE /user/following/{login} over plain HTTP/1.1 with keep-alive.
+Latency, rate-limit headers and error injection are configurable, so
+benchmarks and integration tests can exercise the whole bot without
+touching the real API or spending rate limit.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+
+_GRAPHQL_ALIAS = re.compile(r"(u\d+): user\(login: \$(l\d+)\)")
+
+
+def make_profile(login, index):
+    """Deterministic profile for login; every 10th user looks like spam."""
+    created = datetime(2015, 1, 1, tzinfo=timezone.utc) + timedelta(hours=index)
+    if index % 10 == 9:
+        return {
+            "login": login, "id": index + 1, "name": None, "bio": None,
+            "public_repos": 0, "followers": 0,
+            "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "updated_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+    return {
+        "login": login, "id": index + 1, "name": f"User {index}", "bio": "I write open source code",
+        "public_repos": 10, "followers": 50,
+        "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "updated_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+class FakeGitHubState:
+    """
+    Account state served by the fake API.
+
+    Args:
+        followers: Number of followers
+        following: Number of accounts followed
+        mutual: How many of the followed accounts also follow back
+        max_per_page: Largest page size honoured (GitHub's is 100)
+        latency: Seconds added to every response
+        rate_limit: X-RateLimit-Limit advertised per window
+        rate_window: Seconds until the rate-limit window resets
+        error_rate: Fraction of requests answered with an injected error
+        error_status: Status of injected errors; 403/429 are secondary limits the client
+            retries, while a 5xx is not retried and fails the request
+        seed: Seed for error injection
+        poll_interval: X-Poll-Interval sent with list pages (omitted if None)
+    """
+
+    def __init__(
+        self, followers=1000, following=1000, mutual=None, max_per_page=100, latency=0.0,
+        rate_limit=1_000_000, rate_window=3600, error_rate=0.0, error_status=429, seed=0, poll_interval=None,
+    ):
+        mutual = min(followers, following) // 2 if mutual is None else mutual
+        # Lists are newest-first, like GitHub's
+        self.followers = [f"user{i}" for i in range(followers)]
+        following = [f"user{i}" for i in range(mutual)] + [f"followed{i}" for i in range(following - mutual)]
+        # Oldest-first dict for O(1) follow/unfollow; `following` materialises the list lazily
+        self._following = dict.fromkeys(reversed(following))
+        self._following_list = None
+        self.max_per_page = max_per_page
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.poll_interval = poll_interval
+        self.requests = Counter()
+        self.rate_used = 0
+        self.rate_reset = time.time() + rate_window
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def request_count(self):
+        return sum(self.requests.values())
+
+    @property
+    def following(self):
+        """Followed logins, newest-first."""
+        with self._lock:
+            if self._following_list is None:
+                self._following_list = list(reversed(self._following))
+            return self._following_list
+
+    def follow(self, login):
+        with self._lock:
+            self._following.pop(login, None)
+            self._following[login] = None
+            self._following_list = None
+
+    def unfollow(self, login):
+        with self._lock:
+            self._following.pop(login, None)
+            self._following_list = None
+
+    @staticmethod
+    def _index(login):
+        prefix = "followed" if login.startswith("followed") else "user"
+        index = login[len(prefix):]
+        if not index.isdigit():
+            return None
+        return int(index) + (10_000_000 if prefix == "followed" else 0)
+
+    def profile(self, login):
+        index = self._index(login)
+        return make_profile(login, index) if index is not None else None
+
+    def list_item(self, login):
+        """Entry of login in a follower/following page, shaped like GitHub's simple user."""
+        index = self._index(login)
+        # Same id as the profile (make_profile), or a stable made-up one
+        user_id = index + 1 if index is not None else int(hashlib.md5(login.encode()).hexdigest()[:12], 16)
+        return {
+            "login": login, "id": user_id, "node_id": f"U_{user_id}",
+            "avatar_url": f"https://avatars.githubusercontent.com/u/{user_id}?v=4",
+            "url": f"https://api.github.com/users/{login}",
+            "html_url": f"https://github.com/{login}",
+            "type": "User", "site_admin": False,
+        }
+
+    def add_follower(self, login):
+        """Prepend a new follower, as GitHub does."""
+        with self._lock:
+            self.followers.insert(0, login)
+
+    def take_rate_budget(self):
+        """Count one request against the budget and return its rate-limit headers."""
+        with self._lock:
+            now = time.time()
+            if now >= self.rate_reset:
+                self.rate_used = 0
+                self.rate_reset = now + self.rate_window
+            self.rate_used += 1
+            remaining = max(0, self.rate_limit - self.rate_used)
+            return {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(remaining),
+                "X-RateLimit-Reset": str(int(self.rate_reset)),
+                "X-RateLimit-Resource": "core",
+            }
+
+    def inject_error(self):
+        with self._lock:
+            return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def _send(self, status, payload=None, headers=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if status == 200 and self.command == "GET" and self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("ETag", etag)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        state = self.state
+        parts = urlsplit(self.path)
+        path = parts.path
+        endpoint = re.sub(r"^/users/[^/]+$", "/users/{login}", path)
+        endpoint = re.sub(r"^/user/following/[^/]+$", "/user/following/{login}", endpoint)
+        with state._lock:
+            state.requests[(self.command, endpoint)] += 1
+
+        body = b""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            body = self.rfile.read(length)
+
+        if state.latency:
+            time.sleep(state.latency)
+        headers = state.take_rate_budget()
+        if state.inject_error():
+            if state.error_status in (403, 429):
+                headers["Retry-After"] = "0"
+                return self._send(state.error_status, {"message": "You have exceeded a secondary rate limit"}, headers)
+            return self._send(state.error_status, {"message": "Server Error"}, headers)
+        if headers["X-RateLimit-Remaining"] == "0" and state.rate_used > state.rate_limit:
+            return self._send(403, {"message": "API rate limit exceeded"}, headers)
+
+        if self.command == "GET" and path == "/user":
+            return self._send(200, {
+                "login": "me", "followers": len(state.followers), "following": len(state.following),
+            }, headers)
+        if self.command == "GET" and path in ("/user/followers", "/user/following"):
+            items = state.followers if path == "/user/followers" else state.following
+            return self._send_page(parts, items, headers)
+        if self.command == "GET" and endpoint == "/users/{login}":
+            profile = state.profile(path.rsplit("/", 1)[1])
+            if profile is None:
+                return self._send(404, {"message": "Not Found"}, headers)
+            return self._send(200, profile, headers)
+        if self.command == "POST" and path == "/graphql":
+            return self._send_graphql(json.loads(body), headers)
+        if endpoint == "/user/following/{login}" and self.command in ("PUT", "DELETE"):
+            login = path.rsplit("/", 1)[1]
+            if self.command == "PUT":
+                state.follow(login)
+            else:
+                state.unfollow(login)
+            return self._send(204, None, headers)
+        return self._send(404, {"message": "Not Found"}, headers)
+
+    def _send_page(self, parts, items, headers):
+        query = dict(parse_qsl(parts.query))
+        per_page = min(int(query.get("per_page", 30)), self.state.max_per_page)
+        page = int(query.get("page", 1))
+        last = max(1, -(-len(items) // per_page))
+        chunk = [self.state.list_item(login) for login in items[(page - 1) * per_page:page * per_page]]
+
+        def link(n):
+            return f"<{self.server.url}{parts.path}?{urlencode({'per_page': per_page, 'page': n})}>"
+
+        links = []
+        if page < last:
+            links.append(f'{link(page + 1)}; rel="next"')
+            links.append(f'{link(last)}; rel="last"')
+        if links:
+            headers["Link"] = ", ".join(links)
+        if self.state.poll_interval is not None:
+            headers["X-Poll-Interval"] = str(self.state.poll_interval)
+        return self._send(200, chunk, headers)
+
+    def _send_graphql(self, request, headers):
+        variables = request.get("variables", {})
+        data = {}
+        errors = []
+        for alias, var in _GRAPHQL_ALIAS.findall(request.get("query", "")):
+            login = variables.get(var)
+            profile = self.state.profile(login) if login else None
+            if profile is None:
+                data[alias] = None
+                errors.append({"type": "NOT_FOUND", "path": [alias],
+                               "message": f"Could not resolve to a User with the login of '{login}'."})
+                continue
+            data[alias] = {
+                "login": profile["login"], "databaseId": profile["id"], "name": profile["name"],
+                "bio": profile["bio"], "createdAt": profile["created_at"], "updatedAt": profile["updated_at"],
+                "repositories": {"totalCount": profile["public_repos"]},
+                "followers": {"totalCount": profile["followers"]},
+            }
+        payload = {"data": data}
+        if errors:
+            payload["errors"] = errors
+        headers["X-RateLimit-Resource"] = "graphql"
+        return self._send(200, payload, headers)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+
+class _Server(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops the SYNs of a burst of concurrent
+    # connections, which then wait about a second to retry
+    request_queue_size = 128
+
+
+class FakeGitHub:
+    """Run the fake API on a background thread; use as a context manager."""
+
+    def __init__(self, state=None, host="127.0.0.1", port=0):
+        self.state = state or FakeGitHubState()
+        self.server = _Server((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.state = self.state
+        self.server.url = self.url
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self):
+        return self.state.request_count
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
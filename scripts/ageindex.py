@@ -0,0 +1,139 @@
+import bisect
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+from scripts.spam import _ID_ANCHORS
+
+
+AGE_INDEX_FILE = "age-index.json"
+
+# Anchors kept; beyond this the oldest half is thinned out, since only
+# recent ids matter for the 30-day rule
+MAX_ANCHORS = 2048
+
+
+class AgeEstimate(NamedTuple):
+    """
+    Creation time estimated from a user id.
+
+    created is interpolated between the nearest anchors; earliest and latest
+    are hard bounds from those anchors (None where no anchor bounds that side).
+    """
+    created: datetime | None
+    earliest: datetime | None
+    latest: datetime | None
+
+
+def _parse(created_at):
+    return datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+
+
+class AccountAgeIndex:
+    """
+    Index of (user id, created_at) anchors for estimating account age without a request.
+
+    GitHub assigns user ids in increasing order, so an account was created
+    no earlier than the closest anchor below its id and no later than the
+    closest one above. The index starts from a few well-known accounts and
+    learns an anchor from every profile fetched; anchors that contradict
+    the ordering of their neighbours are ignored. Safe to share between threads.
+    """
+
+    def __init__(self, path=None, max_anchors=MAX_ANCHORS):
+        self.path = path
+        self.max_anchors = max_anchors
+        self.learned = 0
+        self._ids = []
+        self._times = []
+        self._lock = threading.Lock()
+        for user_id, created in _ID_ANCHORS:
+            self._insert(user_id, created.timestamp())
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                anchors = json.load(f)["anchors"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  Ignoring unreadable age index {self.path}: {e}")
+            return
+        with self._lock:
+            for user_id, timestamp in anchors:
+                self._insert(int(user_id), float(timestamp))
+
+    def save(self):
+        """Write the anchors to path atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            anchors = list(zip(self._ids, self._times))
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"anchors": anchors}, f)
+        os.replace(tmp_path, self.path)
+
+    def learn(self, user):
+        """Add the id and created_at of a fetched profile as an anchor."""
+        user_id, created_at = user.get("id"), user.get("created_at")
+        if user_id is None or not created_at:
+            return
+        with self._lock:
+            if self._insert(user_id, _parse(created_at).timestamp()):
+                self.learned += 1
+
+    def estimate(self, user_id):
+        """Return the AgeEstimate for user_id (all None if user_id is None)."""
+        if user_id is None:
+            return AgeEstimate(None, None, None)
+        with self._lock:
+            i = bisect.bisect_left(self._ids, user_id)
+            if i < len(self._ids) and self._ids[i] == user_id:
+                created = self._times[i]
+                return AgeEstimate(*(datetime.fromtimestamp(created, timezone.utc),) * 3)
+            low = (self._ids[i - 1], self._times[i - 1]) if i > 0 else None
+            high = (self._ids[i], self._times[i]) if i < len(self._ids) else None
+
+        earliest = datetime.fromtimestamp(low[1], timezone.utc) if low else None
+        latest = datetime.fromtimestamp(high[1], timezone.utc) if high else None
+        created = None
+        if low and high:
+            fraction = (user_id - low[0]) / (high[0] - low[0])
+            created = datetime.fromtimestamp(low[1] + fraction * (high[1] - low[1]), timezone.utc)
+        return AgeEstimate(created, earliest, latest)
+
+    def created_range(self, user_id):
+        """(earliest, latest) creation bounds for user_id; drop-in for spam.created_range."""
+        estimate = self.estimate(user_id)
+        return estimate.earliest, estimate.latest
+
+    def report(self):
+        """Return a one-line summary of the index."""
+        return f"🧭 Age index: {len(self._ids)} anchors ({self.learned} learned this run)"
+
+    def _insert(self, user_id, timestamp):
+        """Insert an anchor unless it contradicts its neighbours; caller holds the lock."""
+        i = bisect.bisect_left(self._ids, user_id)
+        if i < len(self._ids) and self._ids[i] == user_id:
+            return False
+        if (i > 0 and self._times[i - 1] > timestamp) or (i < len(self._ids) and self._times[i] < timestamp):
+            return False
+        self._ids.insert(i, user_id)
+        self._times.insert(i, timestamp)
+        if len(self._ids) > self.max_anchors:
+            self._thin()
+        return True
+
+    def _thin(self):
+        # Drop every other anchor in the oldest half; the newest stay dense
+        half = len(self._ids) // 2
+        keep = [i for i in range(len(self._ids)) if i >= half or i % 2 == 0]
+        self._ids = [self._ids[i] for i in keep]
+        self._times = [self._times[i] for i in keep]
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+# Default upper bound for the total size of cached bodies
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ResponseCache:
+    """
+    Persistent URL-keyed cache of ETag-validated GET responses.
+
+    Each entry keeps the ETag, the body and the Link header of the last 200
+    response for a URL. The client sends the ETag back as If-None-Match and
+    serves the stored body when GitHub answers 304 Not Modified, which does
+    not count against the primary rate limit.
+
+    Entries are evicted least-recently-used first once the stored bodies
+    exceed max_bytes.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _entry_size(entry):
+        return len(entry["body"]) + len(entry["etag"]) + len(entry.get("link") or "")
+
+    def load(self):
+        """Load entries from path, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable response cache {self.path}: {e}")
+            return
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            for url, entry in data.get("entries", {}).items():
+                self._entries[url] = entry
+                self._size += self._entry_size(entry)
+            self._evict()
+
+    def save(self):
+        """Write entries to path atomically."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            data = {"entries": dict(self._entries)}
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, url):
+        """Return the cached entry for url (marking it recently used) or None."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, url, etag, body, link=None):
+        """Store the validated body for url, evicting old entries if needed."""
+        entry = {"etag": etag, "body": body, "link": link}
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._size -= self._entry_size(old)
+            self._entries[url] = entry
+            self._size += self._entry_size(entry)
+            self._evict()
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= self._entry_size(entry)
+            self.evictions += 1
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def report(self):
+        """Return a one-line summary of cache effectiveness for this run."""
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return (
+            f"📦 Response cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), "
+            f"{len(self._entries)} entries, {self.evictions} evicted"
+        )
@@ -0,0 +1,148 @@
+import os
+from contextlib import contextmanager
+
+from scripts.ratelimit import RateLimiter, resource_for
+from scripts.transport import make_transport
+
+
+# Base URL of the GitHub REST API. GitHub Actions exports GITHUB_API_URL,
+# which also lets benchmarks and tests point the bot at a local server.
+API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+
+# Number of keep-alive connections kept open per host
+DEFAULT_POOL_SIZE = 10
+
+
+@contextmanager
+def client_for(token, client=None):
+    """Yield client, or else a new GitHubClient for token that is closed on exit."""
+    if client is not None:
+        yield client
+        return
+    with GitHubClient(token) as client:
+        yield client
+
+
+def get_headers(token):
+    return {
+        "Authorization": f"token {token}",
+        "Accept": "application/vnd.github.v3+json"
+    }
+
+
+class GitHubClient:
+    """
+    Pooled HTTP client shared by every GitHub API call in a run.
+
+    Requests go through a transport (see scripts/transport.py: "requests",
+    "stdlib" or "async", or "auto" for requests when installed), which keeps
+    connections alive between calls and carries the auth headers, so
+    thousands of calls reuse a handful of TCP+TLS connections instead of
+    opening one each. A transport object can be passed instead of a name.
+
+    Every request is scheduled through a RateLimiter, which paces requests
+    against the remaining budget and retries rate-limited ones after waiting.
+
+    When a ResponseCache is given, GET requests are sent conditionally with
+    If-None-Match and a 304 answer is turned back into the cached 200. When
+    RunMetrics are given, every HTTP exchange and retry is recorded there.
+    """
+
+    def __init__(
+        self, token, api_url=API_URL, pool_size=DEFAULT_POOL_SIZE, cache=None, rate_limiter=None,
+        metrics=None, transport="auto",
+    ):
+        self.token = token
+        self.api_url = api_url.rstrip("/")
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.metrics = metrics
+        if isinstance(transport, str):
+            transport = make_transport(transport, get_headers(token), pool_size)
+        self.transport = transport
+        # requests.Session of the requests transport (None for the others)
+        self.session = getattr(transport, "session", None)
+
+    def url(self, path):
+        """Return the absolute API URL for a path such as '/user/followers'."""
+        return f"{self.api_url}{path}"
+
+    @property
+    def graphql_url(self):
+        """GraphQL endpoint matching api_url (GHES serves it at /api/graphql)."""
+        if self.api_url.endswith("/api/v3"):
+            return f"{self.api_url[:-len('/v3')]}/graphql"
+        return f"{self.api_url}/graphql"
+
+    def _send(self, method, url, **kwargs):
+        limiter = self.rate_limiter
+        resource = resource_for(url)
+        attempt = 0
+        while True:
+            seq = limiter.wait(resource)
+            resp = self.transport.request(method, url, **kwargs)
+            limiter.update(resp, resource, seq)
+            if self.metrics is not None:
+                self.metrics.record_request(method, url, resp, resource)
+            if attempt >= limiter.max_retries or not limiter.is_rate_limited(resp):
+                resp.retries = attempt
+                return resp
+            delay = limiter.backoff(resp, attempt, resource)
+            if self.metrics is not None:
+                self.metrics.record_retry(method, url)
+            print(f"⏳ Rate limited on {method} {url} ({resp.status_code}), retrying in {delay:.0f}s")
+            attempt += 1
+
+    def request(self, method, url, **kwargs):
+        if method != "GET" or self.cache is None:
+            return self._send(method, url, **kwargs)
+
+        entry = self.cache.get(url)
+        if entry is not None:
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers["If-None-Match"] = entry["etag"]
+            kwargs["headers"] = headers
+
+        resp = self._send(method, url, **kwargs)
+        if resp.status_code == 304 and entry is not None:
+            self.cache.record_hit()
+            return _from_cache(resp, entry)
+
+        self.cache.record_miss()
+        etag = resp.headers.get("ETag")
+        if resp.status_code == 200 and etag:
+            self.cache.put(url, etag, resp.text, resp.headers.get("Link"))
+        return resp
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _from_cache(resp, entry):
+    """Rewrite a 304 response into the cached 200 it stands for."""
+    resp.status_code = 200
+    resp.reason = "OK"
+    resp._content = entry["body"].encode("utf-8")
+    resp.encoding = "utf-8"
+    if entry.get("link"):
+        resp.headers["Link"] = entry["link"]
+    resp.from_cache = True
+    return resp
@@ -0,0 +1,110 @@
+from scripts.client import GitHubClient
+from scripts.utils import PER_PAGE, with_per_page
+
+
+# Seconds between polls of the first followers page while followers keep arriving
+DEFAULT_POLL_INTERVAL = 60
+# Polls are spaced out up to this while nothing changes
+MAX_POLL_INTERVAL = 600
+# Growth of the poll interval after each poll that found nothing new
+POLL_BACKOFF = 1.5
+# Seconds between full reconciliations (the regular sync)
+RECONCILE_INTERVAL = 6 * 3600
+
+
+class FollowerPoller:
+    """
+    Detect new followers by polling the first page of /user/followers conditionally.
+
+    The page is requested with If-None-Match, so an unchanged list costs a
+    304 that does not count against the rate limit. New followers are the
+    entries above the first already-known login (further pages are read
+    only if the whole first page is new). The interval between polls resets
+    to min_interval when someone new shows up and grows by POLL_BACKOFF up
+    to max_interval otherwise, but never drops below the X-Poll-Interval
+    GitHub asks for.
+    """
+
+    def __init__(
+        self, token, client=None, known=(), min_interval=DEFAULT_POLL_INTERVAL, max_interval=MAX_POLL_INTERVAL
+    ):
+        self._owns_client = client is None
+        self.client = client or GitHubClient(token)
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.interval = min_interval
+        self.polls = 0
+        self.not_modified = 0
+        self.known = set(known)
+        self._etag = None
+
+    def close(self):
+        """Close the client if the poller created it."""
+        if self._owns_client:
+            self.client.close()
+
+    def reset(self, followers):
+        """Replace the known followers, e.g. after a reconciliation."""
+        self.known = set(followers)
+        self._etag = None
+        self.interval = self.min_interval
+
+    def poll(self):
+        """
+        Fetch the followers that appeared since the last poll.
+
+        Returns:
+            List of follower list items, newest-first
+        """
+        client = self.client
+        url = with_per_page(client.url("/user/followers"), PER_PAGE)
+        headers = {"If-None-Match": self._etag} if self._etag else {}
+        resp = client.get(url, headers=headers)
+        self.polls += 1
+        requested = int(resp.headers.get("X-Poll-Interval") or 0)
+        if resp.status_code == 304 or getattr(resp, "from_cache", False):
+            self.not_modified += 1
+            self._adapt(False, requested)
+            return []
+        resp.raise_for_status()
+        self._etag = resp.headers.get("ETag")
+
+        new = []
+        while True:
+            for item in resp.json():
+                if item["login"] in self.known:
+                    break
+                new.append(item)
+            else:
+                next_url = resp.links.get("next", {}).get("url")
+                if next_url:
+                    resp = client.get(next_url)
+                    resp.raise_for_status()
+                    continue
+            break
+
+        self.known.update(item["login"] for item in new)
+        self._adapt(bool(new), requested)
+        return new
+
+    def _adapt(self, changed, requested):
+        self.interval = self.min_interval if changed else min(self.interval * POLL_BACKOFF, self.max_interval)
+        self.interval = max(self.interval, requested)
+
+
+def retry_delay(error, interval):
+    """
+    Return the seconds to wait before polling again after a failed request.
+
+    Args:
+        error: The exception raised by the poll or the reconciliation
+        interval: The current poll interval
+
+    Returns:
+        Retry-After of the failed response if it asks for longer, else interval
+    """
+    resp = getattr(error, "response", None)
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after is not None and retry_after.isdigit():
+        return max(interval, int(retry_after))
+    return interval
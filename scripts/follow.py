@@ -1,29 +1,91 @@
-import requests
-from scripts.utils import get_headers
-
-def follow_users(token, usernames, dry_run=False):
-    headers = get_headers(token)
-    for username in sorted(usernames):
-        if dry_run:
-            print(f"[DRY-RUN] Would follow: {username}")
-            continue
-        url = f"https://api.github.com/user/following/{username}"
-        resp = requests.put(url, headers=headers)
-        if resp.status_code in [204, 304]:
-            print(f"✅ Followed: {username}")
-        else:
-            print(f"❌ Failed to follow {username}: {resp.status_code} - {resp.text}")
-
-def unfollow_users(token, usernames, dry_run=False):
-    headers = get_headers(token)
-    for username in sorted(usernames):
-        if dry_run:
-            print(f"[DRY-RUN] Would unfollow: {username}")
-            continue
-        url = f"https://api.github.com/user/following/{username}"
-        resp = requests.delete(url, headers=headers)
-        if resp.status_code == 204:
-            print(f"🔁 Unfollowed: {username}")
-        else:
-            print(f"⚠️ Failed to unfollow {username}: {resp.status_code} - {resp.text}")
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import NamedTuple
 
+from scripts.client import client_for
+from scripts.ratelimit import TokenBucket
+
+# Follow/unfollow requests in flight at once; the TokenBucket caps the rate
+WRITE_WORKERS = 4
+
+
+class WriteResult(NamedTuple):
+    """Outcome of one follow or unfollow (status is None in dry-run mode or on a network error)."""
+    username: str
+    action: str
+    ok: bool
+    status: int | None = None
+    error: str | None = None
+
+
+# action -> (method, success statuses, success message, failure message)
+_WRITE_ACTIONS = {
+    "follow": ("PUT", (204, 304), "✅ Followed: {}", "❌ Failed to follow {}: {}"),
+    "unfollow": ("DELETE", (204,), "🔁 Unfollowed: {}", "⚠️ Failed to unfollow {}: {}"),
+}
+
+
+def run_writes(token, action, usernames, dry_run=False, client=None, max_workers=1, throttle=None, on_result=None):
+    """
+    Follow or unfollow usernames with bounded concurrency and a cap on writes per minute.
+
+    Every write first takes a token from throttle. A write that needed
+    rate-limit retries (GitHub's secondary limits) halves the throttle's rate,
+    on top of the client's own backoff.
+
+    Args:
+        action: "follow" or "unfollow"
+        max_workers: Number of writes in flight at once
+        throttle: TokenBucket shared by all writes of the run (a default one if omitted)
+        on_result: Called with each WriteResult as soon as the write completes
+
+    Returns:
+        List of WriteResult, in the order the writes completed
+    """
+    method, ok_statuses, ok_message, fail_message = _WRITE_ACTIONS[action]
+    if dry_run:
+        results = []
+        for username in sorted(usernames):
+            print(f"[DRY-RUN] Would {action}: {username}")
+            results.append(WriteResult(username, action, ok=True))
+        return results
+
+    throttle = throttle or TokenBucket()
+    with client_for(token, client) as client:
+
+        def write(username):
+            throttle.acquire()
+            try:
+                resp = client.request(method, client.url(f"/user/following/{username}"))
+            except OSError as e:  # requests' exceptions and every transport's derive from OSError
+                return WriteResult(username, action, ok=False, error=str(e))
+            if getattr(resp, "retries", 0):
+                throttle.slow_down()
+            if resp.status_code in ok_statuses:
+                return WriteResult(username, action, ok=True, status=resp.status_code)
+            return WriteResult(username, action, ok=False, status=resp.status_code, error=resp.text)
+
+        def report(result):
+            if result.ok:
+                print(ok_message.format(result.username))
+            else:
+                detail = f"{result.status} - {result.error}" if result.status is not None else result.error
+                print(fail_message.format(result.username, detail))
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        if max_workers <= 1:
+            return [report(write(username)) for username in sorted(usernames)]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(write, username) for username in sorted(usernames)]
+            return [report(future.result()) for future in as_completed(futures)]
+
+
+def follow_users(token, usernames, dry_run=False, client=None, max_workers=1, throttle=None, on_result=None):
+    return run_writes(token, "follow", usernames, dry_run=dry_run, client=client,
+                      max_workers=max_workers, throttle=throttle, on_result=on_result)
+
+
+def unfollow_users(token, usernames, dry_run=False, client=None, max_workers=1, throttle=None, on_result=None):
+    return run_writes(token, "unfollow", usernames, dry_run=dry_run, client=client,
+                      max_workers=max_workers, throttle=throttle, on_result=on_result)
@@ -0,0 +1,126 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.client import client_for
+
+
+# Logins looked up per GraphQL query; a query of this size costs about one
+# point of the GraphQL rate limit instead of 100 REST calls.
+GRAPHQL_BATCH_SIZE = 100
+
+# Only the fields calculate_spam_score reads, plus id/updated_at for caching.
+# REST public_repos counts owned repositories only, and repositories() also
+# counts ones the user collaborates on unless ownerAffiliations says otherwise
+_USER_FRAGMENT = """
+fragment SpamFields on User {
+  login
+  databaseId
+  name
+  bio
+  createdAt
+  updatedAt
+  repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+  followers { totalCount }
+}
+"""
+
+
+def build_user_query(logins):
+    """
+    Build one GraphQL query looking up every login through an aliased user() field.
+
+    Logins are passed as variables rather than interpolated into the query.
+
+    Returns:
+        (query, variables)
+    """
+    params = ", ".join(f"$l{i}: String!" for i in range(len(logins)))
+    fields = "\n".join(f"  u{i}: user(login: $l{i}) {{ ...SpamFields }}" for i in range(len(logins)))
+    query = f"query({params}) {{\n{fields}\n}}\n{_USER_FRAGMENT}"
+    variables = {f"l{i}": login for i, login in enumerate(logins)}
+    return query, variables
+
+
+def to_rest_shape(node):
+    """Convert a GraphQL user node into the dict shape of GET /users/{username}."""
+    return {
+        "login": node["login"],
+        "id": node.get("databaseId"),
+        "name": node.get("name"),
+        "bio": node.get("bio"),
+        "public_repos": node["repositories"]["totalCount"],
+        "followers": node["followers"]["totalCount"],
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+    }
+
+
+def get_user_details_batch(token, logins, client=None):
+    """
+    Look up at most GRAPHQL_BATCH_SIZE users in a single GraphQL query.
+
+    Returns:
+        (details, missing): dict of login -> REST-shaped user dict, and dict of
+        login -> reason for logins that could not be resolved (renamed or deleted)
+    """
+    logins = list(logins)
+    query, variables = build_user_query(logins)
+    with client_for(token, client) as client:
+        resp = client.post(client.graphql_url, json={"query": query, "variables": variables})
+    resp.raise_for_status()
+    payload = resp.json()
+
+    data = payload.get("data")
+    if data is None:
+        messages = "; ".join(e.get("message", "") for e in payload.get("errors", []))
+        raise RuntimeError(f"GraphQL query failed: {messages}")
+
+    errors_by_alias = {}
+    for error in payload.get("errors", []):
+        path = error.get("path") or []
+        if path:
+            errors_by_alias[path[0]] = error.get("message", "unknown error")
+
+    details = {}
+    missing = {}
+    for i, login in enumerate(logins):
+        alias = f"u{i}"
+        node = data.get(alias)
+        if node is None:
+            missing[login] = errors_by_alias.get(alias, "user not found (renamed or deleted)")
+        else:
+            details[login] = to_rest_shape(node)
+    return details, missing
+
+
+def get_user_details(token, logins, client=None, batch_size=GRAPHQL_BATCH_SIZE, max_workers=1):
+    """
+    Look up any number of users, batch_size logins per GraphQL query.
+
+    A failed query marks every login of its batch as missing with the error
+    message instead of aborting the other batches.
+
+    Returns:
+        (details, missing): see get_user_details_batch
+    """
+    logins = list(logins)
+    batches = [logins[i:i + batch_size] for i in range(0, len(logins), batch_size)]
+
+    with client_for(token, client) as client:
+        def fetch(batch):
+            try:
+                return get_user_details_batch(token, batch, client=client)
+            except Exception as e:
+                return {}, {login: str(e) for login in batch}
+
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(fetch, batches))
+        else:
+            results = list(map(fetch, batches))
+
+    details = {}
+    missing = {}
+    for batch_details, batch_missing in results:
+        details.update(batch_details)
+        missing.update(batch_missing)
+    return details, missing
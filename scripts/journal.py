@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import time
+from typing import NamedTuple
+
+from scripts.follow import WriteResult
+
+
+JOURNAL_FILE = "journal.jsonl"
+
+
+class JournalState(NamedTuple):
+    """What a journal says about a run: its plan, the completed writes and whether it finished."""
+    plan: dict
+    results: list[WriteResult]
+    finished: bool
+
+    def pending(self, action):
+        """Return the logins of the planned action ("follow"/"unfollow") not yet done successfully."""
+        done = {r.username for r in self.results if r.action == action and r.ok}
+        return {username for username in self.plan[action] if username not in done}
+
+
+class ActionJournal:
+    """
+    Append-only JSON-lines journal of one run's follow/unfollow plan.
+
+    The first line holds the plan (logins to follow and unfollow, plus the
+    lists the snapshot is built from), each following line the result of one
+    write, and a last "finished" line marks a run that got to the end. Lines
+    are flushed as they are written, so a run that dies halfway leaves
+    every completed write on disk and can be resumed from there. A torn last
+    line is ignored on load and dropped on reopen.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Return the JournalState of the journal on disk, or None if there is no usable one."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return None
+        plan, results, finished = None, [], False
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            kind = entry.pop("type", None)
+            if kind == "plan":
+                plan = entry
+            elif kind == "result" and plan is not None:
+                results.append(WriteResult(**entry))
+            elif kind == "finished":
+                finished = True
+        if plan is None:
+            return None
+        return JournalState(plan, results, finished)
+
+    def start(self, follow, unfollow, followers, following, scanned_at=None):
+        """Replace any previous journal with the plan of a new run."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.close()
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._append({
+            "type": "plan",
+            "created_at": time.time(),
+            "follow": sorted(follow),
+            "unfollow": sorted(unfollow),
+            "followers": list(followers),
+            "following": list(following),
+            "scanned_at": scanned_at,
+        }, sync=True)
+
+    def reopen(self):
+        """Continue appending to the journal on disk (for a resumed run), dropping a torn last line."""
+        self.close()
+        with open(self.path, "r+b") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                # Appending to a line cut off by a crash would make the next entry unreadable too
+                f.truncate(data.rfind(b"\n") + 1)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def record(self, result):
+        """Append the result of one write."""
+        self._append({"type": "result", **result._asdict()})
+
+    def finish(self):
+        """Mark the run as finished and close the journal."""
+        self._append({"type": "finished", "finished_at": time.time()}, sync=True)
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _append(self, entry, sync=False):
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
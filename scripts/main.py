@@ -1,82 +1,775 @@
 import os
+import sys
 import argparse
-from scripts.follow import follow_users, unfollow_users
-from scripts.utils import get_followers, get_following, get_user_detail
-from scripts.spam import is_spam
+import threading
+import time
+from datetime import datetime, timezone
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import NamedTuple
+from scripts.ageindex import AGE_INDEX_FILE, AccountAgeIndex
+from scripts.cache import DEFAULT_MAX_BYTES, ResponseCache
+from scripts.client import API_URL, DEFAULT_POOL_SIZE, GitHubClient
+from scripts.columnar import score_users
+from scripts.daemon import DEFAULT_POLL_INTERVAL, MAX_POLL_INTERVAL, RECONCILE_INTERVAL, FollowerPoller, retry_delay
+from scripts.follow import WRITE_WORKERS, follow_users, unfollow_users
+from scripts.graphql import get_user_details
+from scripts.journal import JOURNAL_FILE, ActionJournal
+from scripts.metrics import RunMetrics
+from scripts.ratelimit import WRITES_PER_MINUTE, TokenBucket
+from scripts.rescan import ROTATION_DAYS, select_rescans
+from scripts.rules import compile_rules, load_rules
+from scripts.score import main as score_main
+from scripts.userlist import UserList, merge_diff
+from scripts.utils import get_authenticated_user, get_user_detail, iter_followers, iter_following
+from scripts.snapshot import SNAPSHOT_FILE, load_snapshot, save_snapshot, sync_lists
+from scripts.spam import SPAM_THRESHOLD, calculate_spam_score, can_settle_from_id, created_range, score_bounds
+from scripts.store import STATE_DB, StateStore
+from scripts.transport import TRANSPORTS
+from scripts.verdicts import VERDICTS_FILE, VerdictStore
 
 
-def filter_spam_users(token, usernames, label=""):
+# Accounts synced in parallel when GH_TOKENS lists several
+ACCOUNT_WORKERS = 4
+
+
+class UserDetailFetcher:
+    """
+    Fetch user details, collapsing concurrent requests for the same login.
+
+    While a fetch for a login is in flight, other threads asking for the same
+    login wait for that result instead of sending a request of their own.
+    One fetcher can be shared by several accounts: each fetch is sent with
+    the client passed to fetch(), so it is billed to the asking account.
+    """
+
+    def __init__(self, token, client=None):
+        self.token = token
+        self.client = client
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, username, client=None):
+        with self._lock:
+            future = self._in_flight.get(username)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[username] = future
+
+        if owner:
+            try:
+                future.set_result(get_user_detail(self.token, username, client=client or self.client))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._in_flight[username]
+
+        return future.result()
+
+
+def fetch_user_details(token, usernames, client=None, max_workers=1, fetcher=None, backend="rest"):
+    """
+    Fetch profiles for usernames with the chosen backend.
+
+    Returns:
+        List of (username, detail, error) with exactly one of detail/error set
+    """
+    if backend == "graphql":
+        details, missing = get_user_details(token, usernames, client=client, max_workers=max_workers)
+        return [
+            (username, details[username], None) if username in details
+            else (username, None, missing[username])
+            for username in usernames
+        ]
+
+    fetcher = fetcher or UserDetailFetcher(token, client=client)
+
+    def fetch(username):
+        try:
+            return username, fetcher.fetch(username, client=client), None
+        except Exception as e:
+            return username, None, e
+
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch, usernames))
+    return [fetch(username) for username in usernames]
+
+
+def _score_one(detail, now, rules):
+    """Return calculate_spam_score's (score, reasons) for detail, or the error it raised."""
+    try:
+        return calculate_spam_score(detail, now, rules=rules)
+    except (TypeError, ValueError, AttributeError) as e:
+        return e
+
+
+def filter_spam_users(
+    token, usernames, label="", client=None, max_workers=1, fetcher=None, backend="rest", verdicts=None,
+    user_ids=None, age_index=None, rules=None, db=None,
+):
     """
     Filter out spam accounts from a set of usernames.
 
+    Args:
+        max_workers: Number of user details (or GraphQL batches) fetched concurrently
+        fetcher: UserDetailFetcher shared between calls (one is created if omitted)
+        backend: "rest" for one /users/{username} call per user, or "graphql"
+            for batched lookups of up to 100 users per query
+        verdicts: VerdictStore whose unexpired verdicts are reused without a fetch
+        user_ids: {login: id} from the list payloads; when given, users whose
+            score_bounds already settle the verdict are not fetched
+        age_index: AccountAgeIndex that bounds account ages from ids for the
+            pre-screen and learns from every fetched profile
+        rules: RulePlan (from --rules) to score with instead of the built-in rules
+        db: StateStore that keeps the scored fields of every fetched profile
+
     Returns:
         (clean, spam_list): set of non-spam usernames, list of (username, reasons) for spam
     """
     clean = set()
     spam_list = []
+    results = []
+    threshold = rules.threshold if rules is not None else SPAM_THRESHOLD
 
+    pending = []
     for username in usernames:
-        try:
-            user_detail = get_user_detail(token, username)
-            spam, reasons = is_spam(user_detail)
-            if spam:
-                spam_list.append((username, reasons))
+        cached = verdicts.get(username) if verdicts is not None else None
+        if cached is None:
+            pending.append(username)
+        else:
+            results.append((username, cached, None))
+
+    if user_ids is not None and pending and can_settle_from_id(threshold, rules):
+        now = datetime.now(timezone.utc)
+        estimate_created = age_index.created_range if age_index is not None else created_range
+        unsettled = []
+        for username in pending:
+            bounds = score_bounds(
+                {"login": username, "id": user_ids.get(username)}, now, estimate_created, rules=rules
+            )
+            if bounds.low >= threshold:
+                results.append((username, (True, bounds.reasons), None))
+            elif bounds.high < threshold:
+                results.append((username, (False, bounds.reasons), None))
             else:
-                clean.add(username)
-        except Exception as e:
-            print(f"⚠️  Could not fetch details for {username}{f' ({label})' if label else ''}: {e}")
+                unsettled.append(username)
+        print(
+            f"⏭️  Pre-screening settled {len(pending) - len(unsettled)} of {len(pending)}"
+            f"{f' {label}' if label else ''} profiles without a fetch"
+        )
+        pending = unsettled
+
+    stored = {}
+    if db is not None and pending:
+        # Profiles fetched shortly before (e.g. ahead of a rules change) are scored again without a fetch
+        stored = db.get_profiles(pending)
+        if stored:
+            print(f"💾 Reusing {len(stored)}{f' {label}' if label else ''} profiles stored in the last day")
+            pending = [username for username in pending if username not in stored]
+
+    fetched = []
+    for username, detail, error in fetch_user_details(
+        token, pending, client=client, max_workers=max_workers, fetcher=fetcher, backend=backend
+    ):
+        if error is not None:
+            results.append((username, None, error))
+        else:
+            fetched.append((username, detail))
+            if age_index is not None:
+                age_index.learn(detail)
+
+    if db is not None:
+        db.put_profiles(dict(detail, login=username) for username, detail in fetched)
+    fetched += stored.items()
+    now = datetime.now(timezone.utc)
+    try:
+        scores = score_users((detail for _, detail in fetched), now, rules=rules)
+    except (TypeError, ValueError, AttributeError):
+        # A malformed profile fails the whole batch; score one by one so only it is skipped
+        scores = [_score_one(detail, now, rules) for _, detail in fetched]
+    for (username, detail), scored in zip(fetched, scores):
+        if isinstance(scored, Exception):
+            results.append((username, None, scored))
+            continue
+        score, reasons = scored
+        if verdicts is not None:
+            verdicts.put(username, detail, score, reasons)
+        results.append((username, (score >= threshold, reasons), None))
+
+    for username, verdict, error in results:
+        if error is not None:
+            print(f"⚠️  Could not check {username}{f' ({label})' if label else ''}: {error}")
             # When in doubt, skip rather than follow/unfollow
             clean.add(username)
+            continue
+        spam, reasons = verdict
+        if spam:
+            spam_list.append((username, reasons))
+        else:
+            clean.add(username)
 
     return clean, spam_list
 
 
 def main():
+    if sys.argv[1:2] == ["score"]:
+        return score_main(sys.argv[2:])
+
     parser = argparse.ArgumentParser()
     parser.add_argument("--dry-run", action="store_true", help="Simulate actions without changing anything")
+    parser.add_argument("--workers", type=int, default=1, help="Number of user details fetched concurrently")
+    parser.add_argument(
+        "--profile-backend", choices=["rest", "graphql"], default="rest",
+        help="Fetch profiles one REST call per user or 100 users per GraphQL query",
+    )
+    parser.add_argument("--state-dir", help="Directory for state kept between runs (disabled if omitted)")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Only fetch the list pages that changed since the snapshot in --state-dir",
+    )
+    parser.add_argument(
+        "--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Size limit of the on-disk response cache in MB",
+    )
+    parser.add_argument(
+        "--write-workers", type=int, default=WRITE_WORKERS, help="Number of follow/unfollow requests in flight at once",
+    )
+    parser.add_argument(
+        "--writes-per-minute", type=int, default=WRITES_PER_MINUTE,
+        help="Cap on follow/unfollow requests per minute (0 for no cap)",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Only replay the follows/unfollows an interrupted run left in the journal in --state-dir",
+    )
+    parser.add_argument(
+        "--state-backend", choices=["json", "sqlite"], default="json",
+        help="Keep lists, verdicts, profiles and action history in JSON files or in one SQLite database",
+    )
+    parser.add_argument(
+        "--transport", choices=TRANSPORTS, default="auto",
+        help="HTTP backend for API calls (auto: requests if installed, else the stdlib one)",
+    )
+    parser.add_argument("--metrics-json", help="Write run metrics as JSON to this path")
+    parser.add_argument("--metrics-prom", help="Write run metrics as a Prometheus textfile to this path")
+    parser.add_argument(
+        "--mutual-budget", type=int,
+        help="Re-check at most this many mutual follows per run, stalest and riskiest first (default: all)",
+    )
+    parser.add_argument(
+        "--mutual-rotation-days", type=float, default=ROTATION_DAYS,
+        help="With --mutual-budget, re-check every mutual follow at least this often",
+    )
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="Keep running: poll for new followers and follow them back within minutes",
+    )
+    parser.add_argument(
+        "--poll-interval", type=int, default=DEFAULT_POLL_INTERVAL,
+        help="Daemon: seconds between polls while followers keep arriving",
+    )
+    parser.add_argument(
+        "--max-poll-interval", type=int, default=MAX_POLL_INTERVAL,
+        help="Daemon: longest wait between polls when nothing changes",
+    )
+    parser.add_argument(
+        "--reconcile-hours", type=float, default=RECONCILE_INTERVAL / 3600,
+        help="Daemon: hours between full syncs",
+    )
+    parser.add_argument("--rules", help="TOML or JSON file with spam rule weights and patterns (see scripts/rules.py)")
+    parser.add_argument(
+        "--rule-stats", action="store_true", help="Time every spam rule and print per-rule counts and timings",
+    )
+    parser.add_argument(
+        "--account-workers", type=int, default=ACCOUNT_WORKERS,
+        help="Number of accounts synced in parallel when GH_TOKENS lists several",
+    )
     args = parser.parse_args()
+    if args.resume and not args.state_dir:
+        parser.error("--resume requires --state-dir")
+    if args.resume and args.daemon:
+        parser.error("--resume cannot be combined with --daemon")
+    if args.state_backend == "sqlite" and not args.state_dir:
+        parser.error("--state-backend sqlite requires --state-dir")
+    if args.mutual_budget is not None and not args.state_dir:
+        # Without the verdict history every mutual follow is due, so the budget would cap nothing
+        parser.error("--mutual-budget requires --state-dir")
+
+    tokens = load_tokens()
+    if args.daemon and len(tokens) > 1:
+        # A daemon never returns, so accounts past --account-workers would never start, and
+        # the shared stores would be checkpointed from several threads at once
+        parser.error("--daemon syncs a single account; run one daemon per token instead of GH_TOKENS")
+    rules = None
+    if args.rules:
+        rules = load_rules(args.rules, profile=args.rule_stats)
+    elif args.rule_stats:
+        rules = compile_rules(profile=True)
+    store_kwargs = {"threshold": rules.threshold, "fingerprint": rules.fingerprint} if rules is not None else {}
+    db = None
+    verdicts = None
+    if args.state_backend == "sqlite":
+        os.makedirs(args.state_dir, exist_ok=True)
+        db = StateStore(os.path.join(args.state_dir, STATE_DB))
+        verdicts = VerdictStore(db=db, **store_kwargs)
+    elif args.state_dir:
+        verdicts = VerdictStore(os.path.join(args.state_dir, VERDICTS_FILE), **store_kwargs)
+    age_index = None
+    if can_settle_from_id(rules.threshold if rules is not None else SPAM_THRESHOLD, rules):
+        # The index only serves the id pre-screen, which the built-in weights never run
+        age_index = AccountAgeIndex(os.path.join(args.state_dir, AGE_INDEX_FILE) if args.state_dir else None)
+
+    if len(tokens) == 1:
+        try:
+            run_account(tokens[0], args, verdicts=verdicts, age_index=age_index, rules=rules, db=db)
+        finally:
+            if verdicts is not None:
+                verdicts.save()
+                print(verdicts.report())
+            if age_index is not None:
+                age_index.save()
+                print(age_index.report())
+            if args.rule_stats:
+                print(rules.report())
+            if db is not None:
+                db.close()
+        return
+
+    # Verdicts and in-flight profile fetches are shared, so a login that
+    # shows up under several accounts is usually fetched and scored once
+    if verdicts is None:
+        verdicts = VerdictStore(**store_kwargs)
+    fetcher = UserDetailFetcher(None)
+    run = partial(
+        run_account, args=args, verdicts=verdicts, fetcher=fetcher, age_index=age_index, rules=rules, db=db,
+        multi_account=True,
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.account_workers)) as executor:
+            results = list(executor.map(run, tokens))
+    finally:
+        verdicts.save()
+        print(verdicts.report())
+        if age_index is not None:
+            age_index.save()
+            print(age_index.report())
+        if args.rule_stats:
+            print(rules.report())
+        if db is not None:
+            db.close()
+
+    failed = 0
+    for result in results:
+        if result.error is not None:
+            failed += 1
+            print(f"❌ {result.login}: {result.error}")
+        else:
+            ok = sum(r.ok for r in result.writes)
+            print(f"👤 {result.login}: {ok} writes done, {len(result.writes) - ok} failed")
+    if failed:
+        raise RuntimeError(f"{failed} of {len(results)} accounts failed")
+
+
+class SyncResult(NamedTuple):
+    """Outcome of one sync: the write results and both lists as they are expected to be afterwards."""
+    writes: list
+    followers: list
+    following: list
+
+
+class AccountResult(NamedTuple):
+    """Outcome of syncing one account (login is None if even GET /user failed)."""
+    login: str | None
+    writes: list
+    error: Exception | None = None
+
 
+def load_tokens():
+    """Return the tokens in GH_TOKENS (comma or whitespace separated), or else GH_TOKEN."""
+    tokens = os.getenv("GH_TOKENS", "").replace(",", " ").split()
+    if tokens:
+        return list(dict.fromkeys(tokens))
     token = os.getenv("GH_TOKEN")
     if not token:
         raise EnvironmentError("GH_TOKEN is not set")
+    return [token]
 
-    print("🔄 Fetching followers...")
-    followers = get_followers(token)
 
-    print("🔄 Fetching following...")
-    following = get_following(token)
+def run_account(
+    token, args, verdicts=None, fetcher=None, age_index=None, rules=None, db=None, multi_account=False
+):
+    """
+    Sync (or resume) one account with its own client, rate budget, cache and metrics.
+
+    With multi_account=True, the account's state lives in a subdirectory of
+    --state-dir named after its login (and under its login in db), errors
+    are returned instead of raised and metrics files get the login appended
+    to their name.
+
+    Returns:
+        AccountResult
+    """
+    metrics = RunMetrics()
+    pool_size = max(DEFAULT_POOL_SIZE, args.workers, args.write_workers)
+    api_url = os.getenv("GITHUB_API_URL", API_URL)
+    cache = None
+    login = None
+    metrics_paths = [args.metrics_json, args.metrics_prom]
+    try:
+        with GitHubClient(
+            token, api_url=api_url, pool_size=pool_size, metrics=metrics, transport=args.transport
+        ) as client:
+            state_dir = args.state_dir
+            if multi_account:
+                login = get_authenticated_user(token, client=client)["login"]
+                print(f"👤 Syncing {login}...")
+                metrics.labels["account"] = login
+                metrics_paths = [_account_path(path, login) for path in metrics_paths]
+                state_dir = os.path.join(state_dir, login) if state_dir else None
+            if state_dir:
+                cache = ResponseCache(
+                    os.path.join(state_dir, "http-cache.json"), max_bytes=args.cache_max_mb * 1024 * 1024
+                )
+                client.cache = cache
+
+            throttle = TokenBucket(args.writes_per_minute)
+            sync_kwargs = dict(
+                dry_run=args.dry_run, workers=args.workers, backend=args.profile_backend, state_dir=state_dir,
+                incremental=args.incremental, verdicts=verdicts, metrics=metrics, write_workers=args.write_workers,
+                throttle=throttle, fetcher=fetcher, age_index=age_index, mutual_budget=args.mutual_budget,
+                rotation_days=args.mutual_rotation_days, rules=rules, db=db, account=login or "",
+            )
+            if args.resume:
+                writes = resume(
+                    token, client, state_dir, metrics=metrics, write_workers=args.write_workers,
+                    throttle=throttle, db=db, account=login or "",
+                )
+            elif args.daemon:
+
+                def checkpoint():
+                    for store in (cache, verdicts, age_index):
+                        if store is not None:
+                            store.save()
+
+                writes = daemon(
+                    token, client, sync_kwargs, poll_interval=args.poll_interval,
+                    max_poll_interval=args.max_poll_interval, reconcile_interval=args.reconcile_hours * 3600,
+                    checkpoint=checkpoint,
+                )
+            else:
+                writes = sync(token, client, **sync_kwargs).writes
+        return AccountResult(login, writes or [])
+    except Exception as e:
+        if not multi_account:
+            raise
+        return AccountResult(login, [], e)
+    finally:
+        if cache is not None:
+            cache.save()
+            metrics.record_cache("http", cache.hits, cache.misses)
+            print(cache.report())
+        if verdicts is not None and not multi_account:
+            metrics.record_cache("verdicts", verdicts.hits, verdicts.misses)
+        json_path, prom_path = metrics_paths
+        if json_path:
+            metrics.write_json(json_path)
+        if prom_path:
+            metrics.write_prometheus(prom_path)
+
+
+def daemon(
+    token, client, sync_kwargs, poll_interval=DEFAULT_POLL_INTERVAL, max_poll_interval=MAX_POLL_INTERVAL,
+    reconcile_interval=RECONCILE_INTERVAL, max_cycles=None, checkpoint=None, sleep=time.sleep, clock=time.monotonic,
+):
+    """
+    Keep following back new followers within minutes, reconciling fully now and then.
+
+    Runs a full sync(token, client, **sync_kwargs), then polls the first
+    followers page (see FollowerPoller) and spam-checks and follows only the
+    followers that appeared since. Another full sync runs every
+    reconcile_interval seconds, after which checkpoint() is called to
+    persist state. A poll or reconciliation that fails with a network or
+    HTTP error is logged and retried after the poll interval (or the
+    response's Retry-After). Stops after max_cycles polls (forever if None)
+    or on Ctrl-C.
+
+    Returns:
+        List of WriteResult of every write made
+    """
+    dry_run = sync_kwargs.get("dry_run", False)
+    result = sync(token, client, **sync_kwargs)
+    writes = list(result.writes)
+    following = set(result.following)
+    poller = FollowerPoller(
+        token, client, known=result.followers, min_interval=poll_interval, max_interval=max_poll_interval
+    )
+    last_reconcile = clock()
+    check_spam = partial(
+        filter_spam_users, token, client=client, max_workers=sync_kwargs.get("workers", 1),
+        fetcher=sync_kwargs.get("fetcher"), backend=sync_kwargs.get("backend", "rest"),
+        verdicts=sync_kwargs.get("verdicts"), age_index=sync_kwargs.get("age_index"),
+        rules=sync_kwargs.get("rules"), db=sync_kwargs.get("db"),
+    )
+    print(f"👀 Watching for new followers every {poll_interval}s (up to {poller.max_interval}s when idle)")
+
+    cycles = 0
+    delay = poller.interval
+    try:
+        while max_cycles is None or cycles < max_cycles:
+            sleep(delay)
+            delay = poller.interval
+            cycles += 1
+            if clock() - last_reconcile >= reconcile_interval:
+                print("🔄 Reconciling follower and following lists...")
+                try:
+                    result = sync(token, client, **sync_kwargs)
+                except OSError as e:
+                    # Covers requests' and the stdlib transports' HTTP and connection errors
+                    delay = retry_delay(e, poller.interval)
+                    print(f"⚠️  Reconciliation failed, retrying in {delay}s: {e}")
+                    continue
+                writes.extend(result.writes)
+                following = set(result.following)
+                poller.reset(result.followers)
+                last_reconcile = clock()
+                if checkpoint is not None:
+                    checkpoint()
+                continue
 
-    follower_usernames = {f["login"] for f in followers}
-    following_usernames = {f["login"] for f in following}
+            try:
+                new = poller.poll()
+            except OSError as e:
+                delay = retry_delay(e, poller.interval)
+                print(f"⚠️  Poll failed, retrying in {delay}s: {e}")
+                continue
+            candidates = {item["login"]: item.get("id") for item in new if item["login"] not in following}
+            if not candidates:
+                continue
+            print(f"👋 {len(candidates)} new follower(s): {', '.join(candidates)}")
+            to_follow, spam = check_spam(candidates, label="new follower", user_ids=candidates)
+            for username, reasons in spam:
+                print(f"🚫 Skipping spam follower: {username} (reasons: {', '.join(reasons)})")
+            followed = follow_users(
+                token, to_follow, dry_run=dry_run, client=client,
+                max_workers=sync_kwargs.get("write_workers", 1), throttle=sync_kwargs.get("throttle"),
+            )
+            writes.extend(followed)
+            following.update(r.username for r in followed if r.ok)
+            db = sync_kwargs.get("db")
+            if db is not None and not dry_run:
+                account = sync_kwargs.get("account", "")
+                db.apply_writes(followed, ids=candidates, account=account)
+                db.record_actions(followed, account=account)
+    except KeyboardInterrupt:
+        print("🛑 Daemon stopped")
+    print(f"📊 Daemon: {poller.polls} polls, {poller.not_modified} not modified")
+    return writes
+
+
+def _account_path(path, login):
+    """Return path with -login inserted before its extension (None stays None)."""
+    if not path:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{login}{ext}"
+
+
+def sync(
+    token, client, dry_run=False, workers=1, backend="rest", state_dir=None, incremental=False, verdicts=None,
+    metrics=None, write_workers=1, throttle=None, fetcher=None, age_index=None, mutual_budget=None,
+    rotation_days=ROTATION_DAYS, rules=None, db=None, account="",
+):
+    """
+    Run one follow/unfollow pass for the account behind token.
 
-    to_follow_candidates = follower_usernames - following_usernames
-    to_unfollow_candidates = following_usernames - follower_usernames
+    With a state_dir, the follower/following lists are saved as a snapshot
+    after the run; incremental=True then reads only what changed since it.
+    Phase timings are recorded in metrics (a RunMetrics, created if omitted).
+    Follows and unfollows run write_workers at a time and share throttle;
+    with a state_dir their plan and results are journaled for --resume.
+    With a mutual_budget, only that many mutual follows (plus those with
+    reusable verdicts and those due under rotation_days) are re-checked.
+    Profiles are scored with rules (a RulePlan) when given. With a db
+    (StateStore), the lists are streamed into it under account, compared
+    there instead of in memory, and it stands in for the snapshot file.
+
+    Returns:
+        SyncResult
+    """
+    metrics = metrics or RunMetrics()
+    stored = set()
+
+    def full_fetch(kind):
+        print(f"🔄 Fetching {kind}...")
+        fetch = iter_followers if kind == "followers" else iter_following
+        with metrics.phase(f"fetch_{kind}"):
+            items = fetch(token, client=client, max_workers=workers)
+            if db is None:
+                return UserList.from_items(items)
+            db.replace_list(kind, items, account)
+            stored.add(kind)
+            return UserList(db.logins(kind, account))
+
+    snapshot_path = os.path.join(state_dir, SNAPSHOT_FILE) if state_dir else None
+    if incremental and (snapshot_path or db is not None):
+        load = load_snapshot if db is None else (lambda _: db.load_snapshot(account))
+        with metrics.phase("fetch_incremental"):
+            followers, following, scanned_at = sync_lists(
+                token, client, snapshot_path, full_fetch=full_fetch, load=load
+            )
+    else:
+        followers, following, scanned_at = full_fetch("followers"), full_fetch("following"), None
+
+    # Incrementally synced lists come back as plain login lists
+    followers = followers if isinstance(followers, UserList) else UserList(followers)
+    following = following if isinstance(following, UserList) else UserList(following)
+    # {login: id} for each part, so the spam check can pre-screen from the list payloads
+    if db is None:
+        to_follow_candidates, to_unfollow_candidates, mutual = merge_diff(followers, following, with_ids=True)
+    else:
+        for kind, users in (("followers", followers), ("following", following)):
+            if kind not in stored:
+                db.replace_list(kind, users, account)
+        with metrics.phase("diff"):
+            to_follow_candidates, to_unfollow_candidates, mutual = db.diff(account)
+    check_spam = partial(
+        filter_spam_users, token, client=client, max_workers=workers,
+        fetcher=fetcher or UserDetailFetcher(token, client=client), backend=backend, verdicts=verdicts,
+        age_index=age_index, rules=rules, db=db,
+    )
 
     # Filter spam from new followers before following them
     print("🔍 Checking new followers for spam accounts...")
-    to_follow, spam_followers = filter_spam_users(token, to_follow_candidates, label="new follower")
+    with metrics.phase("spam_check_new_followers"):
+        to_follow, spam_followers = check_spam(
+            to_follow_candidates, label="new follower", user_ids=to_follow_candidates
+        )
     for username, reasons in spam_followers:
         print(f"🚫 Skipping spam follower: {username} (reasons: {', '.join(reasons)})")
 
     # Filter spam from existing following list (unfollow spam accounts)
     print("🔍 Checking following list for spam accounts...")
-    _, spam_following = filter_spam_users(token, to_unfollow_candidates, label="following")
+    with metrics.phase("spam_check_following"):
+        _, spam_following = check_spam(
+            to_unfollow_candidates, label="following", user_ids=to_unfollow_candidates
+        )
     spam_following_usernames = {u for u, _ in spam_following}
     for username, reasons in spam_following:
         print(f"🚫 Marking spam account for unfollow: {username} (reasons: {', '.join(reasons)})")
 
     # Also check mutual follows for spam (users we follow who also follow us)
-    mutual = follower_usernames & following_usernames
     print("🔍 Checking mutual follows for spam accounts...")
-    _, spam_mutual = filter_spam_users(token, mutual, label="mutual")
+    if mutual_budget is not None:
+        selected, due = select_rescans(mutual, verdicts, mutual_budget, rotation_days=rotation_days)
+        print(f"🔁 Re-checking {len(selected)} of {len(mutual)} mutual follows ({due} due, budget {mutual_budget})")
+        if due > mutual_budget:
+            print(f"⚠️  {due} mutual follows are past the {rotation_days}-day rotation; raise --mutual-budget")
+        mutual = {login: mutual[login] for login in selected}
+    with metrics.phase("spam_check_mutual"):
+        _, spam_mutual = check_spam(mutual, label="mutual", user_ids=mutual)
     spam_mutual_usernames = {u for u, _ in spam_mutual}
     for username, reasons in spam_mutual:
         print(f"🚫 Marking mutual spam account for unfollow: {username} (reasons: {', '.join(reasons)})")
 
-    to_unfollow = to_unfollow_candidates | spam_following_usernames | spam_mutual_usernames
+    to_unfollow = set(to_unfollow_candidates) | spam_following_usernames | spam_mutual_usernames
+
+    journal = None
+    if state_dir and not dry_run:
+        journal = ActionJournal(os.path.join(state_dir, JOURNAL_FILE))
+        previous = journal.load()
+        if previous is not None and not previous.finished:
+            print("⚠️  The previous run did not finish; its plan is replaced by this run's")
+        journal.start(to_follow, to_unfollow, followers, following, scanned_at=scanned_at)
+
+    plan = {"follow": to_follow, "unfollow": to_unfollow, "following": following}
+    writes = execute_plan(
+        token, client, plan, dry_run=dry_run, metrics=metrics, write_workers=write_workers, throttle=throttle,
+        journal=journal,
+    )
+    if db is not None:
+        if not dry_run:
+            db.apply_writes(writes, ids=to_follow_candidates, account=account)
+            db.record_actions(writes, account=account)
+        db.mark_scanned(scanned_at, account=account)
+    elif snapshot_path:
+        save_snapshot(snapshot_path, followers, plan["following"], scanned_at=scanned_at)
+    return SyncResult(writes, followers, plan["following"])
+
+
+def resume(token, client, state_dir, metrics=None, write_workers=1, throttle=None, db=None, account=""):
+    """
+    Replay the writes an interrupted run left unfinished, from its journal in state_dir.
+
+    Nothing is fetched or re-checked: the plan recorded by that run is
+    trusted as is. The lists it predicts are saved to db when given,
+    otherwise to the snapshot file.
+
+    Returns:
+        List of WriteResult of the replayed writes, or None if there was no
+        unfinished run to resume
+    """
+    journal = ActionJournal(os.path.join(state_dir, JOURNAL_FILE))
+    state = journal.load()
+    if state is None or state.finished:
+        print("✅ No unfinished run to resume")
+        return None
+
+    plan = dict(state.plan, follow=state.pending("follow"), unfollow=state.pending("unfollow"))
+    print(f"⏯️  Resuming: {len(plan['follow'])} follows and {len(plan['unfollow'])} unfollows left")
+    journal.reopen()
+    writes = execute_plan(
+        token, client, plan, done=state.results, metrics=metrics, write_workers=write_workers, throttle=throttle,
+        journal=journal,
+    )
+    if db is not None:
+        db.save_snapshot(plan["followers"], plan["following"], scanned_at=plan["scanned_at"], account=account)
+        db.record_actions(writes, account=account)
+    else:
+        save_snapshot(
+            os.path.join(state_dir, SNAPSHOT_FILE), plan["followers"], plan["following"],
+            scanned_at=plan["scanned_at"],
+        )
+    return writes
+
+
+def execute_plan(
+    token, client, plan, done=(), dry_run=False, metrics=None, write_workers=1, throttle=None, journal=None
+):
+    """
+    Follow plan["follow"] and unfollow plan["unfollow"], recording each result in journal.
+
+    plan["following"] is replaced by the predicted following list after the
+    writes, counting the successful writes in done (from an earlier, interrupted
+    attempt) as well. The journal is marked finished once every write has run.
+    """
+    metrics = metrics or RunMetrics()
+    throttle = throttle or TokenBucket()
+    on_result = journal.record if journal is not None else None
+    with metrics.phase("follow"):
+        followed = follow_users(
+            token, plan["follow"], dry_run=dry_run, client=client, max_workers=write_workers, throttle=throttle,
+            on_result=on_result,
+        )
+    with metrics.phase("unfollow"):
+        unfollowed = unfollow_users(
+            token, plan["unfollow"], dry_run=dry_run, client=client, max_workers=write_workers, throttle=throttle,
+            on_result=on_result,
+        )
+    if journal is not None:
+        journal.finish()
 
-    follow_users(token, to_follow, dry_run=args.dry_run)
-    unfollow_users(token, to_unfollow, dry_run=args.dry_run)
+    if not dry_run:
+        # Results come back in completion order, so the last follow is the
+        # newest. A wrong guess only costs a full scan on the next run.
+        results = [*done, *followed, *unfollowed]
+        gone = {r.username for r in results if r.action == "unfollow" and r.ok}
+        new = [r.username for r in reversed(results) if r.action == "follow" and r.ok]
+        skip = gone.union(new)
+        plan["following"] = new + [u for u in plan["following"] if u not in skip]
+    return [*followed, *unfollowed]
 
 
 if __name__ == "__main__":
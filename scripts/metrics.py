@@ -0,0 +1,185 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+# Path segments that identify a user are collapsed so metrics stay low-cardinality
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"^(.*)/users/[^/]+$"), r"\1/users/{login}"),
+    (re.compile(r"^(.*)/user/following/[^/]+$"), r"\1/user/following/{login}"),
+]
+
+
+def endpoint_for(url):
+    """Return the templated API path of url, e.g. '/users/{login}'."""
+    path = urlsplit(url).path
+    for pattern, template in _ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            return pattern.sub(template, path)
+    return path
+
+
+def _escape(value):
+    """Escape a label value as the Prometheus text format requires."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    inner = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return f"{{{inner}}}"
+
+
+class RunMetrics:
+    """
+    Instrumentation collected over one run.
+
+    Records how long each phase took and how many requests it sent, request
+    counts by endpoint, method and status, rate-limit retries, cache hit
+    counts and the rate-limit budget spent per resource. Requests are
+    attributed to the phase that is active when they are sent, including
+    those sent from worker threads. labels (e.g. {"account": login}) are
+    added to every exported Prometheus sample.
+    """
+
+    def __init__(self, clock=time.perf_counter, labels=None):
+        self.clock = clock
+        self.labels = dict(labels or {})
+        self.started = clock()
+        self.started_at = time.time()
+        self.phases = {}
+        self.phase_requests = Counter()
+        self.requests = Counter()
+        self.retries = Counter()
+        self.caches = {}
+        self.rate_limits = {}
+        self._phase = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as phase name (repeated phases accumulate)."""
+        previous = self._phase
+        self._phase = name
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - start
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            self._phase = previous
+
+    def record_request(self, method, url, resp, resource="core"):
+        """Count one HTTP exchange and the rate-limit state it reported."""
+        endpoint = endpoint_for(url)
+        with self._lock:
+            self.requests[(endpoint, method, resp.status_code)] += 1
+            if self._phase is not None:
+                self.phase_requests[self._phase] += 1
+
+            headers = resp.headers
+            resource = headers.get("X-RateLimit-Resource", resource)
+            budget = self.rate_limits.setdefault(resource, {"used": 0, "limit": None, "remaining": None})
+            # Conditional requests answered with 304 are free
+            if resp.status_code != 304:
+                budget["used"] += 1
+            if "X-RateLimit-Remaining" in headers:
+                try:
+                    limit = int(headers.get("X-RateLimit-Limit", 0))
+                    remaining = int(headers["X-RateLimit-Remaining"])
+                except ValueError:
+                    # Skipped like RateLimiter.update does; a metrics hook must not fail the request
+                    return
+                budget["limit"] = limit
+                budget["remaining"] = remaining
+
+    def record_retry(self, method, url):
+        with self._lock:
+            self.retries[(endpoint_for(url), method)] += 1
+
+    def record_cache(self, name, hits, misses):
+        """Record the hit/miss totals of a cache (response cache, verdict store)."""
+        self.caches[name] = {"hits": hits, "misses": misses}
+
+    def as_dict(self):
+        """Return every metric as a JSON-serialisable dict."""
+        with self._lock:
+            return {
+                "labels": dict(self.labels),
+                "started_at": self.started_at,
+                "duration_seconds": self.clock() - self.started,
+                "phases": {
+                    name: {"seconds": seconds, "requests": self.phase_requests[name]}
+                    for name, seconds in self.phases.items()
+                },
+                "requests": [
+                    {"endpoint": endpoint, "method": method, "status": status, "count": count}
+                    for (endpoint, method, status), count in sorted(self.requests.items())
+                ],
+                "requests_total": sum(self.requests.values()),
+                "retries": [
+                    {"endpoint": endpoint, "method": method, "count": count}
+                    for (endpoint, method), count in sorted(self.retries.items())
+                ],
+                "caches": dict(self.caches),
+                "rate_limits": {resource: dict(budget) for resource, budget in self.rate_limits.items()},
+            }
+
+    def to_prometheus(self, prefix="follow_sync"):
+        """Render the metrics in the Prometheus text exposition format."""
+        data = self.as_dict()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                labels = {**self.labels, **labels}
+                lines.append(f"{prefix}_{name}{_labels(**labels) if labels else ''} {value}")
+
+        metric("run_duration_seconds", "gauge", "Wall time of the last run.",
+               [({}, round(data["duration_seconds"], 6))])
+        metric("last_run_timestamp_seconds", "gauge", "Unix time the last run started.",
+               [({}, round(data["started_at"], 3))])
+        metric("phase_duration_seconds", "gauge", "Wall time of each phase of the last run.",
+               [({"phase": name}, round(p["seconds"], 6)) for name, p in data["phases"].items()])
+        metric("phase_requests", "gauge", "API requests sent during each phase of the last run.",
+               [({"phase": name}, p["requests"]) for name, p in data["phases"].items()])
+        metric("requests", "gauge", "API requests of the last run by endpoint, method and status.",
+               [({"endpoint": r["endpoint"], "method": r["method"], "status": r["status"]}, r["count"])
+                for r in data["requests"]])
+        metric("retries", "gauge", "Requests retried after a rate-limit response in the last run.",
+               [({"endpoint": r["endpoint"], "method": r["method"]}, r["count"]) for r in data["retries"]])
+        metric("cache_hits", "gauge", "Cache hits of the last run.",
+               [({"cache": name}, c["hits"]) for name, c in data["caches"].items()])
+        metric("cache_misses", "gauge", "Cache misses of the last run.",
+               [({"cache": name}, c["misses"]) for name, c in data["caches"].items()])
+        metric("rate_limit_used", "gauge", "Rate-limit points spent in the last run.",
+               [({"resource": resource}, b["used"]) for resource, b in data["rate_limits"].items()])
+        metric("rate_limit_remaining", "gauge", "Rate-limit points left at the end of the last run.",
+               [({"resource": resource}, b["remaining"]) for resource, b in data["rate_limits"].items()
+                if b["remaining"] is not None])
+        metric("rate_limit_limit", "gauge", "Rate-limit points per window.",
+               [({"resource": resource}, b["limit"]) for resource, b in data["rate_limits"].items()
+                if b["limit"] is not None])
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        _write_atomic(path, json.dumps(self.as_dict(), indent=2))
+
+    def write_prometheus(self, path):
+        """Write a textfile for the node_exporter textfile collector."""
+        _write_atomic(path, self.to_prometheus())
+
+
+def _write_atomic(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
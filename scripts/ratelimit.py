@@ -0,0 +1,219 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+
+# Start spreading requests over the time left in the window once less than
+# this fraction of the budget remains
+PACE_BELOW_FRACTION = 0.2
+
+# Retries of a request rejected by a primary or secondary rate limit
+MAX_RETRIES = 5
+
+# First wait after a secondary limit without Retry-After; doubled on each retry
+SECONDARY_BACKOFF_SECONDS = 60
+
+# Cap on follow/unfollow writes; GitHub's secondary limits allow at most 80
+# content-creating requests per minute
+WRITES_PER_MINUTE = 60
+WRITE_BURST = 10
+
+
+def resource_for(url):
+    """Return the rate-limit resource ('core', 'graphql', 'search') a URL is billed to."""
+    path = urlparse(url).path
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+class RateLimiter:
+    """
+    Central scheduler that every GitHub request goes through.
+
+    It tracks the remaining budget of each rate-limit resource from the
+    X-RateLimit-* response headers, spaces requests out once the budget runs
+    low so it lasts until the window resets, sleeps until the reset instead
+    of failing once it is exhausted, and backs off on secondary-limit 403/429
+    responses (honouring Retry-After). Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        pace_below=PACE_BELOW_FRACTION,
+        max_retries=MAX_RETRIES,
+        secondary_backoff=SECONDARY_BACKOFF_SECONDS,
+        sleep=time.sleep,
+        clock=time.time,
+    ):
+        self.pace_below = pace_below
+        self.max_retries = max_retries
+        self.secondary_backoff = secondary_backoff
+        self.sleep = sleep
+        self.clock = clock
+        self.waited = 0.0
+        self._budgets = {}
+        self._sent = {}
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def budget(self, resource="core"):
+        """Return a copy of the tracked budget for resource, or None if unknown."""
+        with self._lock:
+            budget = self._budgets.get(resource)
+            return dict(budget) if budget else None
+
+    def wait(self, resource="core"):
+        """
+        Block until a request against resource may be sent, then reserve it.
+
+        Returns:
+            Sequence number of the request, to pass to update() with its response
+        """
+        with self._lock:
+            seq = self._sent[resource] = self._sent.get(resource, 0) + 1
+            now = self.clock()
+            start = max(now, self._blocked_until)
+            budget = self._budgets.get(resource)
+            if budget is not None:
+                if budget["reset"] <= start:
+                    # The window has rolled over since we last heard from GitHub
+                    budget["remaining"] = budget["limit"]
+                    budget["reset"] = start + 3600
+                if budget["remaining"] <= 0:
+                    start = budget["reset"] + 1
+                    budget["remaining"] = budget["limit"]
+                    budget["reset"] = start + 3600
+                elif budget["remaining"] < budget["limit"] * self.pace_below:
+                    interval = max(0.0, budget["reset"] - start) / budget["remaining"]
+                    start = max(start, budget["next_at"])
+                    budget["next_at"] = start + interval
+                budget["remaining"] -= 1
+            delay = start - now
+
+        if delay > 0:
+            if delay >= 1:
+                print(f"⏳ Waiting {delay:.0f}s for the {resource} rate limit")
+            self.waited += delay
+            self.sleep(delay)
+        return seq
+
+    def update(self, resp, resource="core", seq=None):
+        """
+        Record the budget reported by a response.
+
+        The header is taken as the truth, less the requests sent after this
+        one that are still in flight; local reservations are only estimates
+        (304s to conditional requests, for one, cost nothing). A response
+        older than one already applied (concurrent responses can arrive out
+        of order) or one without a seq can only lower the budget.
+
+        Args:
+            seq: Sequence number wait() returned for the request
+        """
+        headers = resp.headers
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        if headers.get("X-RateLimit-Resource", resource) != resource:
+            resource, seq = headers["X-RateLimit-Resource"], None
+        try:
+            limit = int(headers.get("X-RateLimit-Limit", 0))
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset = float(headers.get("X-RateLimit-Reset", 0))
+        except ValueError:
+            return
+
+        with self._lock:
+            budget = self._budgets.get(resource)
+            if seq is not None:
+                # Requests reserved after this one have not been answered yet (or an answer would be newer)
+                remaining -= self._sent.get(resource, seq) - seq
+            if budget is None or reset != budget["reset"]:
+                self._budgets[resource] = {
+                    "limit": limit, "remaining": remaining, "reset": reset, "next_at": 0.0, "seq": seq or 0,
+                }
+            elif seq is not None and seq > budget["seq"]:
+                budget.update(limit=limit, remaining=remaining, seq=seq)
+            else:
+                budget["limit"] = limit
+                budget["remaining"] = min(budget["remaining"], remaining)
+
+    @staticmethod
+    def is_rate_limited(resp):
+        """Return True for a 403/429 caused by a primary or secondary rate limit."""
+        if resp.status_code == 429:
+            return True
+        if resp.status_code != 403:
+            return False
+        if resp.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in resp.headers:
+            return True
+        return "rate limit" in resp.text.lower()
+
+    def backoff(self, resp, attempt, resource="core"):
+        """
+        Hold back every request after a rate-limited response.
+
+        Returns:
+            Number of seconds until requests may be sent again
+        """
+        now = self.clock()
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            delay = int(retry_after)
+        elif resp.headers.get("X-RateLimit-Remaining") == "0":
+            delay = max(0.0, float(resp.headers.get("X-RateLimit-Reset", now)) - now) + 1
+        else:
+            delay = self.secondary_backoff * (2 ** attempt)
+
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, now + delay)
+        return delay
+
+
+class TokenBucket:
+    """
+    Token bucket capping how many requests are sent per minute.
+
+    Up to burst requests go out at once, after that one token is refilled
+    every 60 / rate_per_minute seconds. slow_down() halves the rate after a
+    secondary-limit response. A rate_per_minute of 0 or None disables the
+    cap. Safe to share between threads.
+    """
+
+    def __init__(self, rate_per_minute=WRITES_PER_MINUTE, burst=WRITE_BURST, sleep=time.sleep, clock=time.monotonic):
+        self.rate = rate_per_minute / 60 if rate_per_minute else None
+        self.min_rate = self.rate / 8 if self.rate else None
+        self.capacity = burst
+        self.sleep = sleep
+        self.clock = clock
+        self.waited = 0.0
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        if self.rate is None:
+            return
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens may go negative: each caller reserves its slot and waits for it
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += delay
+        if delay > 0:
+            self.sleep(delay)
+
+    def slow_down(self):
+        """Halve the rate (down to 1/8 of the original) and drop any saved-up burst."""
+        if self.rate is None:
+            return
+        with self._lock:
+            if self.rate > self.min_rate:
+                self.rate = max(self.rate / 2, self.min_rate)
+                print(f"🐢 Secondary rate limit hit, slowing writes to {self.rate * 60:.0f}/min")
+            self._tokens = min(self._tokens, 0.0)
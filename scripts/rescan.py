@@ -0,0 +1,78 @@
+import time
+import zlib
+
+from scripts.spam import SPAM_THRESHOLD
+from scripts.verdicts import DAY, YOUNG_ACCOUNT_DAYS, _account_age_days
+
+
+# Every mutual follow is re-checked at least this often, whatever the budget
+ROTATION_DAYS = 14
+
+# Each login falls due up to this fraction of the rotation window early
+# (a fixed per-login offset), so logins checked in the same run do not all
+# fall due in the same later run
+ROTATION_SPREAD = 0.5
+
+# Priority weights: a verdict about to leave the rotation window counts as
+# much as one right at the threshold; young accounts get a smaller nudge
+STALENESS_WEIGHT = 1.0
+CLOSENESS_WEIGHT = 1.0
+YOUNG_ACCOUNT_WEIGHT = 0.5
+
+
+def rescan_priority(verdict, now, rotation=ROTATION_DAYS * DAY, threshold=SPAM_THRESHOLD):
+    """
+    Priority of re-checking a login whose last verdict is verdict (higher goes first).
+
+    Combines the time since the last check (as a fraction of the rotation
+    window), how close the last score was to the threshold, and whether the
+    account is young enough to still be changing quickly.
+    """
+    staleness = min(1.0, (now - verdict["checked_at"]) / rotation)
+    closeness = 1 / (1 + abs(threshold - verdict["score"]))
+    age_days = _account_age_days({"created_at": verdict.get("created_at")}, now)
+    young = age_days is not None and age_days < YOUNG_ACCOUNT_DAYS
+    return STALENESS_WEIGHT * staleness + CLOSENESS_WEIGHT * closeness + YOUNG_ACCOUNT_WEIGHT * young
+
+
+def _rotation_offset(login, rotation):
+    """Fixed, per-login head start on the rotation window (stable across runs, unlike hash())."""
+    return zlib.crc32(login.encode()) / 2**32 * ROTATION_SPREAD * rotation
+
+
+def select_rescans(logins, verdicts, budget, rotation_days=ROTATION_DAYS, clock=time.time):
+    """
+    Pick which of logins to re-check this run.
+
+    Logins whose verdict is still within its TTL are always included, since
+    the spam check reuses those without a fetch. Otherwise logins never
+    checked, or last checked about rotation_days ago (each login falls due
+    at its own point in the last ROTATION_SPREAD of the window), are due and
+    take the budget first, stalest first; due logins past the budget wait
+    for the next run. Whatever budget they leave goes to the remaining
+    logins with the highest rescan_priority. Without a verdict store every
+    login is due and checked.
+
+    Returns:
+        (selected, due): list of logins to check, number of logins that were due
+    """
+    if verdicts is None:
+        return list(logins), len(logins)
+    now = clock()
+    rotation = rotation_days * DAY
+    free, due, ranked = [], [], []
+    for login in logins:
+        verdict = verdicts.record(login)
+        if verdict is None:
+            due.append((float("-inf"), login))
+        elif now < verdict["checked_at"] + verdict["ttl"]:
+            free.append(login)
+        elif now - verdict["checked_at"] >= rotation - _rotation_offset(login, rotation):
+            due.append((verdict["checked_at"], login))
+        else:
+            ranked.append((rescan_priority(verdict, now, rotation, threshold=verdicts.threshold), login))
+
+    due.sort()
+    ranked.sort(reverse=True)
+    spare = max(0, budget - len(due))
+    return free + [login for _, login in due[:budget]] + [login for _, login in ranked[:spare]], len(due)
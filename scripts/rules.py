@@ -0,0 +1,210 @@
+"""
+Spam rules loaded from a TOML or JSON file and compiled into an evaluation plan.
+
+A rules file may set any of these keys; missing ones keep the built-in
+values from scripts/spam.py:
+
+    threshold = 3
+    new_account_days = 30      # "new_account" applies below this age
+    min_followers = 2          # "very_few_followers" applies below this count
+
+    [weights]                  # a weight of 0 disables the rule
+    no_name = 1
+    no_bio = 1
+    no_repos = 2
+    very_few_followers = 1
+    new_account = 2
+    suspicious_profile = 2
+
+    [[patterns]]               # replaces the built-in suspicious patterns
+    regex = '\\b(crypto|nft)\\b'
+    ignore_case = true
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+import tomllib
+from datetime import datetime, timezone
+from typing import Callable, NamedTuple
+
+from scripts.spam import _SUSPICIOUS_PATTERNS, SCORE_WEIGHTS, SPAM_THRESHOLD
+
+
+DEFAULT_NEW_ACCOUNT_DAYS = 30
+DEFAULT_MIN_FOLLOWERS = 2
+
+# Evaluation and reason order, matching calculate_spam_score
+RULE_ORDER = ["no_name", "no_bio", "no_repos", "very_few_followers", "new_account", "suspicious_profile"]
+
+
+def default_config():
+    """Return the built-in rules as a config dict."""
+    return {
+        "threshold": SPAM_THRESHOLD,
+        "new_account_days": DEFAULT_NEW_ACCOUNT_DAYS,
+        "min_followers": DEFAULT_MIN_FOLLOWERS,
+        "weights": dict(SCORE_WEIGHTS),
+        "patterns": [
+            {"regex": p.pattern, "ignore_case": bool(p.flags & re.IGNORECASE)} for p in _SUSPICIOUS_PATTERNS
+        ],
+    }
+
+
+def load_rules(path, profile=False):
+    """
+    Load a rules file (.toml, or JSON otherwise) and compile it.
+
+    Raises:
+        ValueError: If the file has unknown keys or rule names, or a bad pattern
+    """
+    with open(path, "rb") as f:
+        data = tomllib.load(f) if path.endswith(".toml") else json.load(f)
+    return compile_rules(data, profile=profile)
+
+
+class Rule(NamedTuple):
+    name: str
+    weight: int
+    check: Callable  # (user, now) -> reason string, or None if the rule does not apply
+
+
+class RulePlan:
+    """
+    Compiled spam rules: every rule with a non-zero weight, in RULE_ORDER.
+
+    score() evaluates every rule and matches calculate_spam_score for the
+    same config. Every rule is always evaluated: the bot keeps the full
+    score, since verdict TTLs and re-check priorities depend on how close
+    it is to the threshold. With profile=True every evaluation is counted
+    and timed per rule.
+    """
+
+    def __init__(self, rules, threshold, config, has_suspicious_content, profile=False):
+        self.rules = list(rules)
+        self.threshold = threshold
+        self.config = config
+        self.weights = {rule.name: rule.weight for rule in self.rules}
+        # Rule parameters and the pattern scanner, for score_bounds
+        self.new_account_days = config["new_account_days"]
+        self.min_followers = config["min_followers"]
+        self.has_suspicious_content = has_suspicious_content
+        # None for the built-in rules, so verdicts stored without a rules file stay valid
+        self.fingerprint = None
+        if config != default_config():
+            self.fingerprint = hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:12]
+        self.profile = profile
+        self.stats = {rule.name: [0, 0, 0.0] for rule in self.rules}  # evaluations, hits, seconds
+        self._lock = threading.Lock()
+
+    def _run(self, rule, user, now):
+        if not self.profile:
+            return rule.check(user, now)
+        start = time.perf_counter()
+        reason = rule.check(user, now)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            stats = self.stats[rule.name]
+            stats[0] += 1
+            stats[1] += reason is not None
+            stats[2] += elapsed
+        return reason
+
+    def explain(self, user, now=None):
+        """Return (score, [(rule name, reason), ...])."""
+        if now is None:
+            now = datetime.now(timezone.utc)
+        score = 0
+        hits = []
+        for rule in self.rules:
+            reason = self._run(rule, user, now)
+            if reason is not None:
+                score += rule.weight
+                hits.append((rule.name, reason))
+        return score, hits
+
+    def score(self, user, now=None):
+        """Return (score, reasons), like calculate_spam_score."""
+        score, hits = self.explain(user, now)
+        return score, [reason for _, reason in hits]
+
+    def report(self):
+        """Return per-rule evaluation counts and timings, one line per rule."""
+        lines = ["📏 Spam rules:"]
+        for rule in self.rules:
+            evaluations, hits, seconds = self.stats[rule.name]
+            mean = seconds / evaluations * 1e6 if evaluations else 0.0
+            lines.append(
+                f"   {rule.name:<20} weight {rule.weight}: {evaluations} evaluated, {hits} hit, {mean:.2f}µs each"
+            )
+        return "\n".join(lines)
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def compile_rules(data=None, profile=False):
+    """
+    Compile a rules config dict (see the module docstring) into a RulePlan.
+
+    Raises:
+        ValueError: If data has unknown keys or rule names, a weight that is not a
+            non-negative integer, a threshold that is not an integer, or a bad pattern
+    """
+    config = default_config()
+    unknown = set(data or {}) - set(config)
+    if unknown:
+        raise ValueError(f"Unknown keys in spam rules: {', '.join(sorted(unknown))}")
+    for key, value in (data or {}).items():
+        if key == "weights":
+            unknown = set(value) - set(RULE_ORDER)
+            if unknown:
+                raise ValueError(f"Unknown spam rules: {', '.join(sorted(unknown))}")
+            config["weights"].update(value)
+        else:
+            config[key] = value
+
+    # score_bounds assumes every rule can only add to the score
+    for name, weight in config["weights"].items():
+        if not _is_int(weight) or weight < 0:
+            raise ValueError(f"Weight of spam rule {name} must be a non-negative integer, not {weight!r}")
+    if not _is_int(config["threshold"]):
+        raise ValueError(f"Spam threshold must be an integer, not {config['threshold']!r}")
+
+    try:
+        patterns = [
+            re.compile(p["regex"], re.IGNORECASE if p.get("ignore_case") else 0) for p in config["patterns"]
+        ]
+    except (re.error, KeyError, TypeError) as e:
+        raise ValueError(f"Bad suspicious pattern in spam rules: {e}") from e
+    new_account_days = config["new_account_days"]
+    min_followers = config["min_followers"]
+
+    def suspicious(text):
+        return bool(text) and any(pattern.search(text) for pattern in patterns)
+
+    def new_account(user, now):
+        created_at = user.get("created_at")
+        if not created_at:
+            return None
+        days_old = (now - datetime.fromisoformat(created_at.replace("Z", "+00:00"))).days
+        return f"account only {days_old} days old" if days_old < new_account_days else None
+
+    def suspicious_profile(user, now):
+        fields = [f for f in ("name", "bio") if suspicious(user.get(f) or "")]
+        return f"suspicious content in {' and '.join(fields)}" if fields else None
+
+    checks = {
+        "no_name": lambda user, now: None if user.get("name") else "no display name",
+        "no_bio": lambda user, now: None if user.get("bio") else "no bio",
+        "no_repos": lambda user, now: "no public repositories" if user.get("public_repos", 0) == 0 else None,
+        "very_few_followers": lambda user, now: (
+            "very few followers" if user.get("followers", 0) < min_followers else None
+        ),
+        "new_account": new_account,
+        "suspicious_profile": suspicious_profile,
+    }
+    rules = [Rule(name, config["weights"][name], checks[name]) for name in RULE_ORDER if config["weights"][name]]
+    return RulePlan(rules, config["threshold"], config, suspicious, profile=profile)
@@ -0,0 +1,222 @@
+"""
+Score archived profiles offline, e.g. to backtest rule changes.
+
+Reads a JSONL file (optionally gzipped) of user detail dicts, as returned by
+/users/{username}, and writes one verdict per line:
+
+    {"login": "...", "score": 4, "spam": true, "reasons": ["no bio", ...]}
+
+Lines that are not a JSON object are written as {"line": N, "error": "..."}.
+Chunks are scored column by column (scripts/columnar.py) when NumPy is
+installed, with identical results.
+
+Usage:
+    python -m scripts.main score profiles.jsonl verdicts.jsonl [--rules FILE] [--workers N] [--now ISO-8601]
+"""
+import argparse
+import gzip
+import itertools
+import json
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+from scripts import columnar
+from scripts.rules import RULE_ORDER, compile_rules, load_rules
+
+
+CHUNK_SIZE = 2000
+
+# Chunks queued per worker; bounds memory to about workers * this * CHUNK_SIZE lines
+CHUNKS_PER_WORKER = 2
+
+# Compiled once per worker process by _init_worker
+_plan = None
+
+
+class ChunkResult(NamedTuple):
+    """Scored chunk: the output text and the counts for the summary."""
+    text: str
+    scored: int
+    flagged: int
+    errors: int
+    hits: Counter          # rule name -> profiles it applied to
+    flagged_hits: Counter  # rule name -> flagged profiles it applied to
+
+
+class ScoreSummary(NamedTuple):
+    scored: int
+    flagged: int
+    errors: int
+    hits: Counter
+    flagged_hits: Counter
+
+    def report(self):
+        """Return the flag rate overall and per rule, one line each."""
+        rate = self.flagged / self.scored * 100 if self.scored else 0.0
+        lines = [f"📊 Scored {self.scored} profiles: {self.flagged} flagged ({rate:.1f}%), {self.errors} unreadable"]
+        for name in RULE_ORDER:
+            hits = self.hits.get(name, 0)
+            if not hits:
+                continue
+            share = hits / self.scored * 100
+            flagged = self.flagged_hits.get(name, 0) / hits * 100
+            lines.append(f"   {name:<20} {hits} profiles ({share:.1f}%), {flagged:.1f}% of them flagged")
+        return "\n".join(lines)
+
+
+def _init_worker(config):
+    global _plan
+    _plan = compile_rules(config)
+
+
+def _score_columnar(users, now):
+    """Score parsed profiles column by column; None if the chunk needs the per-dict path."""
+    if not columnar.available() or len(users) < columnar.MIN_BATCH:
+        return None
+    try:
+        batch = columnar.score_batch(users, now, _plan)
+    except (TypeError, ValueError, AttributeError):
+        return None
+    hits = Counter(dict(zip(batch.names, batch.hits.sum(axis=0).tolist())))
+    flagged_hits = Counter(dict(zip(batch.names, batch.hits[batch.spam].sum(axis=0).tolist())))
+    return list(zip(batch.scores.tolist(), batch.reasons)), hits, flagged_hits
+
+
+def _score_chunk(lines, now):
+    """Score (line number, raw JSONL line) pairs with the worker's plan."""
+    out = []
+    errors = 0
+    parsed = []
+    for number, line in lines:
+        try:
+            user = json.loads(line)
+            if not isinstance(user, dict):
+                raise ValueError("not a JSON object")
+        except ValueError as e:
+            errors += 1
+            out.append((number, json.dumps({"line": number, "error": str(e)})))
+            continue
+        parsed.append((number, user))
+
+    users = [user for _, user in parsed]
+    results = _score_columnar(users, now)
+    if results is not None:
+        results, hits, flagged_hits = results
+    else:
+        results, hits, flagged_hits = [], Counter(), Counter()
+        for number, user in parsed:
+            try:
+                score, explained = _plan.explain(user, now)
+            except (ValueError, TypeError, AttributeError) as e:
+                results.append(e)
+                continue
+            names = [name for name, _ in explained]
+            hits.update(names)
+            if score >= _plan.threshold:
+                flagged_hits.update(names)
+            results.append((score, [reason for _, reason in explained]))
+
+    scored = flagged = 0
+    for (number, user), result in zip(parsed, results):
+        if isinstance(result, Exception):
+            errors += 1
+            out.append((number, json.dumps({"line": number, "error": str(result)})))
+            continue
+        score, reasons = result
+        spam = score >= _plan.threshold
+        scored += 1
+        flagged += spam
+        out.append((number, json.dumps({"login": user.get("login"), "score": score, "spam": spam, "reasons": reasons})))
+    out.sort(key=lambda item: item[0])
+    text = "".join(line + "\n" for _, line in out)
+    return ChunkResult(text, scored, flagged, errors, hits, flagged_hits)
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _chunks(f, chunk_size):
+    """Yield lists of up to chunk_size (line number, line) pairs for the non-blank lines of f."""
+    numbered = ((n, line) for n, line in enumerate(f, 1) if line.strip())
+    while True:
+        chunk = list(itertools.islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_file(input_path, output_path, rules=None, workers=1, chunk_size=CHUNK_SIZE, now=None):
+    """
+    Score every profile in input_path and write the verdicts to output_path in input order.
+
+    Args:
+        rules: RulePlan to score with (the built-in rules if omitted)
+        workers: Number of processes scoring chunks; 1 scores in this process
+        now: Reference time for account ages (defaults to the current time)
+
+    Returns:
+        ScoreSummary
+    """
+    config = rules.config if rules is not None else None
+    now = now or datetime.now(timezone.utc)
+    totals = [0, 0, 0, Counter(), Counter()]
+
+    def write(result):
+        out.write(result.text)
+        for i, value in enumerate(result[1:]):
+            totals[i] += value
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with _open(input_path, "r") as f, _open(output_path, "w") as out:
+        chunks = _chunks(f, chunk_size)
+        if workers <= 1:
+            _init_worker(config)
+            for lines in chunks:
+                write(_score_chunk(lines, now))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,)) as executor:
+                # Submit only a few chunks ahead of the writer, so neither the input
+                # nor the results pile up in memory
+                pending = deque()
+                for lines in chunks:
+                    pending.append(executor.submit(_score_chunk, lines, now))
+                    if len(pending) >= workers * CHUNKS_PER_WORKER:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+    return ScoreSummary(*totals)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scripts.main score", description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="JSONL file of user detail dicts (.gz is decompressed)")
+    parser.add_argument("output", help="JSONL file for the verdicts (.gz is compressed)")
+    parser.add_argument("--rules", help="TOML or JSON spam rules file (see scripts/rules.py)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of scoring processes")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Profiles per chunk sent to a process")
+    parser.add_argument(
+        "--now", type=datetime.fromisoformat,
+        help="Reference time for account ages, e.g. when the profiles were archived (default: now)",
+    )
+    args = parser.parse_args(argv)
+
+    rules = load_rules(args.rules) if args.rules else None
+    now = args.now
+    if now is not None and now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    print(f"🧮 Scoring {args.input} with {max(1, args.workers)} worker(s)...")
+    summary = score_file(
+        args.input, args.output, rules=rules, workers=args.workers, chunk_size=max(1, args.chunk_size), now=now
+    )
+    print(summary.report())
+    print(f"💾 Verdicts written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import json
+import os
+import time
+
+from scripts.client import client_for
+from scripts.utils import iter_paginate
+
+
+SNAPSHOT_FILE = "snapshot.json"
+
+# Force a full scan when the snapshot is older than this, catching the rare
+# case where unfollows and new follows cancel out in the counts
+FULL_SCAN_MAX_AGE = 7 * 24 * 3600
+
+
+def load_snapshot(path):
+    """Return the saved snapshot, or None if there is no usable one."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or not {"followers", "following", "scanned_at"} <= snapshot.keys():
+        return None
+    return snapshot
+
+
+def save_snapshot(path, followers, following, scanned_at=None):
+    """
+    Save both lists newest-first, as GitHub returns them.
+
+    Args:
+        scanned_at: Time of the last full scan (defaults to now)
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "followers": list(followers),
+            "following": list(following),
+            "saved_at": time.time(),
+            "scanned_at": scanned_at if scanned_at is not None else time.time(),
+        }, f)
+    os.replace(tmp_path, path)
+
+
+def get_user_counts(token, client=None):
+    """Return (followers, following) counts of the authenticated user from GET /user."""
+    with client_for(token, client) as client:
+        resp = client.get(client.url("/user"))
+    resp.raise_for_status()
+    user = resp.json()
+    return user["followers"], user["following"]
+
+
+def fetch_new_logins(token, kind, known, expected_count, client=None):
+    """
+    Walk /user/{kind} newest-first and merge the new logins into the known list.
+
+    The walk stops at the first login already in known. The merge is only
+    trusted if that login is the head of known and the merged list has
+    exactly expected_count entries; anything else means logins were removed
+    somewhere in the list and a full scan is needed.
+
+    Returns:
+        Merged list of logins (newest-first), or None if a full scan is needed
+    """
+    known_set = set(known)
+    head = known[0] if known else None
+    new = []
+    with client_for(token, client) as client:
+        for item in iter_paginate(client.url(f"/user/{kind}"), token, client=client):
+            login = item["login"]
+            if login in known_set:
+                if login != head:
+                    return None
+                merged = new + list(known)
+                return merged if len(merged) == expected_count else None
+            new.append(login)
+    return new if not known and len(new) == expected_count else None
+
+
+def sync_lists(token, client, path, full_fetch, full_scan_max_age=FULL_SCAN_MAX_AGE, load=load_snapshot):
+    """
+    Return the follower and following login lists, incrementally when possible.
+
+    The cheap GET /user counts give the expected length of each list. Each
+    list is then walked newest-first only until the head of the snapshot is
+    reached, so an unchanged list costs a single page. A list whose merged
+    length does not match its count falls back to full_fetch(kind), a full
+    scan returning logins newest-first. load(path) reads the snapshot.
+
+    Returns:
+        (followers, following, scanned_at): scanned_at is the time of the
+        last full scan of both lists, or None if one happened in this run
+    """
+    snapshot = load(path)
+    if snapshot is None or time.time() - snapshot["scanned_at"] > full_scan_max_age:
+        print("🔄 No recent snapshot, running a full scan...")
+        return full_fetch("followers"), full_fetch("following"), None
+
+    counts = dict(zip(("followers", "following"), get_user_counts(token, client=client)))
+    lists = {}
+    scanned_at = snapshot["scanned_at"]
+    for kind in ("followers", "following"):
+        known = snapshot[kind]
+        merged = fetch_new_logins(token, kind, known, counts[kind], client=client)
+        if merged is None:
+            print(f"🔄 {kind.capitalize()} changed beyond the snapshot head, running a full scan...")
+            merged = full_fetch(kind)
+        else:
+            print(f"🔄 {kind.capitalize()}: {len(merged) - len(known)} new since last run")
+        lists[kind] = merged
+    return lists["followers"], lists["following"], scanned_at
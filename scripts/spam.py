@@ -1,5 +1,6 @@
 import re
 from datetime import datetime, timezone
+from typing import NamedTuple
 
 
 # Spam score thresholds and weights
@@ -34,6 +35,12 @@ _SUSPICIOUS_PATTERNS = [
 ]
 
 
+class SpamResult(NamedTuple):
+    """Compact per-user result of score_users; compares equal to (score, reasons)."""
+    score: int
+    reasons: list[str]
+
+
 def _has_suspicious_content(text: str) -> bool:
     """Return True if the text matches any suspicious pattern."""
     if not text:
@@ -41,16 +48,21 @@ def _has_suspicious_content(text: str) -> bool:
     return any(pattern.search(text) for pattern in _SUSPICIOUS_PATTERNS)
 
 
-def calculate_spam_score(user: dict) -> tuple[int, list[str]]:
+def calculate_spam_score(user: dict, now: datetime | None = None, rules=None) -> tuple[int, list[str]]:
     """
     Calculate a spam score for a GitHub user.
 
     Args:
         user: GitHub user detail dict (from /users/{username} endpoint)
+        now: Reference time for the account age (defaults to the current time)
+        rules: RulePlan from scripts.rules to score with instead of the built-in rules
 
     Returns:
         (score, reasons): total score and list of reason strings
     """
+    if rules is not None:
+        return rules.score(user, now)
+
     score = 0
     reasons = []
 
@@ -76,7 +88,8 @@ def calculate_spam_score(user: dict) -> tuple[int, list[str]]:
     created_at = user.get("created_at")
     if created_at:
         created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
         days_old = (now - created).days
         if days_old < 30:
             score += SCORE_WEIGHTS["new_account"]
@@ -95,16 +108,159 @@ def calculate_spam_score(user: dict) -> tuple[int, list[str]]:
     return score, reasons
 
 
-def is_spam(user: dict, threshold: int = SPAM_THRESHOLD) -> tuple[bool, list[str]]:
+# Known (id, created_at) pairs. User ids are assigned in increasing order,
+# so an account with a smaller id than an anchor was created no later than
+# it, and one with a larger id no earlier
+_ID_ANCHORS = [
+    (1, datetime(2007, 10, 20, 5, 24, 19, tzinfo=timezone.utc)),         # mojombo
+    (583231, datetime(2011, 1, 25, 18, 44, 36, tzinfo=timezone.utc)),    # octocat
+    (1024025, datetime(2011, 9, 3, 15, 26, 22, tzinfo=timezone.utc)),    # torvalds
+]
+
+
+def created_range(user_id: int | None) -> tuple[datetime | None, datetime | None]:
+    """
+    Bound an account's creation time from its numeric id alone.
+
+    Returns:
+        (earliest, latest): either may be None when no anchor bounds that side
+    """
+    earliest = latest = None
+    if user_id is None:
+        return earliest, latest
+    for anchor_id, created in _ID_ANCHORS:
+        if anchor_id <= user_id:
+            earliest = created
+        if anchor_id >= user_id and latest is None:
+            latest = created
+    return earliest, latest
+
+
+class ScoreBounds(NamedTuple):
+    """Range calculate_spam_score can return for a user whose profile is only partly known."""
+    low: int
+    high: int
+    reasons: list[str]
+
+
+def score_bounds(
+    user: dict, now: datetime | None = None, estimate_created=created_range, rules=None
+) -> ScoreBounds:
+    """
+    Bound calculate_spam_score for a partial user dict, such as a follower list item.
+
+    Rules whose fields are present score exactly as in calculate_spam_score.
+    Rules whose fields are missing count 0 towards low and their full weight
+    towards high, except new_account, which estimate_created(id) can settle
+    from the id alone. Nothing else in a list item (login, type) feeds a rule,
+    so nothing else narrows the range. With rules (a RulePlan), its weights
+    and parameters are used instead of the built-in ones.
+
+    Returns:
+        ScoreBounds(low, high, reasons): reasons are those certain to apply
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    weights = rules.weights if rules is not None else SCORE_WEIGHTS
+    new_account_days = rules.new_account_days if rules is not None else 30
+    min_followers = rules.min_followers if rules is not None else 2
+    suspicious_content = rules.has_suspicious_content if rules is not None else _has_suspicious_content
+    low = high = 0
+    reasons = []
+
+    def rule(name, applies, reason):
+        nonlocal low, high
+        weight = weights.get(name, 0)
+        if not weight:
+            return
+        if applies is None:
+            high += weight
+        elif applies:
+            low += weight
+            high += weight
+            reasons.append(reason)
+
+    def known(field, check):
+        return check(user[field]) if field in user else None
+
+    rule("no_name", known("name", lambda v: not v), "no display name")
+    rule("no_bio", known("bio", lambda v: not v), "no bio")
+    rule("no_repos", known("public_repos", lambda v: v == 0), "no public repositories")
+    rule("very_few_followers", known("followers", lambda v: v < min_followers), "very few followers")
+
+    if "created_at" in user:
+        created_at = user["created_at"]
+        if created_at:
+            days_old = (now - datetime.fromisoformat(created_at.replace("Z", "+00:00"))).days
+            rule("new_account", days_old < new_account_days, f"account only {days_old} days old")
+        else:
+            rule("new_account", False, "")
+    else:
+        earliest, latest = estimate_created(user.get("id"))
+        if latest is not None and (now - latest).days >= new_account_days:
+            rule("new_account", False, "")
+        elif earliest is not None and (now - earliest).days < new_account_days:
+            rule("new_account", True, f"account at most {(now - earliest).days} days old (estimated from id)")
+        else:
+            rule("new_account", None, "")
+
+    suspicious = [f for f in ("name", "bio") if f in user and suspicious_content(user[f] or "")]
+    if suspicious or ("name" in user and "bio" in user):
+        rule("suspicious_profile", bool(suspicious), f"suspicious content in {' and '.join(suspicious)}")
+    else:
+        rule("suspicious_profile", None, "")
+
+    return ScoreBounds(low, high, reasons)
+
+
+def can_settle_from_id(threshold: int = SPAM_THRESHOLD, rules=None) -> bool:
+    """
+    Return True if score_bounds can ever settle a verdict from a list item (login and id) alone.
+
+    Only new_account can be known from an id, so the low bound of such an
+    item is at most its weight and the high bound at least the sum of the
+    other weights. If neither can cross threshold, pre-screening is wasted work.
+    """
+    weights = rules.weights if rules is not None else SCORE_WEIGHTS
+    new_account = weights.get("new_account", 0)
+    return new_account >= threshold or sum(weights.values()) - new_account < threshold
+
+
+def score_users(users, now: datetime | None = None, rules=None) -> list[SpamResult]:
+    """
+    Score many GitHub users at once.
+
+    All users are scored against a single clock reading, so the results are
+    consistent across the batch and identical to calling calculate_spam_score
+    on each user at that moment.
+
+    Args:
+        users: Iterable of GitHub user detail dicts
+        now: Reference time for account ages (defaults to the current time)
+        rules: RulePlan to score with instead of the built-in rules
+
+    Returns:
+        List of SpamResult(score, reasons), one per user in input order
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return [SpamResult(*calculate_spam_score(user, now, rules)) for user in users]
+
+
+def is_spam(user: dict, threshold: int = SPAM_THRESHOLD, rules=None) -> tuple[bool, list[str]]:
     """
     Determine if a GitHub user is likely a spam account.
 
     Args:
         user: GitHub user detail dict
         threshold: Score threshold above which a user is considered spam
+        rules: RulePlan to score with instead (its own threshold applies)
 
     Returns:
         (is_spam, reasons): bool and list of reason strings
     """
+    if rules is not None:
+        score, reasons = rules.score(user)
+        return score >= rules.threshold, reasons
     score, reasons = calculate_spam_score(user)
     return score >= threshold, reasons
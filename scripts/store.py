@@ -0,0 +1,357 @@
+import json
+import sqlite3
+import threading
+import time
+from itertools import islice
+
+
+STATE_DB = "state.db"
+
+# Rows written per transaction by the bulk upserts
+BATCH_SIZE = 10_000
+
+# Logins looked up per query (SQLite caps the number of bound parameters)
+LOOKUP_SIZE = 500
+
+# Stored profiles fetched less than this many seconds ago are scored again
+# without a fetch (no older than the shortest verdict TTL, so no staler than
+# a verdict the bot would reuse anyway)
+PROFILE_MAX_AGE = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS relations (
+    account TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    login TEXT NOT NULL,
+    user_id INTEGER,
+    position INTEGER NOT NULL,
+    generation INTEGER NOT NULL,
+    PRIMARY KEY (account, kind, login)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS relations_by_id ON relations (account, kind, user_id);
+CREATE INDEX IF NOT EXISTS relations_by_position ON relations (account, kind, position);
+CREATE TABLE IF NOT EXISTS profiles (
+    login TEXT PRIMARY KEY,
+    user_id INTEGER,
+    name TEXT,
+    bio TEXT,
+    public_repos INTEGER,
+    followers INTEGER,
+    created_at TEXT,
+    updated_at TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS verdicts (
+    login TEXT PRIMARY KEY,
+    score INTEGER NOT NULL,
+    reasons TEXT NOT NULL,
+    updated_at TEXT,
+    created_at TEXT,
+    checked_at REAL NOT NULL,
+    ttl REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS actions (
+    id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL,
+    at REAL NOT NULL,
+    action TEXT NOT NULL,
+    login TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    status INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS actions_by_login ON actions (login);
+"""
+
+_PROFILE_FIELDS = ("name", "bio", "public_repos", "followers", "created_at", "updated_at")
+
+
+def _batches(rows, size=BATCH_SIZE):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+class StateStore:
+    """
+    SQLite database (WAL mode) for the state kept between runs.
+
+    Holds the follower/following lists of each account, the scored fields
+    of fetched profiles, spam verdicts and the history of follows and
+    unfollows. Lists are streamed in with batched upserts and compared with
+    indexed joins, so no Python sets of the full lists are built: only the
+    diff (and, for load_snapshot, the logins) come back as dicts and lists.
+    One connection is shared under a lock, so a store can be used from
+    several threads (e.g. one per account).
+    """
+
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, sql, batches):
+        """
+        Run sql for every row, one transaction per batch.
+
+        Batches are pulled outside the lock: they may come from a paginated
+        API listing, and other threads must not wait on the network.
+        """
+        for batch in batches:
+            with self._lock:
+                self._db.execute("BEGIN")
+                try:
+                    self._db.executemany(sql, batch)
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+                self._db.execute("COMMIT")
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, json.dumps(value)),
+            )
+
+    # Follower / following lists
+
+    def replace_list(self, kind, items, account=""):
+        """
+        Replace a list with items (user dicts or logins), newest-first, streaming them in batches.
+
+        Rows already stored keep their user id when an item has none. The list
+        is marked incomplete until the last batch is in, so a run that dies
+        halfway is never read back as a snapshot.
+
+        Returns:
+            Number of users in the list
+        """
+        generation = self.get_meta(f"generation:{account}:{kind}", 0) + 1
+        self.set_meta(f"complete:{account}:{kind}", False)
+
+        def rows():
+            for position, item in enumerate(items):
+                login, user_id = (item, None) if isinstance(item, str) else (item["login"], item.get("id"))
+                yield account, kind, login, user_id, position, generation
+
+        # A login listed twice (the list shifted between page fetches) keeps its newest position
+        self._write(
+            "INSERT INTO relations (account, kind, login, user_id, position, generation) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (account, kind, login) DO UPDATE SET "
+            "user_id = COALESCE(excluded.user_id, user_id), "
+            "position = CASE WHEN generation = excluded.generation THEN position ELSE excluded.position END, "
+            "generation = excluded.generation",
+            _batches(rows()),
+        )
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM relations WHERE account = ? AND kind = ? AND generation != ?", (account, kind, generation)
+            )
+        self.set_meta(f"generation:{account}:{kind}", generation)
+        self.set_meta(f"complete:{account}:{kind}", True)
+        return self.count(kind, account)
+
+    def logins(self, kind, account=""):
+        """Return the logins of a list, newest-first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT login FROM relations WHERE account = ? AND kind = ? ORDER BY position", (account, kind)
+            )
+            return [login for (login,) in rows]
+
+    def count(self, kind, account=""):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM relations WHERE account = ? AND kind = ?", (account, kind)
+            ).fetchone()[0]
+
+    def diff(self, account=""):
+        """
+        Split the stored lists like merge_diff(followers, following, with_ids=True).
+
+        Users are matched by id when every row of both lists has one, by login otherwise.
+
+        Returns:
+            (only_followers, only_following, both): {login: id} dicts
+        """
+        with self._lock:
+            missing_ids = self._db.execute(
+                "SELECT EXISTS (SELECT 1 FROM relations WHERE account = ? AND user_id IS NULL)", (account,)
+            ).fetchone()[0]
+            key = "login" if missing_ids else "user_id"
+
+            def select(left, right, present):
+                return dict(self._db.execute(
+                    f"SELECT l.login, l.user_id FROM relations l WHERE l.account = ? AND l.kind = ? AND "
+                    f"{'' if present else 'NOT '}EXISTS (SELECT 1 FROM relations r "
+                    f"WHERE r.account = l.account AND r.kind = ? AND r.{key} = l.{key})",
+                    (account, left, right),
+                ))
+
+            return (
+                select("followers", "following", False),
+                select("following", "followers", False),
+                select("followers", "following", True),
+            )
+
+    def apply_writes(self, results, ids=None, account=""):
+        """
+        Update the stored following list with the successful writes (WriteResults).
+
+        Args:
+            ids: {login: id} of the followed users, where known
+        """
+        ids = ids or {}
+        results = [r for r in results if r.ok]
+        with self._lock:
+            head = self._db.execute(
+                "SELECT COALESCE(MIN(position), 0) FROM relations WHERE account = ? AND kind = 'following'", (account,)
+            ).fetchone()[0]
+            generation = self.get_meta(f"generation:{account}:following", 0)
+        # Results come back in completion order, so the last follow is the newest
+        follows = [r.username for r in results if r.action == "follow"]
+        self._write(
+            "INSERT INTO relations (account, kind, login, user_id, position, generation) "
+            "VALUES (?, 'following', ?, ?, ?, ?) ON CONFLICT (account, kind, login) DO UPDATE SET "
+            "position = excluded.position",
+            _batches((account, login, ids.get(login), head - i, generation) for i, login in enumerate(follows, 1)),
+        )
+        self._write(
+            "DELETE FROM relations WHERE account = ? AND kind = 'following' AND login = ?",
+            _batches((account, r.username) for r in results if r.action == "unfollow"),
+        )
+
+    def load_snapshot(self, account=""):
+        """Return the stored lists in the shape of snapshot.load_snapshot, or None if incomplete."""
+        if not all(self.get_meta(f"complete:{account}:{kind}") for kind in ("followers", "following")):
+            return None
+        scanned_at = self.get_meta(f"scanned_at:{account}")
+        if scanned_at is None:
+            return None
+        return {
+            "followers": self.logins("followers", account),
+            "following": self.logins("following", account),
+            "scanned_at": scanned_at,
+        }
+
+    def save_snapshot(self, followers, following, scanned_at=None, account=""):
+        """Replace both lists, like snapshot.save_snapshot."""
+        self.replace_list("followers", followers, account)
+        self.replace_list("following", following, account)
+        self.mark_scanned(scanned_at, account)
+
+    def mark_scanned(self, scanned_at=None, account=""):
+        """Record the time of the last full scan (defaults to now)."""
+        self.set_meta(f"scanned_at:{account}", scanned_at if scanned_at is not None else self.clock())
+
+    # Profiles and verdicts
+
+    def put_profiles(self, users):
+        """Upsert the scored fields of fetched profiles."""
+        now = self.clock()
+        self._write(
+            "INSERT OR REPLACE INTO profiles (login, user_id, name, bio, public_repos, followers, created_at, "
+            "updated_at, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _batches(
+                (user["login"], user.get("id"), *(user.get(field) for field in _PROFILE_FIELDS), now)
+                for user in users
+            ),
+        )
+
+    def get_profiles(self, logins, max_age=PROFILE_MAX_AGE):
+        """Return {login: user dict} of the stored profiles among logins fetched less than max_age seconds ago."""
+        fetched_after = self.clock() - max_age
+        profiles = {}
+        for batch in _batches(logins, LOOKUP_SIZE):
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT login, user_id, {', '.join(_PROFILE_FIELDS)} FROM profiles "
+                    f"WHERE fetched_at > ? AND login IN ({', '.join('?' * len(batch))})",
+                    (fetched_after, *batch),
+                ).fetchall()
+            for row in rows:
+                # A NULL column was a missing field, which the rules treat differently from e.g. followers=None
+                fields = {field: value for field, value in zip(_PROFILE_FIELDS, row[2:]) if value is not None}
+                profiles[row[0]] = {"login": row[0], "id": row[1], **fields}
+        return profiles
+
+    def load_verdicts(self, fingerprint):
+        """Return {login: verdict} stored under fingerprint ({} if the rules changed)."""
+        if self.get_meta("verdict_fingerprint") != fingerprint:
+            return {}
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT login, score, reasons, updated_at, created_at, checked_at, ttl FROM verdicts"
+            ).fetchall()
+        return {
+            login: {
+                "score": score, "reasons": json.loads(reasons), "updated_at": updated_at,
+                "created_at": created_at, "checked_at": checked_at, "ttl": ttl,
+            }
+            for login, score, reasons, updated_at, created_at, checked_at, ttl in rows
+        }
+
+    def save_verdicts(self, fingerprint, verdicts, expired_before):
+        """
+        Upsert verdicts ({login: verdict}) and drop those that expired before expired_before.
+
+        Verdicts stored under another fingerprint are dropped first.
+        """
+        with self._lock:
+            if self.get_meta("verdict_fingerprint") != fingerprint:
+                self._db.execute("DELETE FROM verdicts")
+                self.set_meta("verdict_fingerprint", fingerprint)
+        self._write(
+            "INSERT OR REPLACE INTO verdicts (login, score, reasons, updated_at, created_at, checked_at, ttl) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            _batches(
+                (login, v["score"], json.dumps(v["reasons"]), v["updated_at"], v.get("created_at"),
+                 v["checked_at"], v["ttl"])
+                for login, v in verdicts.items()
+            ),
+        )
+        with self._lock:
+            self._db.execute("DELETE FROM verdicts WHERE checked_at + ttl < ?", (expired_before,))
+
+    # Action history
+
+    def record_actions(self, results, account=""):
+        """Append follow/unfollow results (WriteResults) to the action history."""
+        now = self.clock()
+        self._write(
+            "INSERT INTO actions (account, at, action, login, ok, status, error) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            _batches(
+                (account, now, r.action, r.username, int(r.ok), r.status, None if r.error is None else str(r.error))
+                for r in results
+            ),
+        )
+
+    def history(self, login):
+        """Return [(at, action, ok), ...] for login, oldest first."""
+        with self._lock:
+            rows = self._db.execute("SELECT at, action, ok FROM actions WHERE login = ? ORDER BY id", (login,))
+            return [(at, action, bool(ok)) for at, action, ok in rows]
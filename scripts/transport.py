@@ -0,0 +1,401 @@
+"""
+HTTP transports behind GitHubClient.
+
+Every transport has request(method, url, headers=None, json=None, timeout=None)
+returning a response with the parts of requests.Response the bot uses
+(status_code, headers, text, json(), links, raise_for_status()) and close().
+
+  requests  pooled requests.Session (the default when requests is installed)
+  stdlib    pooled http.client keep-alive connections; needs no installs
+  async     asyncio HTTP/1.1 keep-alive client; coroutines can await
+            arequest() directly, and request() runs it on a private event loop
+
+Network errors from every transport derive from OSError, like requests'.
+"""
+import asyncio
+import http.client
+import importlib.util
+import json as jsonlib
+import ssl
+import threading
+from collections.abc import MutableMapping
+from urllib.parse import urlsplit
+
+
+TRANSPORTS = ("auto", "requests", "stdlib", "async")
+
+# Seconds to wait for a connection or a response
+DEFAULT_TIMEOUT = 30
+
+# http.client and the asyncio client send no User-Agent, which GitHub rejects
+USER_AGENT = "follow-sync"
+
+
+class TransportError(OSError):
+    """Malformed or unexpected HTTP exchange."""
+
+
+class HTTPError(OSError):
+    """Raised by Response.raise_for_status for 4xx and 5xx responses."""
+
+    def __init__(self, message, response=None):
+        super().__init__(message)
+        self.response = response
+
+
+class Headers(MutableMapping):
+    """Case-insensitive header mapping; repeated headers are joined with ', '."""
+
+    def __init__(self, items=()):
+        self._items = {}
+        for name, value in items:
+            key = name.lower()
+            if key in self._items:
+                value = f"{self._items[key][1]}, {value}"
+            self._items[key] = (name, value)
+
+    def __getitem__(self, name):
+        return self._items[name.lower()][1]
+
+    def __setitem__(self, name, value):
+        self._items[name.lower()] = (name, value)
+
+    def __delitem__(self, name):
+        del self._items[name.lower()]
+
+    def __iter__(self):
+        return (name for name, _ in self._items.values())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+def parse_links(value):
+    """Parse a Link header into {rel: {"url": ..., "rel": ...}}, like requests' Response.links."""
+    links = {}
+    for part in (value or "").split(","):
+        url, _, params = part.partition(";")
+        url = url.strip().strip("<>")
+        if not url:
+            continue
+        link = {"url": url}
+        for param in params.split(";"):
+            key, _, val = param.partition("=")
+            if key.strip():
+                link[key.strip()] = val.strip().strip('"')
+        links[link.get("rel", url)] = link
+    return links
+
+
+class Response:
+    """Fully read HTTP response from the stdlib and async transports."""
+
+    def __init__(self, method, url, status_code, reason, headers, content):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self._content = content
+        self.encoding = "utf-8"
+
+    @property
+    def content(self):
+        return self._content
+
+    @property
+    def text(self):
+        return self._content.decode(self.encoding or "utf-8", errors="replace")
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def links(self):
+        return parse_links(self.headers.get("Link"))
+
+    def json(self):
+        return jsonlib.loads(self._content)
+
+    def raise_for_status(self):
+        if 400 <= self.status_code < 600:
+            kind = "Client" if self.status_code < 500 else "Server"
+            raise HTTPError(f"{self.status_code} {kind} Error: {self.reason} for url: {self.url}", response=self)
+
+    def __repr__(self):
+        return f"<Response [{self.status_code}]>"
+
+
+def _prepare(url, default_headers, headers, json, data):
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Unsupported URL: {url}")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    merged = dict(default_headers)
+    merged.update(headers or {})
+    if json is not None:
+        data = jsonlib.dumps(json).encode("utf-8")
+        merged.setdefault("Content-Type", "application/json")
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return (parts.scheme, parts.hostname, port), target, merged, data
+
+
+class RequestsTransport:
+    """Pooled requests.Session; keyword arguments go straight to Session.request."""
+
+    name = "requests"
+
+    def __init__(self, headers, pool_size):
+        # Imported here so the other transports work where requests is not installed
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+class StdlibTransport:
+    """
+    http.client connections kept alive per host and shared between threads.
+
+    Up to pool_size idle connections are kept per host. A request that fails
+    on a reused connection (closed by the server while idle) is retried once
+    on a new one.
+    """
+
+    name = "stdlib"
+
+    def __init__(self, headers, pool_size, timeout=DEFAULT_TIMEOUT):
+        self.headers = {"User-Agent": USER_AGENT, **headers}
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._ssl = None
+
+    def _acquire(self, origin, timeout):
+        with self._lock:
+            idle = self._idle.get(origin)
+            if idle:
+                return idle.pop(), True
+            if origin[0] == "https" and self._ssl is None:
+                self._ssl = ssl.create_default_context()
+        scheme, host, port = origin
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl), False
+        return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+    def _release(self, origin, conn):
+        with self._lock:
+            idle = self._idle.setdefault(origin, [])
+            if len(idle) < self.pool_size:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method, url, headers=None, json=None, data=None, timeout=None):
+        origin, target, headers, body = _prepare(url, self.headers, headers, json, data)
+        for attempt in range(2):
+            conn, reused = self._acquire(origin, timeout or self.timeout)
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                resp = conn.getresponse()
+                content = resp.read()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                if isinstance(e, OSError):
+                    raise
+                raise TransportError(f"{method} {url}: {e!r}") from e
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(origin, conn)
+            return Response(method, url, resp.status, resp.reason, Headers(resp.getheaders()), content)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+class AsyncTransport:
+    """
+    asyncio HTTP/1.1 client with keep-alive connections.
+
+    At most pool_size requests per host are in flight, each on its own
+    connection; finished connections are kept for the next request. Async
+    code awaits arequest() on its own event loop. request() is the blocking
+    form for GitHubClient: it runs arequest() on a private event loop thread,
+    so the client's worker threads share one loop and its connections.
+    A transport must not be used from more than one event loop.
+    """
+
+    name = "async"
+
+    def __init__(self, headers, pool_size, timeout=DEFAULT_TIMEOUT):
+        self.headers = {"User-Agent": USER_AGENT, **headers}
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle = {}
+        self._slots = {}
+        self._ssl = None
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    async def arequest(self, method, url, headers=None, json=None, data=None, timeout=None):
+        origin, target, headers, body = _prepare(url, self.headers, headers, json, data)
+        host = origin[1] if origin[2] in (80, 443) else f"{origin[1]}:{origin[2]}"
+        headers.setdefault("Host", host)
+        if body is not None or method in ("POST", "PUT", "PATCH"):
+            headers["Content-Length"] = str(len(body or b""))
+        head = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        payload = f"{method} {target} HTTP/1.1\r\n{head}\r\n".encode("latin-1") + (body or b"")
+
+        slots = self._slots.get(origin)
+        if slots is None:
+            slots = self._slots[origin] = asyncio.Semaphore(self.pool_size)
+        async with slots:
+            for attempt in range(2):
+                conn, reused = await self._acquire(origin, timeout or self.timeout)
+                try:
+                    resp, keep_alive = await asyncio.wait_for(
+                        self._exchange(conn, method, url, payload), timeout or self.timeout
+                    )
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, TransportError) as e:
+                    conn[1].close()
+                    if reused and attempt == 0 and not isinstance(e, asyncio.TimeoutError):
+                        continue
+                    if isinstance(e, OSError):
+                        raise
+                    raise TransportError(f"{method} {url}: {e!r}") from e
+                if keep_alive:
+                    self._idle.setdefault(origin, []).append(conn)
+                else:
+                    conn[1].close()
+                return resp
+
+    async def _acquire(self, origin, timeout):
+        idle = self._idle.get(origin)
+        while idle:
+            conn = idle.pop()
+            if not conn[0].at_eof():
+                return conn, True
+            conn[1].close()
+        scheme, host, port = origin
+        if scheme == "https" and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        conn = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self._ssl if scheme == "https" else None), timeout
+        )
+        return conn, False
+
+    @staticmethod
+    async def _exchange(conn, method, url, payload):
+        reader, writer = conn
+        writer.write(payload)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before the response")
+        try:
+            version, status, *reason = status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+            status = int(status)
+        except ValueError as e:
+            raise TransportError(f"Bad status line {status_line!r}") from e
+        raw_headers = []
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            raw_headers.append((name.strip(), value.strip()))
+        headers = Headers(raw_headers)
+
+        connection = headers.get("Connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        if method == "HEAD" or status in (204, 304) or status < 200:
+            content = b""
+        elif headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # Skip trailers up to the blank line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            content = b"".join(chunks)
+        elif "Content-Length" in headers:
+            content = await reader.readexactly(int(headers["Content-Length"]))
+        else:
+            content = await reader.read()
+            keep_alive = False
+        return Response(method, url, status, reason[0] if reason else "", headers, content), keep_alive
+
+    def _event_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="async-transport", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def request(self, method, url, **kwargs):
+        return asyncio.run_coroutine_threadsafe(self.arequest(method, url, **kwargs), self._event_loop()).result()
+
+    async def aclose(self):
+        """Close the idle connections (from the event loop the transport runs on)."""
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for _, writer in conns:
+                writer.close()
+
+    def close(self):
+        with self._lock:
+            loop, thread, self._loop, self._thread = self._loop, self._thread, None, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def make_transport(name, headers, pool_size, timeout=DEFAULT_TIMEOUT):
+    """
+    Create a transport by name; "auto" picks requests if it is installed, stdlib otherwise.
+
+    Raises:
+        ValueError: If name is not one of TRANSPORTS
+    """
+    if name == "auto":
+        name = "requests" if importlib.util.find_spec("requests") else "stdlib"
+    backends = {"requests": RequestsTransport, "stdlib": StdlibTransport, "async": AsyncTransport}
+    if name not in backends:
+        raise ValueError(f"Unknown transport {name!r}; choose one of {', '.join(TRANSPORTS)}")
+    if name == "requests":
+        # requests' own default is to wait forever; keep that behaviour for this backend
+        return RequestsTransport(headers, pool_size)
+    return backends[name](headers, pool_size, timeout=timeout)
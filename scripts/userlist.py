@@ -0,0 +1,121 @@
+from array import array
+
+
+class UserList:
+    """
+    Compact follower/following list.
+
+    Keeps only the logins, in the order GitHub returned them (newest-first),
+    and their numeric ids in an array('q'), instead of every user's full
+    JSON. Lists are compared through an index of positions sorted by id
+    (or by login when the ids are unknown, e.g. for lists read back from a
+    snapshot), so differences are computed with a linear merge.
+    """
+
+    __slots__ = ("logins", "ids", "_order")
+
+    def __init__(self, logins=(), ids=None):
+        self.logins = list(logins)
+        self.ids = array("q", ids) if ids is not None else None
+        self._order = None
+
+    @classmethod
+    def from_items(cls, items):
+        """Build from an iterable of user dicts, reducing each to its id and login as it arrives."""
+        users = cls()
+        ids = array("q")
+        for item in items:
+            users.logins.append(item["login"])
+            if ids is not None:
+                user_id = item.get("id")
+                if user_id is None:
+                    ids = None
+                else:
+                    ids.append(user_id)
+        users.ids = ids
+        users._dedupe()
+        return users
+
+    def __len__(self):
+        return len(self.logins)
+
+    def __iter__(self):
+        return iter(self.logins)
+
+    def __eq__(self, other):
+        if isinstance(other, UserList):
+            return self.logins == other.logins
+        return self.logins == list(other)
+
+    def __repr__(self):
+        return f"UserList({self.logins!r})"
+
+    def _keys(self):
+        return self.ids if self.ids is not None else self.logins
+
+    def _sorted_positions(self):
+        if self._order is None:
+            n = len(self.logins)
+            if self.ids is not None and n:
+                # Sorting plain ints (id and position packed together) is faster
+                # and allocates less than sorting positions with a key function
+                packed = sorted(user_id * n + i for i, user_id in enumerate(self.ids))
+                self._order = array("l", (p % n for p in packed))
+            else:
+                self._order = array("l", sorted(range(n), key=self.logins.__getitem__))
+        return self._order
+
+    def _dedupe(self):
+        # A list that shifts during concurrent page fetches can return a user
+        # twice; keep the first (newest) occurrence
+        keys = self._keys()
+        order = self._sorted_positions()
+        dupes = {
+            max(order[i - 1], order[i]) for i in range(1, len(order)) if keys[order[i - 1]] == keys[order[i]]
+        }
+        if not dupes:
+            return
+        keep = [i for i in range(len(self.logins)) if i not in dupes]
+        self.logins = [self.logins[i] for i in keep]
+        if self.ids is not None:
+            self.ids = array("q", (self.ids[i] for i in keep))
+        self._order = None
+
+
+def merge_diff(left, right, with_ids=False):
+    """
+    Split two UserLists into (only_left, only_right, both) login lists with one linear merge.
+
+    Both lists are compared by id when both have ids, by login otherwise.
+    With with_ids=True each part is a {login: id} dict instead (id None if unknown).
+    """
+    if (left.ids is None) != (right.ids is None):
+        left, right = UserList(left.logins), UserList(right.logins)
+    left_keys, right_keys = left._keys(), right._keys()
+    left_order, right_order = left._sorted_positions(), right._sorted_positions()
+
+    def entry(users, position):
+        login = users.logins[position]
+        if not with_ids:
+            return login
+        return login, users.ids[position] if users.ids is not None else None
+
+    only_left, only_right, both = [], [], []
+    i = j = 0
+    while i < len(left_order) and j < len(right_order):
+        a, b = left_keys[left_order[i]], right_keys[right_order[j]]
+        if a < b:
+            only_left.append(entry(left, left_order[i]))
+            i += 1
+        elif b < a:
+            only_right.append(entry(right, right_order[j]))
+            j += 1
+        else:
+            both.append(entry(left, left_order[i]))
+            i += 1
+            j += 1
+    only_left.extend(entry(left, p) for p in left_order[i:])
+    only_right.extend(entry(right, p) for p in right_order[j:])
+    if with_ids:
+        return dict(only_left), dict(only_right), dict(both)
+    return only_left, only_right, both
@@ -1,30 +1,117 @@
-import requests
-
-def get_headers(token):
-    return {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-
-def paginate(url, token):
-    headers = get_headers(token)
-    results = []
-    while url:
-        resp = requests.get(url, headers=headers)
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from scripts.client import GitHubClient, client_for, get_headers  # noqa: F401 (re-exported)
+
+
+# Largest page size the list endpoints accept (the default is 30)
+PER_PAGE = 100
+
+
+def with_per_page(url, per_page):
+    """Return url with its per_page query parameter set (unless already present)."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query)
+    if any(key == "per_page" for key, _ in query):
+        return url
+    query.append(("per_page", str(per_page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def page_url(url, page):
+    """Return url with its page query parameter set to page."""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != "page"]
+    query.append(("page", str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def last_page_number(resp):
+    """Return the page number of the rel="last" link, or None if there is none."""
+    last = resp.links.get("last", {}).get("url")
+    if not last:
+        return None
+    for key, value in parse_qsl(urlsplit(last).query):
+        if key == "page" and value.isdigit():
+            return int(value)
+    return None
+
+def iter_pages(url, token, client=None, per_page=PER_PAGE, max_workers=1):
+    """
+    Yield each page of a paginated list endpoint as soon as it arrives.
+
+    With max_workers > 1, the total page count is read from the rel="last"
+    link of the first page and the remaining pages are fetched concurrently,
+    at most max_workers at a time, while still being yielded in order. Without
+    a rel="last" link the pages are walked sequentially through rel="next".
+    """
+    with client_for(token, client) as client:
+        yield from _iter_pages(client, url, per_page, max_workers)
+
+
+def _iter_pages(client, url, per_page, max_workers):
+    url = with_per_page(url, per_page) if per_page else url
+
+    def fetch(target):
+        resp = client.get(target)
         resp.raise_for_status()
-        results.extend(resp.json())
+        return resp
+
+    resp = fetch(url)
+    yield resp.json()
+
+    last_page = last_page_number(resp) if max_workers > 1 else None
+    if last_page is None:
         url = resp.links.get("next", {}).get("url")
-    return results
+        while url:
+            resp = fetch(url)
+            yield resp.json()
+            url = resp.links.get("next", {}).get("url")
+        return
+
+    # Keep a bounded window of requests in flight so pages are not buffered
+    # faster than the caller consumes them
+    urls = (page_url(resp.links["last"]["url"], page) for page in range(2, last_page + 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        window = deque(executor.submit(fetch, u) for u in islice(urls, 2 * max_workers))
+        while window:
+            page = window.popleft().result().json()
+            for u in islice(urls, 1):
+                window.append(executor.submit(fetch, u))
+            yield page
+
+def iter_paginate(url, token, client=None, per_page=PER_PAGE, max_workers=1):
+    """Yield the items of a paginated list endpoint one by one, fetching pages lazily."""
+    for page in iter_pages(url, token, client=client, per_page=per_page, max_workers=max_workers):
+        yield from page
+
+def paginate(url, token, client=None, per_page=PER_PAGE, max_workers=1):
+    return list(iter_paginate(url, token, client=client, per_page=per_page, max_workers=max_workers))
 
-def get_followers(token):
-    return paginate("https://api.github.com/user/followers", token)
+def iter_followers(token, client=None, max_workers=1):
+    with client_for(token, client) as client:
+        yield from iter_paginate(client.url("/user/followers"), token, client=client, max_workers=max_workers)
 
-def get_following(token):
-    return paginate("https://api.github.com/user/following", token)
+def iter_following(token, client=None, max_workers=1):
+    with client_for(token, client) as client:
+        yield from iter_paginate(client.url("/user/following"), token, client=client, max_workers=max_workers)
+
+def get_followers(token, client=None):
+    return list(iter_followers(token, client=client))
+
+def get_following(token, client=None):
+    return list(iter_following(token, client=client))
+
+def get_authenticated_user(token, client=None):
+    """Fetch the account behind token (GET /user)."""
+    with client_for(token, client) as client:
+        resp = client.get(client.url("/user"))
+    resp.raise_for_status()
+    return resp.json()
 
-def get_user_detail(token, username):
+def get_user_detail(token, username, client=None):
     """Fetch detailed user information for spam detection."""
-    headers = get_headers(token)
-    resp = requests.get(f"https://api.github.com/users/{username}", headers=headers)
+    with client_for(token, client) as client:
+        resp = client.get(client.url(f"/users/{username}"))
     resp.raise_for_status()
     return resp.json()
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from scripts.spam import _SUSPICIOUS_PATTERNS, SCORE_WEIGHTS, SPAM_THRESHOLD
+
+
+VERDICTS_FILE = "verdicts.json"
+
+DAY = 24 * 3600
+
+# How long a verdict is trusted without looking at the profile again
+DEFAULT_TTL = 7 * DAY
+# Upper bound for profiles that were unchanged at every re-check
+MAX_TTL = 28 * DAY
+# Young accounts change quickly and age out of the new_account rule
+YOUNG_ACCOUNT_TTL = 1 * DAY
+YOUNG_ACCOUNT_DAYS = 90
+# Scores this close to the threshold can flip with a single profile edit
+NEAR_THRESHOLD_TTL = 2 * DAY
+NEAR_THRESHOLD_MARGIN = 1
+
+# Verdicts expired for this long are dropped when the store is saved
+PRUNE_AFTER = 90 * DAY
+
+
+def rules_fingerprint():
+    """Return a short hash of the scoring rules, so rule changes invalidate verdicts."""
+    rules = {
+        "weights": SCORE_WEIGHTS,
+        "threshold": SPAM_THRESHOLD,
+        "patterns": [p.pattern for p in _SUSPICIOUS_PATTERNS],
+    }
+    return hashlib.sha1(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def _account_age_days(user, now):
+    created_at = user.get("created_at")
+    if not created_at:
+        return None
+    created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    return (now - created.timestamp()) / DAY
+
+
+class VerdictStore:
+    """
+    Persistent spam verdicts keyed by login.
+
+    Each verdict records the score, reasons, the profile's updated_at and when
+    it was checked, and is reused without fetching the profile until its TTL
+    runs out. The TTL is short for young accounts and near-threshold scores,
+    and doubles (up to MAX_TTL) each time a re-check finds the profile's
+    updated_at unchanged. Changing the scoring rules invalidates every verdict;
+    pass the fingerprint of a RulePlan when scoring with one.
+
+    With a db (StateStore), verdicts are kept in its verdicts table instead
+    of the JSON file at path, and save() only writes the ones changed since load.
+    """
+
+    def __init__(self, path=None, threshold=SPAM_THRESHOLD, clock=time.time, fingerprint=None, db=None):
+        self.path = path
+        self.threshold = threshold
+        self.clock = clock
+        self.fingerprint = fingerprint or rules_fingerprint()
+        self.db = db
+        self.hits = 0
+        self.misses = 0
+        self._verdicts = {}
+        self._changed = set()
+        self._lock = threading.Lock()
+        if db is not None or (path and os.path.exists(path)):
+            self.load()
+
+    def __len__(self):
+        return len(self._verdicts)
+
+    def load(self):
+        """Load verdicts from path, dropping those made under other rules."""
+        if self.db is not None:
+            verdicts = self.db.load_verdicts(self.fingerprint)
+            if not verdicts and self.db.get_meta("verdict_fingerprint") not in (None, self.fingerprint):
+                print("🔁 Spam rules changed since the last run, re-checking every account")
+            with self._lock:
+                self._verdicts = verdicts
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable verdict store {self.path}: {e}")
+            return
+        if data.get("fingerprint") != self.fingerprint:
+            print("🔁 Spam rules changed since the last run, re-checking every account")
+            return
+        with self._lock:
+            self._verdicts = data.get("verdicts", {})
+
+    def save(self):
+        """Write verdicts to path atomically, pruning long-expired ones."""
+        now = self.clock()
+        if self.db is not None:
+            with self._lock:
+                changed = {login: self._verdicts[login] for login in self._changed}
+                self._changed.clear()
+            self.db.save_verdicts(self.fingerprint, changed, expired_before=now - PRUNE_AFTER)
+            return
+        if not self.path:
+            return
+        with self._lock:
+            verdicts = {
+                login: v for login, v in self._verdicts.items()
+                if v["checked_at"] + v["ttl"] + PRUNE_AFTER > now
+            }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, "verdicts": verdicts}, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, login, updated_at=None):
+        """
+        Return the cached (is_spam, reasons) for login, or None if it must be re-checked.
+
+        Args:
+            updated_at: The profile's current updated_at, if already known;
+                a different value invalidates the verdict
+        """
+        now = self.clock()
+        with self._lock:
+            verdict = self._verdicts.get(login)
+            fresh = (
+                verdict is not None
+                and now < verdict["checked_at"] + verdict["ttl"]
+                and (updated_at is None or updated_at == verdict["updated_at"])
+            )
+            if not fresh:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return verdict["score"] >= self.threshold, list(verdict["reasons"])
+
+    def record(self, login):
+        """Return a copy of the stored verdict for login (expired or not), or None."""
+        with self._lock:
+            verdict = self._verdicts.get(login)
+            return dict(verdict) if verdict is not None else None
+
+    def put(self, login, user, score, reasons):
+        """Record the verdict for a freshly fetched profile."""
+        now = self.clock()
+        updated_at = user.get("updated_at")
+        with self._lock:
+            previous = self._verdicts.get(login)
+            ttl = DEFAULT_TTL
+            if previous is not None and updated_at and previous["updated_at"] == updated_at:
+                ttl = min(max(previous["ttl"] * 2, DEFAULT_TTL), MAX_TTL)
+
+            age_days = _account_age_days(user, now)
+            if age_days is not None and age_days < YOUNG_ACCOUNT_DAYS:
+                ttl = min(ttl, YOUNG_ACCOUNT_TTL)
+            if abs(score - self.threshold) <= NEAR_THRESHOLD_MARGIN:
+                ttl = min(ttl, NEAR_THRESHOLD_TTL)
+
+            self._verdicts[login] = {
+                "score": score,
+                "reasons": list(reasons),
+                "updated_at": updated_at,
+                "created_at": user.get("created_at"),
+                "checked_at": now,
+                "ttl": ttl,
+            }
+            self._changed.add(login)
+
+    def report(self):
+        """Return a one-line summary of verdict reuse for this run."""
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"🗂️  Verdict cache: {self.hits} reused, {self.misses} re-checked ({rate:.1f}% reused)"
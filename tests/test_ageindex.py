@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+from scripts.ageindex import AccountAgeIndex
+from scripts.spam import score_bounds
+
+
+def profile(user_id, created_at):
+    return {"login": f"user{user_id}", "id": user_id, "created_at": created_at}
+
+
+class TestAccountAgeIndex:
+    """Test cases for id-based account age estimation."""
+
+    @staticmethod
+    def test_interpolates_between_anchors_with_bounds():
+        """Test the interpolated estimate and the hard bounds from the neighbouring anchors."""
+        index = AccountAgeIndex()
+        index.learn(profile(100_000_000, "2022-01-01T00:00:00Z"))
+        index.learn(profile(100_000_200, "2022-01-03T00:00:00Z"))
+
+        estimate = index.estimate(100_000_100)
+
+        assert estimate.created == datetime(2022, 1, 2, tzinfo=timezone.utc)
+        assert estimate.earliest == datetime(2022, 1, 1, tzinfo=timezone.utc)
+        assert estimate.latest == datetime(2022, 1, 3, tzinfo=timezone.utc)
+
+    @staticmethod
+    def test_beyond_newest_anchor_has_no_upper_bound():
+        """Test that ids newer than every anchor only get a lower bound."""
+        index = AccountAgeIndex()
+        index.learn(profile(100_000_000, "2022-01-01T00:00:00Z"))
+
+        estimate = index.estimate(200_000_000)
+
+        assert estimate.created is None and estimate.latest is None
+        assert estimate.earliest == datetime(2022, 1, 1, tzinfo=timezone.utc)
+
+    @staticmethod
+    def test_ignores_contradicting_anchor():
+        """Test that an anchor out of order with its neighbours is not learned."""
+        index = AccountAgeIndex()
+        index.learn(profile(100_000_000, "2022-01-01T00:00:00Z"))
+        size = len(index)
+
+        index.learn(profile(100_000_500, "2020-01-01T00:00:00Z"))
+
+        assert len(index) == size and index.learned == 1
+
+    @staticmethod
+    def test_persists_and_thins(tmp_path):
+        """Test that anchors survive a save/load and the index stays bounded."""
+        path = str(tmp_path / "age-index.json")
+        index = AccountAgeIndex(path, max_anchors=16)
+        for i in range(40):
+            created = datetime(2015, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i)
+            index.learn(profile(10_000_000 + i, created.strftime("%Y-%m-%dT%H:%M:%SZ")))
+        index.save()
+
+        reloaded = AccountAgeIndex(path)
+        assert len(index) <= 16
+        assert reloaded.estimate(10_000_039).created == datetime(2015, 1, 2, 15, tzinfo=timezone.utc)
+
+    @staticmethod
+    def test_settles_new_account_rule_for_scorer():
+        """Test that a recent anchor lets score_bounds rule out the 30-day rule."""
+        index = AccountAgeIndex()
+        item = {"login": "x", "id": 150_000_000}
+        before = score_bounds(item, estimate_created=index.created_range)
+        index.learn(profile(160_000_000, "2024-01-01T00:00:00Z"))
+
+        after = score_bounds(item, estimate_created=index.created_range)
+
+        assert after.high == before.high - 2
@@ -0,0 +1,28 @@
+import pytest
+from benchmarks.bench_e2e import run_scenario
+from benchmarks.fake_github import FakeGitHubState
+
+
+@pytest.mark.integration
+def test_full_sync_against_fake_api():
+    """Test a full sync end to end against the local fake GitHub API."""
+    state = FakeGitHubState(followers=20, following=20, mutual=10, max_per_page=7)
+
+    result = run_scenario(state, trace_memory=False)
+
+    # Every 10th fake user (user9, user19) is spam: not followed back, and unfollowed if mutual
+    expected = {f"user{i}" for i in range(20)} - {"user9", "user19"}
+    assert set(state.following) == expected
+    assert result["requests"] == state.request_count
+    assert result["requests_by_endpoint"][("GET", "/user/followers")] == 3
+    assert "🚫 Skipping spam follower: user19" in result["output"]
+
+
+@pytest.mark.integration
+def test_full_sync_survives_injected_secondary_limits():
+    """Test that injected 429 responses are retried instead of failing the run."""
+    state = FakeGitHubState(followers=30, following=0, error_rate=0.2, error_status=429, seed=1)
+
+    run_scenario(state, trace_memory=False)
+
+    assert set(state.following) == {f"user{i}" for i in range(30)} - {"user9", "user19", "user29"}
@@ -0,0 +1,124 @@
+import responses
+from scripts.cache import ResponseCache
+from scripts.client import GitHubClient
+from scripts.utils import paginate
+
+
+class TestResponseCache:
+    """Test cases for the on-disk response cache."""
+
+    @staticmethod
+    def test_put_and_get():
+        """Test storing and reading back an entry."""
+        cache = ResponseCache()
+        cache.put("https://api.github.com/users/a", '"etag-a"', '{"login": "a"}')
+
+        entry = cache.get("https://api.github.com/users/a")
+        assert entry["etag"] == '"etag-a"'
+        assert entry["body"] == '{"login": "a"}'
+        assert cache.get("https://api.github.com/users/b") is None
+
+    @staticmethod
+    def test_evicts_least_recently_used():
+        """Test size-bounded eviction drops the least recently used entry."""
+        cache = ResponseCache(max_bytes=30)
+        cache.put("u1", "e1", "x" * 10)
+        cache.put("u2", "e2", "x" * 10)
+        cache.get("u1")  # u1 is now more recent than u2
+        cache.put("u3", "e3", "x" * 10)
+
+        assert cache.get("u2") is None
+        assert cache.get("u1") is not None
+        assert cache.get("u3") is not None
+        assert cache.evictions == 1
+
+    @staticmethod
+    def test_persists_between_runs(tmp_path):
+        """Test that entries survive a save/load round trip."""
+        path = tmp_path / "state" / "http-cache.json"
+        cache = ResponseCache(str(path))
+        cache.put("u1", "e1", "[]", '<u1?page=2>; rel="next"')
+        cache.save()
+
+        reloaded = ResponseCache(str(path))
+        assert reloaded.get("u1") == {"etag": "e1", "body": "[]", "link": '<u1?page=2>; rel="next"'}
+
+    @staticmethod
+    def test_corrupt_file_is_ignored(tmp_path):
+        """Test that an unreadable cache file starts an empty cache."""
+        path = tmp_path / "http-cache.json"
+        path.write_text("not json")
+
+        cache = ResponseCache(str(path))
+        assert len(cache) == 0
+
+    @staticmethod
+    def test_report():
+        """Test the hit/miss summary."""
+        cache = ResponseCache()
+        cache.record_hit()
+        cache.record_hit()
+        cache.record_hit()
+        cache.record_miss()
+
+        report = cache.report()
+        assert "3 hits" in report
+        assert "1 misses" in report
+        assert "75.0% hit rate" in report
+
+
+class TestConditionalRequests:
+    """Test cases for ETag-based conditional requests in GitHubClient."""
+
+    @responses.activate
+    def test_stores_etag_then_serves_304_from_cache(self):
+        """Test that a 304 answer is served from the cached body."""
+        url = "https://api.github.com/users/octocat"
+        responses.add(responses.GET, url, json={"login": "octocat"}, headers={"ETag": '"v1"'})
+        responses.add(responses.GET, url, status=304)
+
+        cache = ResponseCache()
+        client = GitHubClient("test_token", cache=cache)
+        first = client.get(url)
+        second = client.get(url)
+
+        assert first.json() == {"login": "octocat"}
+        assert second.status_code == 200
+        assert second.json() == {"login": "octocat"}
+        assert "If-None-Match" not in responses.calls[0].request.headers
+        assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @responses.activate
+    def test_changed_resource_replaces_entry(self):
+        """Test that a new 200 response replaces the cached body and ETag."""
+        url = "https://api.github.com/users/octocat"
+        responses.add(responses.GET, url, json={"bio": "old"}, headers={"ETag": '"v1"'})
+        responses.add(responses.GET, url, json={"bio": "new"}, headers={"ETag": '"v2"'})
+
+        cache = ResponseCache()
+        client = GitHubClient("test_token", cache=cache)
+        client.get(url)
+        resp = client.get(url)
+
+        assert resp.json() == {"bio": "new"}
+        assert cache.get(url)["etag"] == '"v2"'
+        assert cache.misses == 2
+
+    @responses.activate
+    def test_paginate_follows_cached_links(self):
+        """Test that cached pages keep their Link header for pagination."""
+        page1 = "https://api.github.com/user/followers"
+        page2 = "https://api.github.com/user/followers?page=2"
+        link = f'<{page2}>; rel="next"'
+        responses.add(responses.GET, page1, json=[{"login": "a"}], headers={"ETag": '"p1"', "Link": link})
+        responses.add(responses.GET, page2, json=[{"login": "b"}], headers={"ETag": '"p2"'})
+        responses.add(responses.GET, page1, status=304)
+        responses.add(responses.GET, page2, status=304)
+
+        client = GitHubClient("test_token", cache=ResponseCache())
+        first = paginate(page1, "test_token", client=client)
+        second = paginate(page1, "test_token", client=client)
+
+        assert first == second == [{"login": "a"}, {"login": "b"}]
+        assert client.cache.hits == 2
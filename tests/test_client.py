@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+import responses
+from scripts.client import GitHubClient
+from scripts.follow import follow_users
+from scripts.utils import get_followers, get_user_detail
+
+
+class TestGitHubClient:
+    """Test cases for the pooled GitHub client."""
+
+    @staticmethod
+    def test_session_carries_auth_headers():
+        """Test that the session is created once with the auth headers."""
+        client = GitHubClient("test_token")
+
+        assert client.session.headers["Authorization"] == "token test_token"
+        assert client.session.headers["Accept"] == "application/vnd.github.v3+json"
+
+    @staticmethod
+    def test_url_joins_api_base():
+        """Test building absolute API URLs from paths."""
+        client = GitHubClient("test_token", api_url="http://localhost:8080/")
+
+        assert client.url("/user/followers") == "http://localhost:8080/user/followers"
+
+    @staticmethod
+    def test_connection_pool_size():
+        """Test that the adapter keeps the configured number of connections."""
+        client = GitHubClient("test_token", pool_size=4)
+
+        adapter = client.session.get_adapter("https://api.github.com")
+        assert adapter._pool_maxsize == 4
+
+    @responses.activate
+    def test_client_reused_across_helpers(self):
+        """Test that one client serves list, detail and follow calls."""
+        responses.add(responses.GET, "https://api.github.com/user/followers", json=[{"login": "user1"}])
+        responses.add(responses.GET, "https://api.github.com/users/user1", json={"login": "user1"})
+        responses.add(responses.PUT, "https://api.github.com/user/following/user1", status=204)
+
+        with GitHubClient("test_token") as client:
+            followers = get_followers("test_token", client=client)
+            detail = get_user_detail("test_token", "user1", client=client)
+            follow_users("test_token", {"user1"}, client=client)
+
+        assert followers == [{"login": "user1"}]
+        assert detail == {"login": "user1"}
+        assert len(responses.calls) == 3
+        for call in responses.calls:
+            assert call.request.headers["Authorization"] == "token test_token"
+
+    @responses.activate
+    def test_helpers_close_the_client_they_create(self):
+        """Test that helpers called without a client close the one they open, and leave a passed one open."""
+        responses.add(responses.GET, "https://api.github.com/user/followers", json=[{"login": "user1"}])
+        responses.add(responses.GET, "https://api.github.com/users/user1", json={"login": "user1"})
+        responses.add(responses.PUT, "https://api.github.com/user/following/user1", status=204)
+        closed = []
+        with patch.object(GitHubClient, "close", autospec=True, side_effect=closed.append):
+            get_followers("test_token")
+            get_user_detail("test_token", "user1")
+            follow_users("test_token", {"user1"})
+            assert len(closed) == 3
+
+            client = GitHubClient("test_token")
+            get_user_detail("test_token", "user1", client=client)
+            assert len(closed) == 3
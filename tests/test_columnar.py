@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scripts import columnar
+from scripts.rules import compile_rules
+from scripts.spam import score_users as score_users_scalar
+from tests.test_rules import NOW, users
+
+np = pytest.importorskip("numpy")
+
+
+def profiles():
+    """The rule-combination users plus the edge cases of each field."""
+    batch = list(users())
+    batch += [
+        {"login": "no_fields"},
+        {"login": "nulls", "name": None, "bio": None, "created_at": None},
+        {"login": "offset", "created_at": "2024-05-31T23:30:00+02:00"},
+        {"login": "fraction", "created_at": "2024-05-02T00:00:00.5Z"},
+        {"login": "boundary", "created_at": (NOW - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%SZ")},
+        {"login": "future", "created_at": (NOW + timedelta(days=3, hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")},
+        {"login": "both", "name": "crypto king", "bio": "free money", "followers": 1},
+    ]
+    return batch
+
+
+class TestScoreBatch:
+    @staticmethod
+    def test_identical_to_scalar_scoring():
+        batch = profiles()
+        result = columnar.score_batch(batch, NOW)
+        expected = score_users_scalar(batch, NOW)
+        assert list(zip(result.scores.tolist(), result.reasons)) == expected
+        assert result.spam.tolist() == [score >= 3 for score, _ in expected]
+
+    @staticmethod
+    def test_identical_to_scalar_scoring_with_custom_rules():
+        rules = compile_rules({
+            "threshold": 2, "new_account_days": 400, "min_followers": 6,
+            "weights": {"no_name": 0, "no_repos": 5},
+            "patterns": [{"regex": "king"}],
+        })
+        batch = profiles()
+        result = columnar.score_batch(batch, NOW, rules)
+        assert "no_name" not in result.names
+        assert list(zip(result.scores.tolist(), result.reasons)) == score_users_scalar(batch, NOW, rules)
+
+    @staticmethod
+    def test_hit_matrix_has_one_column_per_rule():
+        result = columnar.score_batch([{"login": "a", "name": "A", "bio": "B", "public_repos": 1, "followers": 9}], NOW)
+        assert result.hits.shape == (1, 6)
+        assert not result.hits.any()
+
+
+class TestScoreUsers:
+    @staticmethod
+    def test_large_batches_take_the_columnar_path(monkeypatch):
+        batch = profiles() * 4
+        assert len(batch) >= columnar.MIN_BATCH
+        score_batch = columnar.score_batch
+        calls = []
+
+        def spy(*args):
+            calls.append(args)
+            return score_batch(*args)
+
+        monkeypatch.setattr(columnar, "score_batch", spy)
+        assert columnar.score_users(batch, NOW) == score_users_scalar(batch, NOW)
+        assert len(calls) == 1
+
+    @staticmethod
+    def test_fields_numpy_cannot_hold_fall_back_to_the_scalar_loop():
+        batch = profiles() * 4
+        batch[0] = dict(batch[0], public_repos=None)
+        assert columnar.score_users(batch, NOW) == score_users_scalar(batch, NOW)
+
+    @staticmethod
+    def test_naive_timestamps_raise_like_the_scalar_loop():
+        batch = profiles() * 4
+        batch[-1] = dict(batch[-1], created_at="2024-05-02T00:00:00")
+        with pytest.raises(TypeError):
+            columnar.score_batch(batch, NOW)
+        with pytest.raises(TypeError):
+            score_users_scalar(batch, NOW)
+        with pytest.raises(TypeError):
+            columnar.score_users(batch, NOW)
+
+    @staticmethod
+    def test_profiled_plans_score_per_dict_and_collect_stats():
+        batch = profiles() * 20
+        rules = compile_rules(profile=True)
+
+        assert columnar.score_users(batch, NOW, rules) == score_users_scalar(batch, NOW)
+
+        evaluations, hits, seconds = rules.stats["no_bio"]
+        assert evaluations == len(batch) >= columnar.MIN_BATCH
+        assert hits == sum(not user.get("bio") for user in batch)
+        assert seconds > 0
+
+    @staticmethod
+    def test_without_numpy_scores_per_dict(monkeypatch):
+        monkeypatch.setattr(columnar, "np", None)
+        batch = profiles() * 4
+        assert columnar.score_users(batch, NOW) == score_users_scalar(batch, NOW)
+        with pytest.raises(ImportError):
+            columnar.score_batch(batch, NOW)
+
+    @staticmethod
+    def test_defaults_to_the_current_time():
+        user = {"login": "new", "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")}
+        result = columnar.score_users([user] * columnar.MIN_BATCH)
+        assert result[0].reasons[-1] == "account only 0 days old"
+
@@ -0,0 +1,133 @@
+from benchmarks.fake_github import FakeGitHub, FakeGitHubState
+from scripts.client import GitHubClient
+from scripts.daemon import FollowerPoller, retry_delay
+from scripts.main import daemon
+from scripts.ratelimit import TokenBucket
+
+
+class TestFollowerPoller:
+    """Test cases for conditional polling of the followers list."""
+
+    @staticmethod
+    def test_unchanged_page_is_not_modified_and_backs_off():
+        """Test that an unchanged first page costs a 304 and spaces polls out."""
+        state = FakeGitHubState(followers=5, following=0)
+        with FakeGitHub(state) as server, GitHubClient("t", api_url=server.url) as client:
+            poller = FollowerPoller("t", client, known=state.followers, min_interval=10, max_interval=20)
+
+            assert poller.poll() == []
+            assert poller.poll() == []
+            assert poller.poll() == []
+
+        assert poller.not_modified == 2
+        assert poller.interval == 20
+
+    @staticmethod
+    def test_reports_only_new_followers_across_pages():
+        """Test that followers above the known head are returned, reading past a full first page."""
+        state = FakeGitHubState(followers=5, following=0, max_per_page=2)
+        with FakeGitHub(state) as server, GitHubClient("t", api_url=server.url) as client:
+            poller = FollowerPoller("t", client, known=state.followers, min_interval=10)
+            poller.interval = 40
+            for login in ("new1", "new2", "new3"):
+                state.add_follower(login)
+
+            new = poller.poll()
+
+        assert [item["login"] for item in new] == ["new3", "new2", "new1"]
+        assert poller.interval == 10
+
+    @staticmethod
+    def test_honours_x_poll_interval():
+        """Test that the interval never drops below what the server asks for."""
+        state = FakeGitHubState(followers=1, following=0, poll_interval=90)
+        with FakeGitHub(state) as server, GitHubClient("t", api_url=server.url) as client:
+            poller = FollowerPoller("t", client, known=state.followers, min_interval=10)
+            poller.poll()
+
+        assert poller.interval == 90
+
+
+class TestDaemon:
+    """Test cases for the daemon loop against the local fake API."""
+
+    @staticmethod
+    def test_follows_back_new_followers_between_reconciliations(capfd):
+        """Test that a follower arriving while the daemon runs is followed at the next poll."""
+        state = FakeGitHubState(followers=4, following=4, mutual=4)
+        clock = [0.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+            if len(state.followers) == 4:
+                state.add_follower("user20")   # clean profile
+                state.add_follower("user19")   # every 10th fake user is spam
+
+        with FakeGitHub(state) as server, GitHubClient("t", api_url=server.url) as client:
+            writes = daemon(
+                "t", client, {"throttle": TokenBucket(0)}, poll_interval=60, reconcile_interval=3600,
+                max_cycles=3, sleep=sleep, clock=lambda: clock[0],
+            )
+
+        assert [(w.username, w.action, w.ok) for w in writes] == [("user20", "follow", True)]
+        assert "user20" in state.following and "user19" not in state.following
+        # One full list read at startup, then only first-page polls
+        assert state.requests[("GET", "/user/following")] == 1
+        out, _ = capfd.readouterr()
+        assert "Skipping spam follower: user19" in out
+        assert "3 polls, 2 not modified" in out
+
+    @staticmethod
+    def test_reconciles_after_interval():
+        """Test that a full sync runs again once reconcile_interval has passed."""
+        state = FakeGitHubState(followers=2, following=2, mutual=2)
+        clock = [0.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        with FakeGitHub(state) as server, GitHubClient("t", api_url=server.url) as client:
+            daemon(
+                "t", client, {"throttle": TokenBucket(0)}, poll_interval=60, reconcile_interval=100,
+                max_cycles=3, sleep=sleep, clock=lambda: clock[0],
+            )
+
+        assert state.requests[("GET", "/user/following")] == 2
+
+    @staticmethod
+    def test_survives_a_failed_poll(capfd):
+        """Test that a 500 from the followers page is logged and the next poll still runs."""
+        state = FakeGitHubState(followers=2, following=2, mutual=2, error_status=500)
+        clock = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+            # Only the first poll fails
+            state.error_rate = 1.0 if len(sleeps) == 1 else 0.0
+            if len(sleeps) == 2:
+                state.add_follower("user20")
+
+        with FakeGitHub(state) as server, GitHubClient("t", api_url=server.url) as client:
+            writes = daemon(
+                "t", client, {"throttle": TokenBucket(0)}, poll_interval=60, reconcile_interval=3600,
+                max_cycles=2, sleep=sleep, clock=lambda: clock[0],
+            )
+
+        assert [(w.username, w.ok) for w in writes] == [("user20", True)]
+        assert sleeps == [60, 60]
+        out, _ = capfd.readouterr()
+        assert "Poll failed, retrying in 60s" in out
+
+    @staticmethod
+    def test_retry_delay_honours_retry_after():
+        """Test that Retry-After lengthens, but never shortens, the wait after an error."""
+        class Error(OSError):
+            def __init__(self, headers):
+                super().__init__("boom")
+                self.response = type("Resp", (), {"headers": headers})()
+
+        assert retry_delay(Error({"Retry-After": "120"}), 60) == 120
+        assert retry_delay(Error({"Retry-After": "5"}), 60) == 60
+        assert retry_delay(OSError("reset"), 60) == 60
@@ -1,5 +1,7 @@
 import responses
-from scripts.follow import follow_users, unfollow_users
+from scripts.client import GitHubClient
+from scripts.follow import WriteResult, follow_users, run_writes, unfollow_users
+from scripts.ratelimit import RateLimiter, TokenBucket
 
 
 class TestFollowUsers:
@@ -128,3 +130,57 @@ class TestUnfollowUsers:
         unfollow_users("dummy_token", set(), dry_run=False)
         # Should not make any requests
         # This test ensures the function handles empty input gracefully
+
+
+class TestRunWrites:
+    """Test cases for the concurrent, throttled write executor."""
+
+    @staticmethod
+    @responses.activate
+    def test_concurrent_writes_return_per_user_results():
+        """Test that every user gets a structured result, failures included."""
+        for i in range(20):
+            responses.add(responses.PUT, f"https://api.github.com/user/following/u{i}", status=204)
+        responses.add(responses.PUT, "https://api.github.com/user/following/blocked", status=403,
+                      json={"message": "Forbidden"})
+        usernames = {f"u{i}" for i in range(20)} | {"blocked"}
+
+        results = run_writes("t", "follow", usernames, max_workers=4, throttle=TokenBucket(0))
+
+        assert len(results) == 21
+        assert {r.username for r in results if r.ok} == usernames - {"blocked"}
+        failed = [r for r in results if not r.ok]
+        assert failed[0].username == "blocked" and failed[0].status == 403 and "Forbidden" in failed[0].error
+
+    @staticmethod
+    def test_network_error_is_a_failed_result():
+        """Test that a connection error fails only that user instead of the whole batch."""
+        with responses.RequestsMock() as mocked:
+            mocked.add(responses.DELETE, "https://api.github.com/user/following/a", status=204)
+            results = unfollow_users("t", {"a", "b"}, throttle=TokenBucket(0))
+
+        by_user = {r.username: r for r in results}
+        assert by_user["a"] == WriteResult("a", "unfollow", ok=True, status=204)
+        assert not by_user["b"].ok and by_user["b"].status is None and by_user["b"].error
+
+    @staticmethod
+    @responses.activate
+    def test_secondary_limit_slows_the_throttle():
+        """Test that a write that needed rate-limit retries halves the write rate."""
+        url = "https://api.github.com/user/following/a"
+        responses.add(responses.PUT, url, status=403, headers={"Retry-After": "0"},
+                      json={"message": "You have exceeded a secondary rate limit"})
+        responses.add(responses.PUT, url, status=204)
+        client = GitHubClient("t", rate_limiter=RateLimiter(sleep=lambda s: None))
+        throttle = TokenBucket(rate_per_minute=60, sleep=lambda s: None)
+
+        results = follow_users("t", {"a"}, client=client, throttle=throttle)
+
+        assert results == [WriteResult("a", "follow", ok=True, status=204)]
+        assert throttle.rate == 0.5
+
+    @staticmethod
+    def test_dry_run_results():
+        """Test that dry-run returns a result per user without sending anything."""
+        results = follow_users("t", {"b", "a"}, dry_run=True)
+        assert results == [WriteResult("a", "follow", ok=True), WriteResult("b", "follow", ok=True)]
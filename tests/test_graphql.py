@@ -0,0 +1,136 @@
+import json
+import responses
+from scripts.client import GitHubClient
+from scripts.graphql import build_user_query, get_user_details, get_user_details_batch
+from scripts.spam import is_spam
+
+
+def make_node(login, name="Test User", bio="I write open source code", repos=10, followers=50):
+    return {
+        "login": login,
+        "databaseId": 42,
+        "name": name,
+        "bio": bio,
+        "createdAt": "2015-01-01T00:00:00Z",
+        "updatedAt": "2024-01-01T00:00:00Z",
+        "repositories": {"totalCount": repos},
+        "followers": {"totalCount": followers},
+    }
+
+
+class TestBuildUserQuery:
+    """Test cases for the aliased GraphQL query."""
+
+    @staticmethod
+    def test_one_alias_per_login():
+        """Test that each login gets its own aliased user field and variable."""
+        query, variables = build_user_query(["alice", "bob"])
+
+        assert "u0: user(login: $l0)" in query
+        assert "u1: user(login: $l1)" in query
+        assert "fragment SpamFields on User" in query
+        # Same count as REST public_repos, which excludes repositories the user only collaborates on
+        assert "repositories(privacy: PUBLIC, ownerAffiliations: OWNER)" in query
+        assert variables == {"l0": "alice", "l1": "bob"}
+
+    @staticmethod
+    def test_logins_are_not_interpolated():
+        """Test that logins only travel as variables."""
+        query, _ = build_user_query(['evil") { x }'])
+
+        assert "evil" not in query
+
+
+class TestGetUserDetailsBatch:
+    """Test cases for a single batched lookup."""
+
+    @responses.activate
+    def test_returns_rest_shaped_details(self):
+        """Test that nodes are converted into the REST /users/{username} shape."""
+        responses.add(
+            responses.POST,
+            "https://api.github.com/graphql",
+            json={"data": {"u0": make_node("alice")}},
+        )
+
+        details, missing = get_user_details_batch("dummy_token", ["alice"])
+
+        assert missing == {}
+        assert details["alice"] == {
+            "login": "alice",
+            "id": 42,
+            "name": "Test User",
+            "bio": "I write open source code",
+            "public_repos": 10,
+            "followers": 50,
+            "created_at": "2015-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+        }
+        assert is_spam(details["alice"]) == (False, [])
+
+    @responses.activate
+    def test_reports_missing_users_per_login(self):
+        """Test that renamed or deleted users are reported individually."""
+        responses.add(
+            responses.POST,
+            "https://api.github.com/graphql",
+            json={
+                "data": {"u0": make_node("alice"), "u1": None},
+                "errors": [{
+                    "type": "NOT_FOUND",
+                    "path": ["u1"],
+                    "message": "Could not resolve to a User with the login of 'gone'.",
+                }],
+            },
+        )
+
+        details, missing = get_user_details_batch("dummy_token", ["alice", "gone"])
+
+        assert list(details) == ["alice"]
+        assert missing == {"gone": "Could not resolve to a User with the login of 'gone'."}
+
+    @responses.activate
+    def test_uses_ghes_graphql_endpoint(self):
+        """Test that GHES API URLs map to their /api/graphql endpoint."""
+        responses.add(
+            responses.POST,
+            "https://ghe.example.com/api/graphql",
+            json={"data": {"u0": make_node("alice")}},
+        )
+        client = GitHubClient("dummy_token", api_url="https://ghe.example.com/api/v3")
+
+        details, _ = get_user_details_batch("dummy_token", ["alice"], client=client)
+
+        assert "alice" in details
+
+
+class TestGetUserDetails:
+    """Test cases for splitting logins into batches."""
+
+    @responses.activate
+    def test_splits_into_batches(self):
+        """Test that logins are sent batch_size at a time."""
+        def callback(request):
+            variables = json.loads(request.body)["variables"]
+            data = {f"u{key[1:]}": make_node(login) for key, login in variables.items()}
+            return 200, {}, json.dumps({"data": data})
+
+        responses.add_callback(responses.POST, "https://api.github.com/graphql", callback=callback)
+        logins = [f"user{i}" for i in range(250)]
+
+        details, missing = get_user_details("dummy_token", logins, batch_size=100)
+
+        assert len(responses.calls) == 3
+        assert set(details) == set(logins)
+        assert missing == {}
+
+    @responses.activate
+    def test_failed_batch_marks_its_logins_missing(self):
+        """Test that a failing query does not abort the other batches."""
+        responses.add(responses.POST, "https://api.github.com/graphql", json={"data": {"u0": make_node("a")}})
+        responses.add(responses.POST, "https://api.github.com/graphql", status=502)
+
+        details, missing = get_user_details("dummy_token", ["a", "b"], batch_size=1)
+
+        assert list(details) == ["a"]
+        assert list(missing) == ["b"]
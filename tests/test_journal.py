@@ -0,0 +1,61 @@
+from scripts.follow import WriteResult
+from scripts.journal import ActionJournal
+
+
+class TestActionJournal:
+    """Test cases for the crash-safe action journal."""
+
+    @staticmethod
+    def test_round_trip_and_pending(tmp_path):
+        """Test that completed writes are excluded from the pending actions."""
+        journal = ActionJournal(str(tmp_path / "journal.jsonl"))
+        journal.start({"a", "b"}, {"c"}, followers=["a", "b"], following=["c"], scanned_at=123.0)
+        journal.record(WriteResult("a", "follow", ok=True, status=204))
+        journal.record(WriteResult("c", "unfollow", ok=False, status=500, error="boom"))
+        journal.close()
+
+        state = ActionJournal(str(tmp_path / "journal.jsonl")).load()
+        assert not state.finished
+        assert state.plan["scanned_at"] == 123.0
+        assert state.pending("follow") == {"b"}
+        # Failed writes are retried on resume
+        assert state.pending("unfollow") == {"c"}
+
+    @staticmethod
+    def test_ignores_torn_last_line(tmp_path):
+        """Test that a line cut off by a crash does not make the journal unreadable."""
+        path = tmp_path / "journal.jsonl"
+        journal = ActionJournal(str(path))
+        journal.start({"a", "b"}, set(), followers=[], following=[])
+        journal.record(WriteResult("a", "follow", ok=True, status=204))
+        journal.close()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"type": "result", "username": "b", "act')
+
+        assert ActionJournal(str(path)).load().pending("follow") == {"b"}
+
+    @staticmethod
+    def test_reopen_drops_torn_last_line(tmp_path):
+        """Test that the entry written after reopening a torn journal is not glued to the cut-off line."""
+        path = tmp_path / "journal.jsonl"
+        journal = ActionJournal(str(path))
+        journal.start({"a", "b"}, set(), followers=[], following=[])
+        journal.close()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"type": "result", "username": "a", "act')
+
+        journal.reopen()
+        journal.record(WriteResult("b", "follow", ok=True, status=204))
+        journal.close()
+
+        assert ActionJournal(str(path)).load().pending("follow") == {"a"}
+
+    @staticmethod
+    def test_finish_and_missing(tmp_path):
+        """Test the finished marker and a journal that does not exist."""
+        journal = ActionJournal(str(tmp_path / "journal.jsonl"))
+        assert journal.load() is None
+
+        journal.start(set(), set(), followers=[], following=[])
+        journal.finish()
+        assert journal.load().finished
@@ -1,14 +1,23 @@
+import json
 import pytest
+import responses
 import os
 import sys
-from unittest.mock import patch
-from scripts.main import main
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import ANY, patch
+from scripts.follow import WriteResult
+from scripts.journal import ActionJournal
+from scripts.main import SyncResult, UserDetailFetcher, filter_spam_users, main
+from scripts.store import StateStore
+from scripts.verdicts import VerdictStore
 
 
 def test_main_normal_execution():
     """Test normal execution of main function."""
-    with patch('scripts.main.get_followers') as mock_get_followers, \
-         patch('scripts.main.get_following') as mock_get_following, \
+    with patch('scripts.main.iter_followers') as mock_get_followers, \
+         patch('scripts.main.iter_following') as mock_get_following, \
          patch('scripts.main.follow_users') as mock_follow, \
          patch('scripts.main.unfollow_users') as mock_unfollow, \
          patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
@@ -31,18 +40,24 @@ def test_main_normal_execution():
         main()
 
         # Verify API calls were made
-        mock_get_followers.assert_called_once_with('test_token')
-        mock_get_following.assert_called_once_with('test_token')
+        mock_get_followers.assert_called_once_with('test_token', client=ANY, max_workers=1)
+        mock_get_following.assert_called_once_with('test_token', client=ANY, max_workers=1)
 
         # Verify follow/unfollow calls with expected sets
-        mock_follow.assert_called_once_with('test_token', {'follower1', 'follower2'}, dry_run=False)
-        mock_unfollow.assert_called_once_with('test_token', {'not_following_back'}, dry_run=False)
+        mock_follow.assert_called_once_with(
+            'test_token', {'follower1', 'follower2'},
+            dry_run=False, client=ANY, max_workers=4, throttle=ANY, on_result=None,
+        )
+        mock_unfollow.assert_called_once_with(
+            'test_token', {'not_following_back'},
+            dry_run=False, client=ANY, max_workers=4, throttle=ANY, on_result=None,
+        )
 
 
 def test_main_dry_run_execution():
     """Test main function with dry-run flag."""
-    with patch('scripts.main.get_followers') as mock_get_followers, \
-         patch('scripts.main.get_following') as mock_get_following, \
+    with patch('scripts.main.iter_followers') as mock_get_followers, \
+         patch('scripts.main.iter_following') as mock_get_following, \
          patch('scripts.main.follow_users') as mock_follow, \
          patch('scripts.main.unfollow_users') as mock_unfollow, \
          patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
@@ -58,8 +73,12 @@ def test_main_dry_run_execution():
         main()
 
         # Verify dry_run=True was passed
-        mock_follow.assert_called_once_with('test_token', {'follower1'}, dry_run=True)
-        mock_unfollow.assert_called_once_with('test_token', {'following1'}, dry_run=True)
+        mock_follow.assert_called_once_with(
+            'test_token', {'follower1'}, dry_run=True, client=ANY, max_workers=4, throttle=ANY, on_result=None,
+        )
+        mock_unfollow.assert_called_once_with(
+            'test_token', {'following1'}, dry_run=True, client=ANY, max_workers=4, throttle=ANY, on_result=None,
+        )
 
 
 def test_main_missing_token():
@@ -72,8 +91,8 @@ def test_main_missing_token():
 
 def test_main_no_changes_needed():
     """Test main function when no follow/unfollow actions are needed."""
-    with patch('scripts.main.get_followers') as mock_get_followers, \
-         patch('scripts.main.get_following') as mock_get_following, \
+    with patch('scripts.main.iter_followers') as mock_get_followers, \
+         patch('scripts.main.iter_following') as mock_get_following, \
          patch('scripts.main.follow_users') as mock_follow, \
          patch('scripts.main.unfollow_users') as mock_unfollow, \
          patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
@@ -91,14 +110,18 @@ def test_main_no_changes_needed():
         main()
 
         # Should call functions with empty sets
-        mock_follow.assert_called_once_with('test_token', set(), dry_run=False)
-        mock_unfollow.assert_called_once_with('test_token', set(), dry_run=False)
+        mock_follow.assert_called_once_with(
+            'test_token', set(), dry_run=False, client=ANY, max_workers=4, throttle=ANY, on_result=None,
+        )
+        mock_unfollow.assert_called_once_with(
+            'test_token', set(), dry_run=False, client=ANY, max_workers=4, throttle=ANY, on_result=None,
+        )
 
 
 def test_main_empty_lists():
     """Test main function with empty followers and following lists."""
-    with patch('scripts.main.get_followers') as mock_get_followers, \
-         patch('scripts.main.get_following') as mock_get_following, \
+    with patch('scripts.main.iter_followers') as mock_get_followers, \
+         patch('scripts.main.iter_following') as mock_get_following, \
          patch('scripts.main.follow_users') as mock_follow, \
          patch('scripts.main.unfollow_users') as mock_unfollow, \
          patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
@@ -110,13 +133,17 @@ def test_main_empty_lists():
         main()
 
         # Should call functions with empty sets
-        mock_follow.assert_called_once_with('test_token', set(), dry_run=False)
-        mock_unfollow.assert_called_once_with('test_token', set(), dry_run=False)
+        mock_follow.assert_called_once_with(
+            'test_token', set(), dry_run=False, client=ANY, max_workers=4, throttle=ANY, on_result=None,
+        )
+        mock_unfollow.assert_called_once_with(
+            'test_token', set(), dry_run=False, client=ANY, max_workers=4, throttle=ANY, on_result=None,
+        )
 
 
 def test_main_api_error_handling():
     """Test main function when API calls raise exceptions."""
-    with patch('scripts.main.get_followers') as mock_get_followers, \
+    with patch('scripts.main.iter_followers') as mock_get_followers, \
          patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
          patch.object(sys, 'argv', ['main.py']):
 
@@ -128,8 +155,8 @@ def test_main_api_error_handling():
 
 def test_main_with_large_user_lists():
     """Test main function with large user lists to ensure performance."""
-    with patch('scripts.main.get_followers') as mock_get_followers, \
-         patch('scripts.main.get_following') as mock_get_following, \
+    with patch('scripts.main.iter_followers') as mock_get_followers, \
+         patch('scripts.main.iter_following') as mock_get_following, \
          patch('scripts.main.follow_users') as mock_follow, \
          patch('scripts.main.unfollow_users') as mock_unfollow, \
          patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
@@ -153,8 +180,8 @@ def test_main_with_large_user_lists():
 
 def test_main_token_from_environment():
     """Test that main function correctly reads token from environment."""
-    with patch('scripts.main.get_followers') as mock_get_followers, \
-         patch('scripts.main.get_following') as mock_get_following, \
+    with patch('scripts.main.iter_followers') as mock_get_followers, \
+         patch('scripts.main.iter_following') as mock_get_following, \
          patch('scripts.main.follow_users'), \
          patch('scripts.main.unfollow_users'), \
          patch.dict(os.environ, {'GH_TOKEN': 'custom_test_token_123'}), \
@@ -166,5 +193,360 @@ def test_main_token_from_environment():
         main()
 
         # Verify the correct token was used
-        mock_get_followers.assert_called_once_with('custom_test_token_123')
-        mock_get_following.assert_called_once_with('custom_test_token_123')
+        mock_get_followers.assert_called_once_with('custom_test_token_123', client=ANY, max_workers=1)
+        mock_get_following.assert_called_once_with('custom_test_token_123', client=ANY, max_workers=1)
+
+
+def test_filter_spam_users_concurrent_matches_sequential():
+    """Test that concurrent fetching gives the same outputs as sequential fetching."""
+    details = {
+        "clean_user": {"login": "clean_user", "name": "Clean", "bio": "Dev", "public_repos": 5, "followers": 10},
+        "spam_user": {"login": "spam_user", "name": None, "bio": None, "public_repos": 0, "followers": 0},
+    }
+
+    def fake_detail(token, username, client=None):
+        if username == "broken_user":
+            raise Exception("boom")
+        return details[username]
+
+    usernames = {"clean_user", "spam_user", "broken_user"}
+    with patch('scripts.main.get_user_detail', side_effect=fake_detail):
+        sequential = filter_spam_users('test_token', usernames)
+        concurrent = filter_spam_users('test_token', usernames, max_workers=4)
+
+    assert sequential == concurrent
+    clean, spam_list = concurrent
+    # Fetch errors are treated as clean
+    assert clean == {"clean_user", "broken_user"}
+    assert [u for u, _ in spam_list] == ["spam_user"]
+
+
+@pytest.mark.parametrize("count", [3, 300])
+def test_filter_spam_users_skips_malformed_profiles_as_clean(count, capfd):
+    """Test that a profile the rules cannot score is skipped instead of failing the batch."""
+    details = {f"user{i}": {"login": f"user{i}", "name": None, "bio": None, "public_repos": 0} for i in range(count)}
+    details["user1"] = dict(details["user1"], followers="many")
+    details["user2"] = dict(details["user2"], created_at="yesterday")
+
+    with patch('scripts.main.get_user_detail', side_effect=lambda token, username, client=None: details[username]):
+        clean, spam_list = filter_spam_users('test_token', list(details))
+
+    assert clean == {"user1", "user2"}
+    assert len(spam_list) == count - 2
+    assert "Could not check user1" in capfd.readouterr().out
+
+
+def test_user_detail_fetcher_shares_in_flight_fetch():
+    """Test that concurrent fetches of the same login send one request."""
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_detail(token, username, client=None):
+        calls.append(username)
+        started.set()
+        release.wait(timeout=5)
+        return {"login": username}
+
+    with patch('scripts.main.get_user_detail', side_effect=slow_detail):
+        fetcher = UserDetailFetcher('test_token')
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(fetcher.fetch, "same_user")
+            started.wait(timeout=5)
+            others = [executor.submit(fetcher.fetch, "same_user") for _ in range(3)]
+            time.sleep(0.05)
+            release.set()
+            results = [first.result()] + [f.result() for f in others]
+
+    assert calls == ["same_user"]
+    assert all(r == {"login": "same_user"} for r in results)
+
+
+def test_main_with_state_dir_saves_response_cache(tmp_path, capfd):
+    """Test that --state-dir persists the response cache and reports it."""
+    with patch('scripts.main.iter_followers') as mock_get_followers, \
+         patch('scripts.main.iter_following') as mock_get_following, \
+         patch('scripts.main.follow_users'), \
+         patch('scripts.main.unfollow_users'), \
+         patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
+         patch.object(sys, 'argv', ['main.py', '--state-dir', str(tmp_path)]):
+
+        mock_get_followers.return_value = []
+        mock_get_following.return_value = []
+
+        main()
+
+    assert (tmp_path / "http-cache.json").exists()
+    out, _ = capfd.readouterr()
+    assert "Response cache:" in out
+
+
+@pytest.mark.parametrize("threshold, kept", [(5, False), (8, True)])
+def test_main_keeps_age_index_only_when_ids_can_settle_verdicts(tmp_path, capfd, threshold, kept):
+    """Test that the age index is built and saved only when the id pre-screen can use it."""
+    with patch('scripts.main.iter_followers', return_value=[]), \
+         patch('scripts.main.iter_following', return_value=[]), \
+         patch('scripts.main.SPAM_THRESHOLD', threshold), \
+         patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
+         patch.object(sys, 'argv', ['main.py', '--state-dir', str(tmp_path)]):
+        main()
+
+    assert (tmp_path / "age-index.json").exists() is kept
+    assert ("Age index:" in capfd.readouterr().out) is kept
+
+
+def test_filter_spam_users_graphql_backend():
+    """Test that the GraphQL backend keeps the outputs and the errors-are-clean rule."""
+    details = {
+        "clean_user": {"login": "clean_user", "name": "Clean", "bio": "Dev", "public_repos": 5, "followers": 10},
+        "spam_user": {"login": "spam_user", "name": None, "bio": None, "public_repos": 0, "followers": 0},
+    }
+    missing = {"renamed_user": "user not found (renamed or deleted)"}
+
+    with patch('scripts.main.get_user_details', return_value=(details, missing)) as mock_batch:
+        clean, spam_list = filter_spam_users(
+            'test_token', {"clean_user", "spam_user", "renamed_user"}, backend="graphql"
+        )
+
+    mock_batch.assert_called_once()
+    assert clean == {"clean_user", "renamed_user"}
+    assert [u for u, _ in spam_list] == ["spam_user"]
+
+
+def test_main_saves_snapshot_with_predicted_following(tmp_path):
+    """Test that the snapshot reflects the successful follows and unfollows of the run."""
+    followed = [
+        WriteResult("new_a", "follow", ok=True, status=204), WriteResult("new_b", "follow", ok=True, status=204),
+    ]
+    unfollowed = [WriteResult("gone", "unfollow", ok=True, status=204)]
+    with patch('scripts.main.iter_followers') as mock_get_followers, \
+         patch('scripts.main.iter_following') as mock_get_following, \
+         patch('scripts.main.follow_users', return_value=followed), \
+         patch('scripts.main.unfollow_users', return_value=unfollowed), \
+         patch('scripts.main.get_user_detail', side_effect=Exception("offline")), \
+         patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
+         patch.object(sys, 'argv', ['main.py', '--state-dir', str(tmp_path)]):
+
+        mock_get_followers.return_value = [{"login": "new_b"}, {"login": "new_a"}, {"login": "mutual"}]
+        mock_get_following.return_value = [{"login": "mutual"}, {"login": "gone"}]
+
+        main()
+
+    snapshot = json.loads((tmp_path / "snapshot.json").read_text())
+    assert snapshot["followers"] == ["new_b", "new_a", "mutual"]
+    assert snapshot["following"] == ["new_b", "new_a", "mutual"]
+
+
+def test_main_sqlite_backend_keeps_state_in_one_database(tmp_path):
+    """Test that --state-backend sqlite stores the lists, verdicts, profiles and actions in state.db."""
+    followed = [
+        WriteResult("new_a", "follow", ok=True, status=204), WriteResult("new_b", "follow", ok=True, status=204),
+    ]
+    unfollowed = [WriteResult("gone", "unfollow", ok=True, status=204)]
+    clean = {"name": "Jane", "bio": "Writes code", "public_repos": 3, "followers": 9, "updated_at": "u1"}
+
+    def get_user_detail(token, login, client=None):
+        return dict(clean, login=login)
+
+    with patch('scripts.main.iter_followers') as mock_get_followers, \
+         patch('scripts.main.iter_following') as mock_get_following, \
+         patch('scripts.main.follow_users', return_value=followed), \
+         patch('scripts.main.unfollow_users', return_value=unfollowed), \
+         patch('scripts.main.get_user_detail', side_effect=get_user_detail), \
+         patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
+         patch.object(sys, 'argv', ['main.py', '--state-dir', str(tmp_path), '--state-backend', 'sqlite']):
+
+        mock_get_followers.return_value = [
+            {"login": "new_b", "id": 5}, {"login": "new_a", "id": 4}, {"login": "mutual", "id": 1},
+        ]
+        mock_get_following.return_value = [{"login": "mutual", "id": 1}, {"login": "gone", "id": 2}]
+
+        main()
+
+    assert not (tmp_path / "snapshot.json").exists()
+    assert not (tmp_path / "verdicts.json").exists()
+    with StateStore(str(tmp_path / "state.db")) as db:
+        assert db.logins("following") == ["new_b", "new_a", "mutual"]
+        assert db.diff()[0] == {}
+        assert db.get_profiles(["mutual"])["mutual"]["bio"] == "Writes code"
+        assert db.history("gone") == [(ANY, "unfollow", True)]
+        assert VerdictStore(db=db).get("new_a") == (False, [])
+
+
+def test_filter_spam_users_scores_recent_stored_profiles_without_a_fetch(tmp_path, capfd):
+    """Test that profiles in the SQLite store from the last day are scored again instead of fetched."""
+    clean_detail = {"login": "new", "name": "A", "bio": "B", "public_repos": 5, "followers": 10}
+    with StateStore(str(tmp_path / "state.db")) as db:
+        db.put_profiles([{"login": "stored", "name": None, "bio": None, "public_repos": 0, "followers": 0}])
+        with patch('scripts.main.get_user_detail', return_value=clean_detail) as mock:
+            clean, spam_list = filter_spam_users('test_token', ["stored", "new"], db=db)
+
+        mock.assert_called_once_with('test_token', "new", client=None)
+        assert clean == {"new"}
+        assert [u for u, _ in spam_list] == ["stored"]
+        assert "Reusing 1 profiles stored in the last day" in capfd.readouterr().out
+
+
+def test_filter_spam_users_reuses_cached_verdicts():
+    """Test that cached verdicts skip the detail fetch entirely."""
+    store = VerdictStore()
+    spam_detail = {"login": "spam_user", "name": None, "bio": None, "public_repos": 0, "followers": 0}
+
+    with patch('scripts.main.get_user_detail', return_value=spam_detail) as mock_detail:
+        first = filter_spam_users('test_token', {"spam_user"}, verdicts=store)
+        second = filter_spam_users('test_token', {"spam_user"}, verdicts=store)
+
+    assert mock_detail.call_count == 1
+    assert first == second
+    assert second[1][0][0] == "spam_user"
+
+
+def test_main_writes_metrics(tmp_path):
+    """Test that --metrics-json and --metrics-prom export the phases of the run."""
+    json_path = tmp_path / "metrics.json"
+    prom_path = tmp_path / "metrics.prom"
+    with patch('scripts.main.iter_followers') as mock_get_followers, \
+         patch('scripts.main.iter_following') as mock_get_following, \
+         patch('scripts.main.follow_users'), \
+         patch('scripts.main.unfollow_users'), \
+         patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
+         patch.object(sys, 'argv', ['main.py', '--metrics-json', str(json_path), '--metrics-prom', str(prom_path)]):
+
+        mock_get_followers.return_value = []
+        mock_get_following.return_value = []
+
+        main()
+
+    phases = json.loads(json_path.read_text())["phases"]
+    assert {"fetch_followers", "fetch_following", "spam_check_mutual", "follow", "unfollow"} <= phases.keys()
+    assert 'follow_sync_phase_duration_seconds{phase="follow"}' in prom_path.read_text()
+
+
+@responses.activate
+def test_main_resume_replays_only_unfinished_actions(tmp_path):
+    """Test that --resume sends only the writes the interrupted run did not complete."""
+    journal = ActionJournal(str(tmp_path / "journal.jsonl"))
+    journal.start({"new_a", "new_b"}, {"gone"}, followers=["new_b", "new_a"], following=["gone"], scanned_at=1.0)
+    journal.record(WriteResult("new_a", "follow", ok=True, status=204))
+    journal.close()
+    responses.add(responses.PUT, "https://api.github.com/user/following/new_b", status=204)
+    responses.add(responses.DELETE, "https://api.github.com/user/following/gone", status=204)
+
+    with patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
+         patch.object(sys, 'argv', ['main.py', '--state-dir', str(tmp_path), '--resume']):
+        main()
+
+    assert [(c.request.method, c.request.url.rsplit("/", 1)[1]) for c in responses.calls] == [
+        ("PUT", "new_b"), ("DELETE", "gone"),
+    ]
+    assert journal.load().finished
+    snapshot = json.loads((tmp_path / "snapshot.json").read_text())
+    assert snapshot["following"] == ["new_b", "new_a"]
+    assert snapshot["scanned_at"] == 1.0
+
+
+def test_main_resume_without_journal(tmp_path, capfd):
+    """Test that --resume with nothing to resume does no work."""
+    with patch('scripts.main.sync') as mock_sync, \
+         patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
+         patch.object(sys, 'argv', ['main.py', '--state-dir', str(tmp_path), '--resume']):
+        main()
+
+    mock_sync.assert_not_called()
+    out, _ = capfd.readouterr()
+    assert "No unfinished run to resume" in out
+
+
+@responses.activate
+def test_main_syncs_several_accounts_sharing_profile_lookups(tmp_path):
+    """Test that GH_TOKENS syncs every account and scores a login shared by them only once."""
+    from responses import matchers
+
+    accounts = {"tok_a": "alice", "tok_b": "bob"}
+    for token, login in accounts.items():
+        auth = matchers.header_matcher({"Authorization": f"token {token}"})
+        responses.add(responses.GET, "https://api.github.com/user", json={"login": login}, match=[auth])
+        responses.add(responses.GET, "https://api.github.com/user/followers",
+                      json=[{"login": "shared", "id": 7}], match=[auth])
+        responses.add(responses.GET, "https://api.github.com/user/following", json=[], match=[auth])
+        responses.add(responses.PUT, "https://api.github.com/user/following/shared", status=204, match=[auth])
+    responses.add(responses.GET, "https://api.github.com/users/shared", json={
+        "login": "shared", "name": "Shared", "bio": "Dev", "public_repos": 5, "followers": 10,
+        "created_at": "2015-01-01T00:00:00Z", "updated_at": "2015-01-01T00:00:00Z",
+    })
+
+    with patch.dict(os.environ, {'GH_TOKENS': 'tok_a, tok_b'}, clear=True), \
+         patch.object(sys, 'argv', ['main.py', '--state-dir', str(tmp_path), '--account-workers', '1',
+                                    '--metrics-json', str(tmp_path / 'metrics.json')]):
+        main()
+
+    calls = [(c.request.method, c.request.url.split("?")[0]) for c in responses.calls]
+    assert calls.count(("GET", "https://api.github.com/users/shared")) == 1
+    assert calls.count(("PUT", "https://api.github.com/user/following/shared")) == 2
+    assert (tmp_path / "alice" / "snapshot.json").exists()
+    assert (tmp_path / "bob" / "snapshot.json").exists()
+    assert (tmp_path / "verdicts.json").exists()
+    assert json.loads((tmp_path / "metrics-bob.json").read_text())["labels"] == {"account": "bob"}
+
+
+def test_main_reports_failed_accounts():
+    """Test that one failing account does not stop the others but fails the run."""
+    def fake_sync(token, client, **kwargs):
+        if token == "tok_b":
+            raise RuntimeError("boom")
+        return SyncResult([], [], [])
+
+    with patch('scripts.main.sync', side_effect=fake_sync), \
+         patch('scripts.main.get_authenticated_user', side_effect=lambda token, client: {"login": token}), \
+         patch.dict(os.environ, {'GH_TOKENS': 'tok_a,tok_b'}, clear=True), \
+         patch.object(sys, 'argv', ['main.py']), \
+         pytest.raises(RuntimeError, match="1 of 2 accounts failed"):
+        main()
+
+
+def test_main_rejects_daemon_with_several_accounts():
+    """Test that --daemon is refused when GH_TOKENS lists more than one account."""
+    with patch('scripts.main.run_account') as mock_run, \
+         patch.dict(os.environ, {'GH_TOKENS': 'tok_a,tok_b'}, clear=True), \
+         patch.object(sys, 'argv', ['main.py', '--daemon']), \
+         pytest.raises(SystemExit):
+        main()
+
+    mock_run.assert_not_called()
+
+
+def test_main_rejects_mutual_budget_without_state_dir():
+    """Test that --mutual-budget, which needs the verdict history, is refused without --state-dir."""
+    with patch('scripts.main.run_account') as mock_run, \
+         patch.dict(os.environ, {'GH_TOKEN': 'test_token'}), \
+         patch.object(sys, 'argv', ['main.py', '--mutual-budget', '100']), \
+         pytest.raises(SystemExit):
+        main()
+
+    mock_run.assert_not_called()
+
+
+def test_filter_spam_users_prescreen_skips_settled_fetches(capfd):
+    """Test that users whose list payload bounds settle the verdict are not fetched."""
+    # With the default rules nothing can be settled from a list item; a higher
+    # threshold makes the upper bound of an old account (7) fall short of it
+    with patch('scripts.main.SPAM_THRESHOLD', 8), \
+         patch('scripts.main.get_user_detail', return_value={"login": "unknown_id"}) as mock_detail:
+        clean, spam_list = filter_spam_users(
+            'test_token', ["old_user", "unknown_id"], user_ids={"old_user": 1000, "unknown_id": None},
+        )
+
+    mock_detail.assert_called_once_with('test_token', "unknown_id", client=None)
+    assert "old_user" in clean and spam_list == []
+    out, _ = capfd.readouterr()
+    assert "Pre-screening settled 1 of 2 profiles without a fetch" in out
+
+
+def test_filter_spam_users_skips_prescreen_that_cannot_settle(capfd):
+    """Test that with the default rules, where ids settle nothing, no bounds are computed or reported."""
+    with patch('scripts.main.score_bounds') as mock_bounds, \
+         patch('scripts.main.get_user_detail', return_value={"login": "old_user", "name": "A", "bio": "B"}):
+        filter_spam_users('test_token', ["old_user"], user_ids={"old_user": 1000})
+
+    mock_bounds.assert_not_called()
+    assert "Pre-screening" not in capfd.readouterr().out
@@ -0,0 +1,122 @@
+import json
+
+import responses
+from scripts.client import GitHubClient
+from scripts.metrics import RunMetrics, endpoint_for
+from scripts.ratelimit import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRunMetrics:
+    """Test cases for run metrics collection and export."""
+
+    @staticmethod
+    def test_endpoint_for_collapses_logins():
+        """Test that per-user paths are templated and query strings dropped."""
+        assert endpoint_for("https://api.github.com/users/octocat") == "/users/{login}"
+        assert endpoint_for("https://api.github.com/user/following/octocat") == "/user/following/{login}"
+        assert endpoint_for("https://api.github.com/user/followers?per_page=100&page=3") == "/user/followers"
+        assert endpoint_for("https://ghe.example.com/api/v3/users/a") == "/api/v3/users/{login}"
+
+    @staticmethod
+    def test_phase_timings_accumulate():
+        """Test that phases are timed with the injected clock."""
+        clock = FakeClock()
+        metrics = RunMetrics(clock=clock)
+        with metrics.phase("fetch_followers"):
+            clock.now += 2.5
+        with metrics.phase("fetch_followers"):
+            clock.now += 0.5
+
+        assert metrics.as_dict()["phases"]["fetch_followers"]["seconds"] == 3.0
+
+    @staticmethod
+    @responses.activate
+    def test_client_records_requests_per_phase():
+        """Test that requests, statuses and rate-limit usage are attributed to the active phase."""
+        headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4990", "X-RateLimit-Resource": "core"}
+        responses.add(responses.GET, "https://api.github.com/users/a", json={}, headers=headers)
+        responses.add(responses.GET, "https://api.github.com/users/b", status=404, headers=headers)
+        metrics = RunMetrics()
+        client = GitHubClient("t", metrics=metrics)
+
+        with metrics.phase("spam_check"):
+            client.get(client.url("/users/a"))
+            client.get(client.url("/users/b"))
+
+        data = metrics.as_dict()
+        assert data["phases"]["spam_check"]["requests"] == 2
+        assert {"endpoint": "/users/{login}", "method": "GET", "status": 404, "count": 1} in data["requests"]
+        assert data["rate_limits"]["core"] == {"used": 2, "limit": 5000, "remaining": 4990}
+
+    @staticmethod
+    @responses.activate
+    def test_client_records_retries():
+        """Test that rate-limited attempts are counted as retries."""
+        responses.add(responses.GET, "https://api.github.com/user", status=429, headers={"Retry-After": "0"})
+        responses.add(responses.GET, "https://api.github.com/user", json={})
+        metrics = RunMetrics()
+        client = GitHubClient("t", metrics=metrics, rate_limiter=RateLimiter(sleep=lambda s: None))
+
+        client.get(client.url("/user"))
+
+        data = metrics.as_dict()
+        assert data["requests_total"] == 2
+        assert data["retries"] == [{"endpoint": "/user", "method": "GET", "count": 1}]
+
+    @staticmethod
+    def test_not_modified_is_free():
+        """Test that 304 answers do not count against the rate-limit budget."""
+
+        class Resp:
+            status_code = 304
+            headers = {}
+
+        metrics = RunMetrics()
+        metrics.record_request("GET", "https://api.github.com/user", Resp())
+        assert metrics.as_dict()["rate_limits"]["core"]["used"] == 0
+
+    @staticmethod
+    def test_malformed_rate_limit_headers_are_skipped():
+        """Test that unparsable rate-limit headers are ignored instead of raising."""
+
+        class Resp:
+            status_code = 200
+            headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "n/a"}
+
+        metrics = RunMetrics()
+        metrics.record_request("GET", "https://api.github.com/user", Resp())
+        assert metrics.as_dict()["rate_limits"]["core"] == {"used": 1, "limit": None, "remaining": None}
+
+    @staticmethod
+    def test_prometheus_label_values_are_escaped():
+        """Test that backslashes, quotes and newlines in label values are escaped."""
+        metrics = RunMetrics(labels={"account": 'a\\b"c\nd'})
+        metrics.record_cache("http", 1, 0)
+
+        assert 'follow_sync_cache_hits{account="a\\\\b\\"c\\nd",cache="http"} 1' in metrics.to_prometheus()
+
+    @staticmethod
+    def test_writes_json_and_prometheus(tmp_path):
+        """Test both export formats."""
+        metrics = RunMetrics()
+        with metrics.phase("follow"):
+            pass
+        metrics.record_cache("http", 3, 1)
+
+        metrics.write_json(str(tmp_path / "metrics.json"))
+        metrics.write_prometheus(str(tmp_path / "metrics.prom"))
+
+        data = json.loads((tmp_path / "metrics.json").read_text())
+        assert data["caches"]["http"] == {"hits": 3, "misses": 1}
+        prom = (tmp_path / "metrics.prom").read_text()
+        assert '# TYPE follow_sync_phase_duration_seconds gauge' in prom
+        assert 'follow_sync_phase_requests{phase="follow"} 0' in prom
+        assert 'follow_sync_cache_hits{cache="http"} 3' in prom
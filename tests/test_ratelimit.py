@@ -0,0 +1,265 @@
+import responses
+from scripts.client import GitHubClient
+from scripts.ratelimit import RateLimiter, TokenBucket, resource_for
+
+
+class FakeClock:
+    """Clock whose sleep() just advances time."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None, text=""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+
+
+def rate_headers(remaining, reset, limit=5000, resource="core"):
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(reset)),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+def make_limiter(clock, **kwargs):
+    return RateLimiter(sleep=clock.sleep, clock=clock.time, **kwargs)
+
+
+class TestResourceFor:
+    @staticmethod
+    def test_resources():
+        assert resource_for("https://api.github.com/users/a") == "core"
+        assert resource_for("https://api.github.com/graphql") == "graphql"
+        assert resource_for("https://api.github.com/search/users?q=a") == "search"
+
+
+class TestRateLimiter:
+    """Test cases for the rate-limit scheduler."""
+
+    @staticmethod
+    def test_no_wait_without_budget_information():
+        """Test that requests go out immediately before any headers are seen."""
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+
+        limiter.wait("core")
+
+        assert clock.sleeps == []
+
+    @staticmethod
+    def test_tracks_budget_from_headers():
+        """Test that the budget is read from the X-RateLimit-* headers."""
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+
+        limiter.update(FakeResponse(headers=rate_headers(4321, clock.now + 600)))
+
+        assert limiter.budget("core")["remaining"] == 4321
+        assert limiter.budget("graphql") is None
+
+    @staticmethod
+    def test_sleeps_until_reset_when_exhausted():
+        """Test that an exhausted budget sleeps until the window resets."""
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+        reset = clock.now + 600
+        limiter.update(FakeResponse(headers=rate_headers(0, reset)))
+
+        limiter.wait("core")
+
+        assert clock.now == reset + 1
+        assert limiter.budget("core")["remaining"] == 4999
+
+    @staticmethod
+    def test_paces_requests_when_budget_is_low():
+        """Test that a low budget is spread over the rest of the window."""
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+        limiter.update(FakeResponse(headers=rate_headers(10, clock.now + 100)))
+
+        for _ in range(3):
+            limiter.wait("core")
+
+        # 100s left for 10 requests: roughly one request every 10s
+        assert len(clock.sleeps) == 2
+        assert all(9 <= s <= 12 for s in clock.sleeps)
+
+    @staticmethod
+    def test_no_pacing_with_healthy_budget():
+        """Test that a healthy budget is not throttled."""
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+        limiter.update(FakeResponse(headers=rate_headers(4000, clock.now + 100)))
+
+        for _ in range(10):
+            limiter.wait("core")
+
+        assert clock.sleeps == []
+
+    @staticmethod
+    def test_resources_are_tracked_separately():
+        """Test that an exhausted GraphQL budget does not hold back REST calls."""
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+        limiter.update(FakeResponse(headers=rate_headers(0, clock.now + 600, resource="graphql")))
+
+        limiter.wait("core")
+
+        assert clock.sleeps == []
+
+    @staticmethod
+    def test_free_304s_cause_no_pacing():
+        """Test that a flat header (304s cost nothing) is trusted over the local count."""
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+        reset = clock.now + 3600
+
+        for _ in range(4995):
+            seq = limiter.wait("core")
+            limiter.update(FakeResponse(304, rate_headers(4990, reset)), "core", seq)
+
+        assert clock.sleeps == []
+        assert limiter.budget("core")["remaining"] == 4990
+
+    @staticmethod
+    def test_late_responses_only_lower_the_budget():
+        """Test that requests in flight are counted and an out-of-order response is not trusted."""
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+        reset = clock.now + 3600
+        first, second, third = (limiter.wait("core") for _ in range(3))
+
+        limiter.update(FakeResponse(headers=rate_headers(98, reset)), "core", second)
+        assert limiter.budget("core")["remaining"] == 97  # the third request is still in flight
+        limiter.update(FakeResponse(headers=rate_headers(99, reset)), "core", first)
+        assert limiter.budget("core")["remaining"] == 97
+        limiter.update(FakeResponse(headers=rate_headers(97, reset)), "core", third)
+        assert limiter.budget("core")["remaining"] == 97
+
+    @staticmethod
+    def test_is_rate_limited():
+        """Test detection of primary and secondary limit responses."""
+        assert RateLimiter.is_rate_limited(FakeResponse(429))
+        assert RateLimiter.is_rate_limited(FakeResponse(403, {"X-RateLimit-Remaining": "0"}))
+        assert RateLimiter.is_rate_limited(FakeResponse(403, {"Retry-After": "30"}))
+        assert RateLimiter.is_rate_limited(FakeResponse(403, text="You have exceeded a secondary rate limit"))
+        assert not RateLimiter.is_rate_limited(FakeResponse(403, text='{"message": "Forbidden"}'))
+        assert not RateLimiter.is_rate_limited(FakeResponse(404))
+
+    @staticmethod
+    def test_backoff_honours_retry_after():
+        """Test that Retry-After sets the wait and holds back all requests."""
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+
+        delay = limiter.backoff(FakeResponse(403, {"Retry-After": "30"}), attempt=0)
+        limiter.wait("core")
+
+        assert delay == 30
+        assert clock.sleeps == [30]
+
+    @staticmethod
+    def test_backoff_is_exponential_without_retry_after():
+        """Test exponential backoff for secondary limits without Retry-After."""
+        clock = FakeClock()
+        limiter = make_limiter(clock, secondary_backoff=10)
+        resp = FakeResponse(403, text="secondary rate limit")
+
+        assert limiter.backoff(resp, attempt=0) == 10
+        assert limiter.backoff(resp, attempt=2) == 40
+
+
+class TestClientRetries:
+    """Test cases for rate-limit retries in GitHubClient."""
+
+    @responses.activate
+    def test_retries_after_secondary_limit(self):
+        """Test that a secondary-limit 403 is retried instead of failing."""
+        url = "https://api.github.com/user/following/testuser"
+        responses.add(responses.PUT, url, status=403, headers={"Retry-After": "5"},
+                      json={"message": "You have exceeded a secondary rate limit"})
+        responses.add(responses.PUT, url, status=204)
+        clock = FakeClock()
+        client = GitHubClient("dummy_token", rate_limiter=make_limiter(clock))
+
+        resp = client.put(url)
+
+        assert resp.status_code == 204
+        assert len(responses.calls) == 2
+        assert clock.sleeps == [5]
+
+    @responses.activate
+    def test_gives_up_after_max_retries(self):
+        """Test that the last rate-limited response is returned after max_retries."""
+        url = "https://api.github.com/users/testuser"
+        responses.add(responses.GET, url, status=429, headers={"Retry-After": "1"})
+        clock = FakeClock()
+        client = GitHubClient("dummy_token", rate_limiter=make_limiter(clock, max_retries=2))
+
+        resp = client.get(url)
+
+        assert resp.status_code == 429
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_plain_forbidden_is_not_retried(self):
+        """Test that a 403 unrelated to rate limits is returned as is."""
+        url = "https://api.github.com/user/following/testuser"
+        responses.add(responses.PUT, url, status=403, json={"message": "Forbidden"})
+        client = GitHubClient("dummy_token", rate_limiter=make_limiter(FakeClock()))
+
+        resp = client.put(url)
+
+        assert resp.status_code == 403
+        assert len(responses.calls) == 1
+
+
+class TestTokenBucket:
+    """Test cases for the write throttle."""
+
+    @staticmethod
+    def test_burst_then_steady_rate():
+        """Test that the burst goes out at once and later calls are spaced by the rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate_per_minute=60, burst=3, sleep=clock.sleep, clock=clock.time)
+
+        for _ in range(5):
+            bucket.acquire()
+
+        assert clock.sleeps == [1.0, 1.0]
+
+    @staticmethod
+    def test_slow_down_halves_rate():
+        """Test that slow_down halves the rate and drops the saved-up burst."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate_per_minute=60, burst=10, sleep=clock.sleep, clock=clock.time)
+
+        bucket.slow_down()
+        bucket.acquire()
+
+        assert clock.sleeps == [2.0]
+
+    @staticmethod
+    def test_zero_rate_disables_cap():
+        """Test that a rate of 0 never sleeps."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate_per_minute=0, sleep=clock.sleep, clock=clock.time)
+
+        for _ in range(100):
+            bucket.acquire()
+        bucket.slow_down()
+
+        assert clock.sleeps == []
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+from scripts.rescan import select_rescans
+from scripts.verdicts import DAY, VerdictStore
+
+
+NOW = 1_700_000_000.0
+
+
+class FakeClock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def check(store, clock, login, score, days_ago, days_old=365):
+    """Record a verdict for login as if it had been made days_ago."""
+    created = datetime.fromtimestamp(NOW, timezone.utc) - timedelta(days=days_old)
+    user = {"login": login, "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"), "updated_at": None}
+    clock.now = NOW - days_ago * DAY
+    store.put(login, user, score, [])
+    clock.now = NOW
+
+
+class TestSelectRescans:
+    """Test cases for the budgeted, prioritized mutual re-scan."""
+
+    @staticmethod
+    def test_cost_stays_flat_as_the_list_grows():
+        """Test that only the budget is spent on expired or due verdicts, however many there are."""
+        for size in (100, 10_000):
+            clock = FakeClock()
+            store = VerdictStore(clock=clock)
+            for i in range(size):
+                check(store, clock, f"u{i}", score=0, days_ago=8 + i % 5)
+
+            selected, due = select_rescans([f"u{i}" for i in range(size)], store, budget=50, clock=clock)
+
+            assert len(selected) == 50
+
+    @staticmethod
+    def test_due_logins_take_the_budget_stalest_first_and_fresh_are_free():
+        """Test that due logins are capped at the budget, never-checked first, and fresh verdicts cost nothing."""
+        clock = FakeClock()
+        store = VerdictStore(clock=clock)
+        check(store, clock, "fresh", score=0, days_ago=1)
+        check(store, clock, "rotated_out", score=0, days_ago=20)
+        check(store, clock, "older", score=0, days_ago=30)
+        check(store, clock, "expired", score=0, days_ago=8)
+        logins = ["fresh", "rotated_out", "older", "expired", "never"]
+
+        assert select_rescans(logins, store, budget=1, clock=clock) == (["fresh", "never"], 3)
+        assert select_rescans(logins, store, budget=3, clock=clock) == (["fresh", "never", "older", "rotated_out"], 3)
+
+    @staticmethod
+    def test_logins_checked_together_fall_due_spread_out():
+        """Test that a whole list checked in one run does not fall due in one later run."""
+        clock = FakeClock()
+        store = VerdictStore(clock=clock)
+        logins = [f"u{i}" for i in range(1000)]
+        for login in logins:
+            check(store, clock, login, score=0, days_ago=0)
+
+        due_per_day = []
+        for day in range(1, 15):
+            clock.now = NOW + day * DAY
+            due_per_day.append(select_rescans(logins, store, budget=0, clock=clock)[1])
+
+        assert due_per_day[5] == 0 and due_per_day[-1] == 1000
+        # Between half and the whole rotation window roughly 1/7 more fall due each day
+        steps = [b - a for a, b in zip(due_per_day[6:], due_per_day[7:])]
+        assert all(steps) and max(steps) < 250
+
+    @staticmethod
+    def test_priority_prefers_close_scores_stale_and_young_accounts():
+        """Test the ordering of expired verdicts competing for the budget."""
+        clock = FakeClock()
+        store = VerdictStore(clock=clock)
+        check(store, clock, "safe", score=0, days_ago=8)
+        check(store, clock, "close", score=2, days_ago=8)
+        check(store, clock, "stale", score=0, days_ago=13)
+        check(store, clock, "young", score=0, days_ago=8, days_old=60)
+        logins = ["safe", "close", "stale", "young"]
+
+        assert select_rescans(logins, store, budget=1, clock=clock)[0] == ["young"]
+        assert set(select_rescans(logins, store, budget=3, clock=clock)[0]) == {"young", "stale", "close"}
+
+    @staticmethod
+    def test_without_history_everything_is_checked():
+        """Test that without a verdict store every login is due."""
+        selected, due = select_rescans(["a", "b"], None, budget=0)
+        assert selected == ["a", "b"] and due == 2
@@ -0,0 +1,104 @@
+import json
+from datetime import datetime, timedelta, timezone
+from itertools import product
+
+import pytest
+
+from scripts.rules import compile_rules, load_rules
+from scripts.spam import calculate_spam_score, is_spam, score_bounds
+from scripts.verdicts import VerdictStore
+from tests.test_spam import make_user
+
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def users():
+    """Every combination of the fields the rules look at."""
+    for name, bio, repos, followers, days_old in product(
+        ["", "Jane", "crypto king"], ["", "Writes code", "aB3kQz9mNpXrTy"], [0, 3], [0, 5], [5, 400]
+    ):
+        user = make_user(name=name, bio=bio, public_repos=repos, followers=followers)
+        user["created_at"] = (NOW - timedelta(days=days_old)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        yield user
+
+
+class TestCompileRules:
+    @staticmethod
+    def test_default_plan_matches_calculate_spam_score():
+        """Without a config the plan scores exactly like the built-in rules."""
+        plan = compile_rules()
+        assert plan.fingerprint is None
+        for user in users():
+            assert plan.score(user, NOW) == calculate_spam_score(user, NOW)
+
+    @staticmethod
+    def test_config_overrides_weights_threshold_and_patterns():
+        plan = compile_rules({
+            "threshold": 2,
+            "min_followers": 10,
+            "weights": {"no_bio": 0, "new_account": 1},
+            "patterns": [{"regex": r"\bhire me\b", "ignore_case": True}],
+        })
+        assert "no_bio" not in plan.weights
+        assert plan.fingerprint is not None
+        user = make_user(bio="", followers=5)
+        assert plan.score(user) == (1, ["very few followers"])
+        user = make_user(bio="HIRE ME please", followers=50)
+        assert plan.score(user) == (2, ["suspicious content in bio"])
+
+    @staticmethod
+    @pytest.mark.parametrize("data", [
+        {"treshold": 3},
+        {"weights": {"no_avatar": 1}},
+        {"patterns": [{"regex": "("}]},
+        {"weights": {"no_bio": -1}},
+        {"weights": {"no_bio": 1.5}},
+        {"weights": {"no_bio": True}},
+        {"threshold": 2.5},
+        {"threshold": "3"},
+    ])
+    def test_invalid_config_raises(data):
+        with pytest.raises(ValueError):
+            compile_rules(data)
+
+    @staticmethod
+    def test_load_rules_reads_toml_and_json(tmp_path):
+        toml_path = tmp_path / "rules.toml"
+        toml_path.write_text('threshold = 4\n\n[weights]\nno_repos = 3\n\n[[patterns]]\nregex = \'\\bnft\\b\'\n')
+        json_path = tmp_path / "rules.json"
+        json_path.write_text(
+            json.dumps({"threshold": 4, "weights": {"no_repos": 3}, "patterns": [{"regex": r"\bnft\b"}]})
+        )
+        from_toml, from_json = load_rules(str(toml_path)), load_rules(str(json_path))
+        assert from_toml.threshold == 4
+        assert from_toml.weights["no_repos"] == 3
+        assert from_toml.fingerprint == from_json.fingerprint
+
+
+class TestRulePlanProfiling:
+    @staticmethod
+    def test_stats_count_evaluations_and_hits():
+        plan = compile_rules(profile=True)
+        plan.score(make_user(name="", bio=""))
+        plan.score(make_user())
+        assert plan.stats["no_name"][:2] == [2, 1]
+        assert plan.stats["no_repos"][:2] == [2, 0]
+        assert all(stats[2] >= 0 for stats in plan.stats.values())
+        assert "no_name" in plan.report()
+
+
+class TestRulesIntegration:
+    @staticmethod
+    def test_spam_functions_accept_a_plan():
+        plan = compile_rules({"threshold": 10})
+        user = make_user(name="", bio="", public_repos=0, followers=0)
+        assert is_spam(user)[0] is True
+        assert is_spam(user, rules=plan)[0] is False
+        assert score_bounds({"login": "x"}, NOW, rules=plan).high == sum(plan.weights.values())
+
+    @staticmethod
+    def test_verdict_store_uses_the_plan_fingerprint():
+        assert VerdictStore(fingerprint=compile_rules().fingerprint).fingerprint == VerdictStore().fingerprint
+        custom = compile_rules({"threshold": 4})
+        assert VerdictStore(fingerprint=custom.fingerprint).fingerprint == custom.fingerprint
@@ -0,0 +1,105 @@
+import gzip
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from scripts import columnar
+from scripts.main import main
+from scripts.rules import compile_rules
+from scripts.score import score_file
+from scripts.spam import calculate_spam_score
+from tests.test_rules import NOW, users
+
+
+def write_dump(path, profiles, extra_lines=()):
+    with open(path, "w", encoding="utf-8") as f:
+        for profile in profiles:
+            f.write(json.dumps(profile) + "\n")
+        for line in extra_lines:
+            f.write(line + "\n")
+
+
+def read_jsonl(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestScoreFile:
+    @staticmethod
+    def test_verdicts_match_calculate_spam_score_in_input_order(tmp_path):
+        profiles = [dict(user, login=f"user{i}") for i, user in enumerate(users())]
+        write_dump(tmp_path / "profiles.jsonl", profiles)
+
+        summary = score_file(
+            str(tmp_path / "profiles.jsonl"), str(tmp_path / "out.jsonl"), chunk_size=7, now=NOW
+        )
+
+        verdicts = read_jsonl(tmp_path / "out.jsonl")
+        assert [v["login"] for v in verdicts] == [p["login"] for p in profiles]
+        for profile, verdict in zip(profiles, verdicts):
+            score, reasons = calculate_spam_score(profile, NOW)
+            assert (verdict["score"], verdict["reasons"], verdict["spam"]) == (score, reasons, score >= 3)
+        assert summary.scored == len(profiles)
+        assert summary.flagged == sum(v["spam"] for v in verdicts)
+        assert summary.hits["no_bio"] == sum("no bio" in v["reasons"] for v in verdicts)
+
+    @staticmethod
+    def test_process_pool_gives_the_same_output(tmp_path):
+        profiles = [dict(user, login=f"user{i}") for i, user in enumerate(users())]
+        write_dump(tmp_path / "profiles.jsonl", profiles)
+
+        single = score_file(str(tmp_path / "profiles.jsonl"), str(tmp_path / "one.jsonl"), chunk_size=5, now=NOW)
+        pooled = score_file(
+            str(tmp_path / "profiles.jsonl"), str(tmp_path / "pool.jsonl.gz"), workers=2, chunk_size=5, now=NOW
+        )
+
+        assert read_jsonl(tmp_path / "pool.jsonl.gz") == read_jsonl(tmp_path / "one.jsonl")
+        assert pooled == single
+
+    @staticmethod
+    def test_columnar_and_per_dict_paths_agree(tmp_path, monkeypatch):
+        pytest.importorskip("numpy")
+        profiles = [dict(user, login=f"user{i}") for i, user in enumerate(users())] * 5
+        write_dump(tmp_path / "profiles.jsonl", profiles, ["{not json"])
+
+        fast = score_file(str(tmp_path / "profiles.jsonl"), str(tmp_path / "fast.jsonl"), now=NOW)
+        monkeypatch.setattr(columnar, "np", None)
+        slow = score_file(str(tmp_path / "profiles.jsonl"), str(tmp_path / "slow.jsonl"), now=NOW)
+
+        assert read_jsonl(tmp_path / "fast.jsonl") == read_jsonl(tmp_path / "slow.jsonl")
+        assert fast == slow
+
+    @staticmethod
+    def test_bad_lines_are_reported_with_their_line_number(tmp_path):
+        write_dump(tmp_path / "profiles.jsonl", [{"login": "ok", "name": "A"}], ["", "{not json", "[1, 2]"])
+
+        summary = score_file(str(tmp_path / "profiles.jsonl"), str(tmp_path / "out.jsonl"), now=NOW)
+
+        verdicts = read_jsonl(tmp_path / "out.jsonl")
+        assert [v.get("line") for v in verdicts] == [None, 3, 4]
+        assert (summary.scored, summary.errors) == (1, 2)
+
+    @staticmethod
+    def test_custom_rules_and_report(tmp_path):
+        write_dump(tmp_path / "profiles.jsonl", [{"login": "a", "public_repos": 0, "followers": 9}])
+        rules = compile_rules({"threshold": 2, "weights": {"no_name": 0, "no_bio": 0}})
+
+        summary = score_file(str(tmp_path / "profiles.jsonl"), str(tmp_path / "out.jsonl"), rules=rules, now=NOW)
+
+        assert read_jsonl(tmp_path / "out.jsonl")[0]["spam"] is True
+        report = summary.report()
+        assert "1 flagged (100.0%)" in report
+        assert "no_repos" in report and "no_name" not in report
+
+
+def test_main_dispatches_the_score_subcommand(tmp_path, capsys):
+    write_dump(tmp_path / "profiles.jsonl", [{"login": "a"}])
+    argv = ["main.py", "score", str(tmp_path / "profiles.jsonl"), str(tmp_path / "out.jsonl"), "--workers", "1"]
+    with patch.object(sys, "argv", argv):
+        main()
+
+    assert read_jsonl(tmp_path / "out.jsonl")[0]["login"] == "a"
+    assert "Scored 1 profiles" in capsys.readouterr().out
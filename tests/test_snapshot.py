@@ -0,0 +1,144 @@
+import time
+import responses
+from scripts.snapshot import fetch_new_logins, load_snapshot, save_snapshot, sync_lists
+
+
+def add_user(followers, following):
+    responses.add(
+        responses.GET,
+        "https://api.github.com/user",
+        json={"login": "me", "followers": followers, "following": following},
+    )
+
+
+def add_page(kind, logins, next_page=None):
+    headers = {}
+    if next_page:
+        headers["Link"] = f'<https://api.github.com/user/{kind}?page={next_page}>; rel="next"'
+    responses.add(
+        responses.GET,
+        f"https://api.github.com/user/{kind}",
+        json=[{"login": login} for login in logins],
+        headers=headers,
+    )
+
+
+class FullFetch:
+    """Stand-in for a full list scan that records which lists were rescanned."""
+
+    def __init__(self, lists):
+        self.lists = lists
+        self.calls = []
+
+    def __call__(self, kind):
+        self.calls.append(kind)
+        return self.lists[kind]
+
+
+class TestSnapshotFile:
+    @staticmethod
+    def test_round_trip(tmp_path):
+        """Test saving and loading a snapshot."""
+        path = tmp_path / "snapshot.json"
+        save_snapshot(str(path), ["b", "a"], ["c"])
+
+        snapshot = load_snapshot(str(path))
+        assert snapshot["followers"] == ["b", "a"]
+        assert snapshot["following"] == ["c"]
+        assert snapshot["scanned_at"] <= time.time()
+
+    @staticmethod
+    def test_missing_or_corrupt_snapshot(tmp_path):
+        """Test that an unusable snapshot is treated as absent."""
+        path = tmp_path / "snapshot.json"
+        assert load_snapshot(str(path)) is None
+        path.write_text("[]")
+        assert load_snapshot(str(path)) is None
+
+
+class TestFetchNewLogins:
+    """Test cases for walking a list until the snapshot head."""
+
+    @responses.activate
+    def test_unchanged_list_costs_one_page(self):
+        """Test that the walk stops at the head on the first page."""
+        add_page("followers", ["c", "b", "a"], next_page=2)
+
+        merged = fetch_new_logins("dummy_token", "followers", ["c", "b", "a"], 3)
+
+        assert merged == ["c", "b", "a"]
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_new_logins_are_prepended(self):
+        """Test that new logins before the head are merged in front."""
+        add_page("followers", ["e", "d", "c"], next_page=2)
+
+        merged = fetch_new_logins("dummy_token", "followers", ["c", "b", "a"], 5)
+
+        assert merged == ["e", "d", "c", "b", "a"]
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_count_mismatch_requires_full_scan(self):
+        """Test that a removal elsewhere in the list is detected by the count."""
+        add_page("followers", ["d", "c"], next_page=2)
+
+        assert fetch_new_logins("dummy_token", "followers", ["c", "b", "a"], 3) is None
+
+    @responses.activate
+    def test_removed_head_requires_full_scan(self):
+        """Test that reaching a known login other than the head is rejected."""
+        add_page("followers", ["d", "b", "a"])
+
+        assert fetch_new_logins("dummy_token", "followers", ["c", "b", "a"], 3) is None
+
+
+class TestSyncLists:
+    """Test cases for choosing between incremental and full scans."""
+
+    @responses.activate
+    def test_incremental_when_snapshot_matches(self, tmp_path):
+        """Test that an up-to-date snapshot needs only /user and one page per list."""
+        path = str(tmp_path / "snapshot.json")
+        save_snapshot(path, ["b", "a"], ["x"])
+        add_user(followers=3, following=1)
+        add_page("followers", ["c", "b"], next_page=2)
+        add_page("following", ["x"])
+        full_fetch = FullFetch({})
+
+        followers, following, scanned_at = sync_lists("dummy_token", None, path, full_fetch)
+
+        assert followers == ["c", "b", "a"]
+        assert following == ["x"]
+        assert scanned_at is not None
+        assert full_fetch.calls == []
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_falls_back_to_full_scan_per_list(self, tmp_path):
+        """Test that only the list that cannot be reconciled is rescanned."""
+        path = str(tmp_path / "snapshot.json")
+        save_snapshot(path, ["b", "a"], ["y", "x"])
+        add_user(followers=2, following=1)
+        add_page("followers", ["b", "a"])
+        add_page("following", ["x"])
+        full_fetch = FullFetch({"following": ["x"]})
+
+        followers, following, _ = sync_lists("dummy_token", None, path, full_fetch)
+
+        assert followers == ["b", "a"]
+        assert following == ["x"]
+        assert full_fetch.calls == ["following"]
+
+    @staticmethod
+    def test_stale_snapshot_forces_full_scan(tmp_path):
+        """Test that an old snapshot triggers a full scan of both lists."""
+        path = str(tmp_path / "snapshot.json")
+        save_snapshot(path, ["a"], ["b"], scanned_at=time.time() - 30 * 24 * 3600)
+        full_fetch = FullFetch({"followers": ["a"], "following": ["b"]})
+
+        _, _, scanned_at = sync_lists("dummy_token", None, path, full_fetch)
+
+        assert full_fetch.calls == ["followers", "following"]
+        assert scanned_at is None
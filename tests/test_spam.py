@@ -1,5 +1,9 @@
 from datetime import datetime, timezone, timedelta
-from scripts.spam import calculate_spam_score, is_spam, _has_suspicious_content, SPAM_THRESHOLD
+from itertools import combinations
+from scripts.spam import (
+    calculate_spam_score, can_settle_from_id, created_range, is_spam, score_bounds, score_users,
+    _has_suspicious_content, SPAM_THRESHOLD,
+)
 
 
 def make_user(
@@ -260,3 +264,99 @@ class TestIsSpam:
         spam, reasons = is_spam(user)
         assert spam is False
         assert reasons == []
+
+
+# ---------------------------------------------------------------------------
+# score_users
+# ---------------------------------------------------------------------------
+
+class TestScoreUsers:
+    @staticmethod
+    def test_matches_per_user_function():
+        now = datetime.now(timezone.utc)
+        users = [
+            make_user(),
+            make_user(name=None, bio=None, public_repos=0, followers=0, days_old=5),
+            make_user(bio="crypto airdrop", days_old=29),
+            make_user(name="aB3kQz9mNpXrTy", days_old=30),
+            {"login": "sparse"},
+        ]
+
+        results = score_users(users, now=now)
+
+        assert results == [calculate_spam_score(user, now) for user in users]
+        assert results[1].score >= SPAM_THRESHOLD
+        assert results[0].reasons == []
+
+    @staticmethod
+    def test_uses_one_clock_reading():
+        """Test that every user in the batch is aged against the same time."""
+        now = datetime(2024, 1, 31, tzinfo=timezone.utc)
+        users = [{"created_at": "2024-01-01T00:00:00Z"}, {"created_at": "2024-01-02T00:00:00Z"}]
+
+        results = score_users(users, now=now)
+
+        assert "account only 30 days old" not in results[0].reasons
+        assert "account only 29 days old" in results[1].reasons
+
+    @staticmethod
+    def test_empty_batch():
+        assert score_users([]) == []
+
+
+# ---------------------------------------------------------------------------
+# score_bounds
+# ---------------------------------------------------------------------------
+
+class TestScoreBounds:
+    """Test cases for bounding the score from partial profiles."""
+
+    @staticmethod
+    def test_bounds_contain_the_score_for_every_partial_view():
+        """Test that low <= score <= high whatever subset of fields is known."""
+        now = datetime.now(timezone.utc)
+        fields = ["name", "bio", "public_repos", "followers", "created_at"]
+        users = [
+            make_user(),
+            make_user(name=None, bio=None, public_repos=0, followers=0, days_old=3),
+            make_user(bio="crypto airdrop", followers=1),
+            make_user(name="abcdefghijklmnop", days_old=29),
+        ]
+        for user in users:
+            score, _ = calculate_spam_score(user, now)
+            for n in range(len(fields) + 1):
+                for known in combinations(fields, n):
+                    partial = {"login": user["login"], **{f: user[f] for f in known}}
+                    bounds = score_bounds(partial, now)
+                    assert bounds.low <= score <= bounds.high, (user, known)
+
+    @staticmethod
+    def test_full_profile_is_exact():
+        """Test that a complete profile gives low == high == score."""
+        user = make_user(name=None, bio="follow back", public_repos=0)
+        score, reasons = calculate_spam_score(user)
+
+        assert score_bounds(user) == (score, score, reasons)
+
+    @staticmethod
+    def test_old_id_settles_new_account_rule():
+        """Test that an id below a dated anchor rules out the new_account rule."""
+        item = {"login": "someone", "id": 1000, "type": "User"}
+        unknown = {"login": "someone", "id": None, "type": "User"}
+
+        assert score_bounds(item).high == score_bounds(unknown).high - 2
+
+    @staticmethod
+    def test_can_settle_from_id_only_when_the_id_can_cross_the_threshold():
+        """Test that the default rules can settle nothing from an id, unlike a high or a low threshold."""
+        assert not can_settle_from_id()
+        assert can_settle_from_id(threshold=8)  # an old account scores at most 7
+        assert can_settle_from_id(threshold=2)  # a young account scores at least 2
+
+    @staticmethod
+    def test_created_range_from_anchors():
+        """Test that ids are bounded by the anchors on either side."""
+        earliest, latest = created_range(600000)
+        assert earliest.year == 2011 and latest.year == 2011 and earliest < latest
+        assert created_range(10**9) == (created_range(10**9)[0], None)
+        assert created_range(None) == (None, None)
@@ -0,0 +1,168 @@
+import threading
+
+import pytest
+
+from scripts import store as store_module
+from scripts.follow import WriteResult
+from scripts.store import StateStore
+from scripts.userlist import UserList, merge_diff
+from scripts.verdicts import DAY, PRUNE_AFTER, VerdictStore
+
+
+@pytest.fixture
+def db(tmp_path):
+    with StateStore(str(tmp_path / "state.db")) as db:
+        yield db
+
+
+def items(*pairs):
+    return [{"login": login, "id": user_id} for login, user_id in pairs]
+
+
+class TestLists:
+    @staticmethod
+    def test_database_uses_wal(db):
+        assert db._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    @staticmethod
+    def test_replace_list_streams_in_batches_and_keeps_first_duplicate(db, monkeypatch):
+        monkeypatch.setattr(store_module, "BATCH_SIZE", 2)
+        assert db.replace_list("followers", items(("c", 3), ("b", 2), ("c", 3), ("a", 1), ("d", 4))) == 4
+        assert db.logins("followers") == ["c", "b", "a", "d"]
+
+        # A later replace drops users no longer listed and keeps known ids for bare logins
+        db.replace_list("followers", ["e", "a", "c"])
+        assert db.logins("followers") == ["e", "a", "c"]
+        assert db.diff()[0] == {"e": None, "a": 1, "c": 3}
+
+    @staticmethod
+    def test_slow_list_source_does_not_block_other_threads(db, monkeypatch):
+        monkeypatch.setattr(store_module, "BATCH_SIZE", 2)
+        paging, done = threading.Event(), threading.Event()
+
+        def slow_pages():
+            yield from ("a", "b", "c")
+            paging.set()  # waiting on the next API page
+            assert done.wait(5)
+            yield "d"
+
+        writer = threading.Thread(target=db.replace_list, args=("followers", slow_pages(), "me"))
+        writer.start()
+        assert paging.wait(5)
+
+        other = threading.Thread(target=lambda: (db.set_meta("x", 1), db.replace_list("followers", ["z"], "other")))
+        other.start()
+        other.join(timeout=2)
+        blocked = other.is_alive()
+        done.set()
+        writer.join()
+        other.join()
+
+        assert not blocked
+        assert db.logins("followers", "me") == ["a", "b", "c", "d"]
+        assert db.logins("followers", "other") == ["z"]
+
+    @staticmethod
+    def test_diff_matches_merge_diff(db):
+        followers = items(("new", 10), ("mutual", 1), ("renamed_now", 7))
+        following = items(("mutual", 1), ("gone", 2), ("renamed_before", 7))
+        db.replace_list("followers", followers)
+        db.replace_list("following", following)
+
+        expected = merge_diff(UserList.from_items(followers), UserList.from_items(following), with_ids=True)
+        assert db.diff() == expected
+        assert db.diff()[2] == {"mutual": 1, "renamed_now": 7}
+
+    @staticmethod
+    def test_diff_falls_back_to_logins_without_ids(db):
+        db.replace_list("followers", ["new", "mutual"])
+        db.replace_list("following", items(("mutual", 1), ("gone", 2)))
+        assert db.diff() == ({"new": None}, {"gone": 2}, {"mutual": None})
+
+    @staticmethod
+    def test_accounts_are_kept_apart(db):
+        db.replace_list("followers", ["a"], account="alice")
+        db.replace_list("followers", ["b"], account="bob")
+        assert db.logins("followers", account="alice") == ["a"]
+        assert db.count("followers", account="bob") == 1
+        assert db.logins("followers") == []
+
+    @staticmethod
+    def test_apply_writes_puts_new_follows_on_top(db):
+        db.replace_list("following", items(("mutual", 1), ("gone", 2)))
+        db.apply_writes([
+            WriteResult("new_a", "follow", ok=True),
+            WriteResult("failed", "follow", ok=False),
+            WriteResult("new_b", "follow", ok=True),
+            WriteResult("gone", "unfollow", ok=True),
+        ], ids={"new_a": 4, "new_b": 5})
+        assert db.logins("following") == ["new_b", "new_a", "mutual"]
+
+    @staticmethod
+    def test_snapshot_needs_complete_lists_and_a_scan_time(db):
+        assert db.load_snapshot() is None
+        db.save_snapshot(["a", "b"], ["b"], scanned_at=100.0)
+        assert db.load_snapshot() == {"followers": ["a", "b"], "following": ["b"], "scanned_at": 100.0}
+
+        def failing():
+            yield "c"
+            raise RuntimeError("connection lost")
+
+        with pytest.raises(RuntimeError):
+            db.replace_list("following", failing())
+        assert db.load_snapshot() is None
+
+
+class TestProfilesAndHistory:
+    @staticmethod
+    def test_recent_profiles_round_trip(tmp_path, monkeypatch):
+        monkeypatch.setattr(store_module, "LOOKUP_SIZE", 2)
+        now = [1_000_000.0]
+        with StateStore(str(tmp_path / "state.db"), clock=lambda: now[0]) as db:
+            db.put_profiles([{"login": "jane", "id": 3, "name": "Jane", "bio": None, "public_repos": 2, "extra": 1}])
+            now[0] += store_module.PROFILE_MAX_AGE / 2
+            db.put_profiles([{"login": "joe", "id": 4, "followers": 0}])
+
+            assert db.get_profiles(["jane", "nobody", "joe"]) == {
+                "jane": {"login": "jane", "id": 3, "name": "Jane", "public_repos": 2},
+                "joe": {"login": "joe", "id": 4, "followers": 0},
+            }
+            now[0] += store_module.PROFILE_MAX_AGE / 2
+            assert list(db.get_profiles(["jane", "joe"])) == ["joe"]
+
+    @staticmethod
+    def test_actions_are_appended(db):
+        db.record_actions([WriteResult("jane", "follow", ok=True, status=204)])
+        db.record_actions([WriteResult("jane", "unfollow", ok=False, error=OSError("reset"))])
+        assert [(action, ok) for _, action, ok in db.history("jane")] == [("follow", True), ("unfollow", False)]
+
+
+class TestVerdicts:
+    @staticmethod
+    def test_verdict_store_saves_only_changes_and_prunes(db):
+        now = [1000 * DAY]
+        store = VerdictStore(db=db, clock=lambda: now[0])
+        store.put("old", {"updated_at": "x"}, 0, [])
+        store.put("spam", {"updated_at": "y"}, 5, ["no bio"])
+        store.save()
+
+        now[0] += PRUNE_AFTER + 8 * DAY
+        store = VerdictStore(db=db, clock=lambda: now[0])
+        assert store.record("spam")["reasons"] == ["no bio"]
+        store.put("spam", {"updated_at": "y"}, 5, ["no bio"])
+        assert store._changed == {"spam"}
+        store.save()
+
+        assert set(db.load_verdicts(store.fingerprint)) == {"spam"}
+
+    @staticmethod
+    def test_rule_changes_drop_stored_verdicts(db):
+        store = VerdictStore(db=db)
+        store.put("jane", {}, 0, [])
+        store.save()
+        assert VerdictStore(db=db).record("jane") is not None
+
+        changed = VerdictStore(db=db, fingerprint="other")
+        assert changed.record("jane") is None
+        changed.save()
+        assert db.load_verdicts(store.fingerprint) == {}
@@ -0,0 +1,210 @@
+import asyncio
+
+import pytest
+
+from benchmarks import fake_github
+from benchmarks.fake_github import FakeGitHub
+from scripts.cache import ResponseCache
+from scripts.client import GitHubClient, get_headers
+from scripts.transport import (
+    AsyncTransport,
+    Headers,
+    HTTPError,
+    RequestsTransport,
+    StdlibTransport,
+    make_transport,
+    parse_links,
+)
+from scripts.utils import get_followers
+
+
+BACKENDS = ["requests", "stdlib", "async"]
+
+
+@pytest.fixture
+def server():
+    with FakeGitHub(fake_github.FakeGitHubState(followers=250, following=10)) as server:
+        yield server
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Count the connections the fake API accepts."""
+    opened = []
+    setup = fake_github._Handler.setup
+
+    def counting_setup(handler):
+        opened.append(handler.client_address)
+        setup(handler)
+
+    monkeypatch.setattr(fake_github._Handler, "setup", counting_setup)
+    return opened
+
+
+class TestBackends:
+    @staticmethod
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_get_json_and_headers(server, backend):
+        with GitHubClient("t", api_url=server.url, transport=backend) as client:
+            resp = client.get(client.url("/users/user3"))
+
+        assert resp.status_code == 200
+        assert resp.json()["login"] == "user3"
+        assert resp.headers["content-type"] == "application/json"
+        assert "X-RateLimit-Remaining" in resp.headers
+
+    @staticmethod
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_pagination_follows_link_headers(server, backend):
+        with GitHubClient("t", api_url=server.url, transport=backend) as client:
+            followers = get_followers("t", client=client)
+
+        assert len(followers) == 250
+        assert followers[0]["login"] == "user0"
+
+    @staticmethod
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_put_delete_and_graphql_post(server, backend):
+        with GitHubClient("t", api_url=server.url, transport=backend) as client:
+            put = client.put(client.url("/user/following/someone"))
+            assert (put.status_code, put.text) == (204, "")
+            assert server.state.following[0] == "someone"
+            assert client.delete(client.url("/user/following/someone")).status_code == 204
+
+            query = {"query": "query($l0: String!) { u0: user(login: $l0) { login } }", "variables": {"l0": "user1"}}
+            resp = client.post(client.graphql_url, json=query)
+
+        assert "someone" not in server.state.following
+        assert resp.json()["data"]["u0"]["login"] == "user1"
+
+    @staticmethod
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_raise_for_status_and_errors_are_oserrors(server, backend):
+        with GitHubClient("t", api_url=server.url, transport=backend) as client:
+            resp = client.get(client.url("/users/nobody"))
+            assert resp.status_code == 404
+            with pytest.raises(OSError) as excinfo:
+                resp.raise_for_status()
+            assert excinfo.value.response is resp
+
+            with pytest.raises(OSError):
+                client.get("http://127.0.0.1:1/user")
+
+    @staticmethod
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_connections_are_kept_alive(server, connections, backend):
+        with GitHubClient("t", api_url=server.url, transport=backend) as client:
+            for i in range(20):
+                client.get(client.url(f"/users/user{i}")).raise_for_status()
+
+        assert len(connections) == 1
+
+    @staticmethod
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_etag_cache_serves_304s(server, backend):
+        cache = ResponseCache()
+        with GitHubClient("t", api_url=server.url, cache=cache, transport=backend) as client:
+            first = get_followers("t", client=client)
+            second = get_followers("t", client=client)
+
+        assert first == second
+        assert cache.hits == 3
+
+
+class TestStdlibTransport:
+    @staticmethod
+    def test_retries_once_on_a_connection_closed_while_idle(server, connections):
+        transport = StdlibTransport(get_headers("t"), pool_size=2)
+        transport.request("GET", f"{server.url}/users/user1").raise_for_status()
+        for conns in transport._idle.values():
+            for conn in conns:
+                conn.sock.close()
+
+        resp = transport.request("GET", f"{server.url}/users/user2")
+        transport.close()
+
+        assert resp.json()["login"] == "user2"
+        assert len(connections) == 2
+
+    @staticmethod
+    def test_keeps_at_most_pool_size_idle_connections(server):
+        transport = StdlibTransport(get_headers("t"), pool_size=1)
+        conns = [transport._acquire(("http", "127.0.0.1", 1), 1)[0] for _ in range(3)]
+        for conn in conns:
+            transport._release(("http", "127.0.0.1", 1), conn)
+
+        assert transport._idle[("http", "127.0.0.1", 1)] == conns[:1]
+
+
+class TestAsyncTransport:
+    @staticmethod
+    def test_gather_shares_pool_size_connections(server, connections):
+        async def run():
+            transport = AsyncTransport(get_headers("t"), pool_size=3)
+            try:
+                return await asyncio.gather(
+                    *(transport.arequest("GET", f"{server.url}/users/user{i}") for i in range(30))
+                )
+            finally:
+                await transport.aclose()
+
+        responses = asyncio.run(run())
+
+        assert [resp.json()["login"] for resp in responses] == [f"user{i}" for i in range(30)]
+        assert len(connections) <= 3
+
+    @staticmethod
+    def test_close_stops_the_event_loop_thread(server):
+        transport = AsyncTransport(get_headers("t"), pool_size=2)
+        transport.request("GET", f"{server.url}/users/user1").raise_for_status()
+        thread = transport._thread
+
+        transport.close()
+
+        assert not thread.is_alive()
+        transport.close()
+
+
+class TestHelpers:
+    @staticmethod
+    def test_headers_are_case_insensitive_and_join_repeats():
+        headers = Headers([("Content-Type", "application/json"), ("Vary", "Accept"), ("vary", "Authorization")])
+
+        assert headers["content-type"] == "application/json"
+        assert headers.get("VARY") == "Accept, Authorization"
+        assert "ETag" not in headers
+        headers["Link"] = "<x>"
+        assert dict(headers) == {"Content-Type": "application/json", "vary": "Accept, Authorization", "Link": "<x>"}
+
+    @staticmethod
+    def test_parse_links_matches_requests():
+        value = (
+            '<https://api.github.com/user/followers?page=2>; rel="next", '
+            '<https://api.github.com/user/followers?page=5>; rel="last"'
+        )
+
+        links = parse_links(value)
+
+        assert links["next"] == {"url": "https://api.github.com/user/followers?page=2", "rel": "next"}
+        assert links["last"]["url"].endswith("page=5")
+        assert parse_links(None) == {}
+
+    @staticmethod
+    def test_make_transport():
+        assert isinstance(make_transport("auto", {}, 2), RequestsTransport)
+        assert isinstance(make_transport("stdlib", {}, 2), StdlibTransport)
+        with pytest.raises(ValueError):
+            make_transport("curl", {}, 2)
+
+    @staticmethod
+    def test_http_error_carries_the_response():
+        error = HTTPError("404", response="resp")
+        assert isinstance(error, OSError)
+        assert error.response == "resp"
+
+    @staticmethod
+    def test_client_accepts_a_transport_object(server):
+        transport = StdlibTransport(get_headers("t"), pool_size=1)
+        with GitHubClient("t", api_url=server.url, transport=transport) as client:
+            assert client.session is None
+            assert client.get(client.url("/user")).json()["login"] == "me"
@@ -0,0 +1,54 @@
+from scripts.userlist import UserList, merge_diff
+
+
+class TestUserList:
+    """Test cases for the compact follower/following lists."""
+
+    @staticmethod
+    def test_from_items_keeps_order_and_ids():
+        """Test that items are reduced to logins (in order) and ids."""
+        users = UserList.from_items([
+            {"login": "b", "id": 20, "avatar_url": "x"},
+            {"login": "a", "id": 10, "avatar_url": "y"},
+        ])
+
+        assert list(users) == ["b", "a"]
+        assert list(users.ids) == [20, 10]
+
+    @staticmethod
+    def test_from_items_drops_duplicates():
+        """Test that a user returned twice by shifting pages is kept once, at its newest position."""
+        users = UserList.from_items([{"login": "a", "id": 1}, {"login": "b", "id": 2}, {"login": "a", "id": 1}])
+
+        assert users == ["a", "b"]
+        assert list(users.ids) == [1, 2]
+
+    @staticmethod
+    def test_merge_diff_by_id():
+        """Test the linear merge against plain set operations."""
+        followers = UserList.from_items({"login": f"u{i}", "id": i} for i in range(0, 300, 2))
+        following = UserList.from_items({"login": f"u{i}", "id": i} for i in range(0, 300, 3))
+
+        only_followers, only_following, both = merge_diff(followers, following)
+
+        a, b = set(followers), set(following)
+        assert set(only_followers) == a - b
+        assert set(only_following) == b - a
+        assert set(both) == a & b
+
+    @staticmethod
+    def test_merge_diff_falls_back_to_logins():
+        """Test that lists without ids (e.g. from a snapshot) are compared by login."""
+        with_ids = UserList.from_items([{"login": "a", "id": 1}, {"login": "b", "id": 2}])
+        without_ids = UserList(["c", "b"])
+
+        assert merge_diff(with_ids, without_ids) == (["a"], ["c"], ["b"])
+        assert merge_diff(UserList(), UserList(["x"])) == ([], ["x"], [])
+
+    @staticmethod
+    def test_items_without_ids():
+        """Test that items lacking an id still produce a usable list."""
+        users = UserList.from_items([{"login": "a"}, {"login": "b"}])
+
+        assert users.ids is None
+        assert merge_diff(users, UserList(["b"])) == (["a"], [], ["b"])
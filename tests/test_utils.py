@@ -1,6 +1,12 @@
 import pytest
+import requests
 import responses
-from scripts.utils import get_followers, get_following, get_headers, paginate
+import responses.matchers
+from urllib.parse import urlsplit
+from scripts.utils import (
+    get_followers, get_following, get_headers, iter_paginate, last_page_number, page_url, paginate,
+    with_per_page,
+)
 
 
 class TestHeaders:
@@ -107,6 +113,118 @@ class TestPagination:
             paginate("https://api.github.com/test", "dummy_token")
 
 
+class TestStreamingPagination:
+    """Test cases for the streaming paginator."""
+
+    @staticmethod
+    def test_with_per_page_adds_parameter():
+        """Test that per_page is added once and existing parameters are kept."""
+        assert with_per_page("https://api.github.com/test", 100) == "https://api.github.com/test?per_page=100"
+        assert with_per_page("https://api.github.com/test?page=2", 100) == \
+            "https://api.github.com/test?page=2&per_page=100"
+        assert with_per_page("https://api.github.com/test?per_page=50", 100) == \
+            "https://api.github.com/test?per_page=50"
+
+    @responses.activate
+    def test_requests_100_per_page(self):
+        """Test that the first request asks for the largest page size."""
+        responses.add(responses.GET, "https://api.github.com/test", json=[])
+
+        paginate("https://api.github.com/test", "dummy_token")
+
+        assert responses.calls[0].request.url == "https://api.github.com/test?per_page=100"
+
+    @responses.activate
+    def test_pages_are_fetched_lazily(self):
+        """Test that the next page is only requested once the first is consumed."""
+        responses.add(
+            responses.GET,
+            "https://api.github.com/test",
+            json=[{"login": "user1"}, {"login": "user2"}],
+            headers={"Link": '<https://api.github.com/test?page=2&per_page=100>; rel="next"'}
+        )
+        responses.add(responses.GET, "https://api.github.com/test?page=2&per_page=100", json=[{"login": "user3"}])
+
+        items = iter_paginate("https://api.github.com/test", "dummy_token")
+        assert len(responses.calls) == 0
+        assert next(items) == {"login": "user1"}
+        assert next(items) == {"login": "user2"}
+        assert len(responses.calls) == 1
+        assert list(items) == [{"login": "user3"}]
+        assert len(responses.calls) == 2
+
+
+class TestParallelPagination:
+    """Test cases for fetching pages concurrently via rel="last"."""
+
+    @staticmethod
+    def add_numbered_pages(last, link_last=True):
+        base = "https://api.github.com/test"
+        for page in range(1, last + 1):
+            links = []
+            if page < last:
+                links.append(f'<{base}?per_page=100&page={page + 1}>; rel="next"')
+                if link_last:
+                    links.append(f'<{base}?per_page=100&page={last}>; rel="last"')
+            url = f"{base}?per_page=100" if page == 1 else f"{base}?per_page=100&page={page}"
+            responses.add(
+                responses.GET,
+                url,
+                json=[{"login": f"user{page}"}],
+                headers={"Link": ", ".join(links)} if links else {},
+                match=[responses.matchers.query_string_matcher(urlsplit(url).query)],
+            )
+
+    @staticmethod
+    def test_page_url_replaces_page():
+        assert page_url("https://api.github.com/test?per_page=100&page=9", 3) == \
+            "https://api.github.com/test?per_page=100&page=3"
+
+    @responses.activate
+    def test_last_page_number(self):
+        responses.add(
+            responses.GET, "https://api.github.com/test", json=[],
+            headers={"Link": '<https://api.github.com/test?page=2>; rel="next", '
+                             '<https://api.github.com/test?page=7>; rel="last"'},
+        )
+        resp = requests.get("https://api.github.com/test")
+        assert last_page_number(resp) == 7
+
+    @responses.activate
+    def test_parallel_pages_are_reassembled_in_order(self):
+        """Test that concurrently fetched pages come back in page order."""
+        self.add_numbered_pages(12)
+
+        result = paginate("https://api.github.com/test", "dummy_token", max_workers=4)
+
+        assert result == [{"login": f"user{page}"} for page in range(1, 13)]
+        assert len(responses.calls) == 12
+
+    @responses.activate
+    def test_falls_back_to_sequential_without_last_link(self):
+        """Test that pages are walked through rel="next" when rel="last" is missing."""
+        self.add_numbered_pages(3, link_last=False)
+
+        result = paginate("https://api.github.com/test", "dummy_token", max_workers=4)
+
+        assert result == [{"login": "user1"}, {"login": "user2"}, {"login": "user3"}]
+
+    @responses.activate
+    def test_page_error_is_raised(self):
+        """Test that a failing page surfaces as an HTTP error."""
+        responses.add(
+            responses.GET, "https://api.github.com/test", json=[{"login": "user1"}],
+            headers={"Link": '<https://api.github.com/test?per_page=100&page=2>; rel="next", '
+                             '<https://api.github.com/test?per_page=100&page=2>; rel="last"'},
+            match=[responses.matchers.query_string_matcher("per_page=100")],
+        )
+        responses.add(responses.GET, "https://api.github.com/test", status=500,
+                      match=[responses.matchers.query_string_matcher("per_page=100&page=2")])
+
+        with pytest.raises(Exception):
+            paginate("https://api.github.com/test", "dummy_token", max_workers=2)
+
+
 class TestGetFollowers:
     """Test cases for getting followers."""
 
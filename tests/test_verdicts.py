@@ -0,0 +1,117 @@
+import json
+from datetime import datetime, timezone, timedelta
+from scripts import verdicts as verdicts_module
+from scripts.verdicts import DAY, DEFAULT_TTL, MAX_TTL, NEAR_THRESHOLD_TTL, YOUNG_ACCOUNT_TTL, VerdictStore
+
+
+NOW = 1_700_000_000.0
+
+
+class FakeClock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_user(days_old=365, updated_at="2023-01-01T00:00:00Z"):
+    created = datetime.fromtimestamp(NOW, timezone.utc) - timedelta(days=days_old)
+    return {"login": "someone", "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"), "updated_at": updated_at}
+
+
+class TestVerdictStore:
+    """Test cases for the persistent spam verdict store."""
+
+    @staticmethod
+    def test_unknown_login_is_a_miss():
+        store = VerdictStore(clock=FakeClock())
+        assert store.get("someone") is None
+        assert store.misses == 1
+
+    @staticmethod
+    def test_reuses_verdict_within_ttl():
+        """Test that a stored verdict is reused until its TTL runs out."""
+        clock = FakeClock()
+        store = VerdictStore(clock=clock)
+        store.put("someone", make_user(), 0, [])
+
+        clock.now += DEFAULT_TTL - 1
+        assert store.get("someone") == (False, [])
+        clock.now += 2
+        assert store.get("someone") is None
+        assert (store.hits, store.misses) == (1, 1)
+
+    @staticmethod
+    def test_spam_verdict_keeps_reasons():
+        store = VerdictStore(clock=FakeClock())
+        store.put("someone", make_user(), 5, ["no bio", "no public repositories"])
+
+        assert store.get("someone") == (True, ["no bio", "no public repositories"])
+
+    @staticmethod
+    def test_changed_profile_invalidates_verdict():
+        """Test that a known newer updated_at forces a re-check."""
+        store = VerdictStore(clock=FakeClock())
+        store.put("someone", make_user(updated_at="2023-01-01T00:00:00Z"), 0, [])
+
+        assert store.get("someone", updated_at="2023-01-01T00:00:00Z") is not None
+        assert store.get("someone", updated_at="2024-06-01T00:00:00Z") is None
+
+    @staticmethod
+    def test_young_account_gets_short_ttl():
+        clock = FakeClock()
+        store = VerdictStore(clock=clock)
+        store.put("someone", make_user(days_old=40), 0, [])
+
+        clock.now += YOUNG_ACCOUNT_TTL + 1
+        assert store.get("someone") is None
+
+    @staticmethod
+    def test_near_threshold_score_gets_short_ttl():
+        clock = FakeClock()
+        store = VerdictStore(clock=clock)
+        store.put("someone", make_user(), 2, ["no name", "no bio"])
+
+        clock.now += NEAR_THRESHOLD_TTL + 1
+        assert store.get("someone") is None
+
+    @staticmethod
+    def test_unchanged_profile_extends_ttl():
+        """Test that the TTL doubles while updated_at stays the same, up to MAX_TTL."""
+        clock = FakeClock()
+        store = VerdictStore(clock=clock)
+        for _ in range(5):
+            store.put("someone", make_user(), 0, [])
+        clock.now += MAX_TTL - DAY
+        assert store.get("someone") is not None
+        clock.now += 2 * DAY
+        assert store.get("someone") is None
+
+    @staticmethod
+    def test_persists_and_prunes(tmp_path):
+        """Test that verdicts survive a save/load round trip."""
+        path = str(tmp_path / "verdicts.json")
+        clock = FakeClock()
+        store = VerdictStore(path, clock=clock)
+        store.put("someone", make_user(), 0, [])
+        store.save()
+
+        reloaded = VerdictStore(path, clock=clock)
+        assert reloaded.get("someone") == (False, [])
+
+        clock.now += 365 * DAY
+        reloaded.save()
+        assert json.loads(open(path).read())["verdicts"] == {}
+
+    @staticmethod
+    def test_rule_change_invalidates_store(tmp_path, monkeypatch):
+        """Test that verdicts made under other rules are discarded."""
+        path = str(tmp_path / "verdicts.json")
+        store = VerdictStore(path, clock=FakeClock())
+        store.put("someone", make_user(), 0, [])
+        store.save()
+
+        monkeypatch.setitem(verdicts_module.SCORE_WEIGHTS, "no_bio", 5)
+        reloaded = VerdictStore(path, clock=FakeClock())
+        assert len(reloaded) == 0